@@ -13,15 +13,11 @@ import json
 import os
 from typing import Dict, List
 import base64
-import re
 import io
 import pandas as pd
 import numpy as np
 from fpdf import FPDF
 
-# timeout used by direct Ollama calls
-REQUEST_TIMEOUT = 15
-
 # (some of these imports may not be used immediately but are retained
 # to match the additional utilities from the snippets)
 
@@ -29,9 +25,11 @@ REQUEST_TIMEOUT = 15
 from nlp_utils import extract_skills_from_text, extract_ats_keywords
 from llm_utils import (
     check_ollama_status, generate_interview_questions,
-    evaluate_interview_answer, generate_resume_improvements,
-    get_interview_prep_tips
+    get_interview_prep_tips, stream_chat, stream_resume_improvements,
+    analyze_career_readiness, READINESS_CATEGORIES
 )
+from ollama_client import ollama_health
+from resume_index import load_corpus_stats
 from voice_vision_utils import (
     tts_engine, stt_engine, emotion_analyzer, webcam_tracker
 )
@@ -40,6 +38,15 @@ from voice_vision_utils import (
 API_BASE_URL = "http://localhost:8000/api"
 st.set_page_config(page_title="InnoCareer AI", layout="wide", initial_sidebar_state="expanded")
 
+
+@st.cache_resource
+def load_scoring_corpus():
+    # same corpus idf as the backend, loaded once per process
+    return load_corpus_stats()
+
+
+load_scoring_corpus()
+
 # ------------------------------------------
 # SESSION STATE INITIALIZATION
 # ------------------------------------------
@@ -191,28 +198,17 @@ def extract_pdf_text(uploaded_file) -> str:
 
 def check_ollama():
     """Quick wrapper matching snippet; returns True if service responding."""
-    try:
-        r = requests.get("http://localhost:11434")
-        return r.status_code == 200
-    except:
-        return False
+    return ollama_health.is_up()
 
 
-def ask_ollama(prompt, model="mistral"):
-    """Direct call to Ollama API used by chatbot and offline prompts."""
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False
-            },
-            timeout=REQUEST_TIMEOUT
-        )
-        return response.json().get("response", "")
-    except Exception as e:
-        return f"❌ Ollama Error: {str(e)}"
+def ask_ollama_stream(prompt):
+    """Stream a chat reply from Ollama for st.write_stream."""
+    produced = False
+    for chunk in stream_chat(prompt):
+        produced = True
+        yield chunk
+    if not produced:
+        yield "❌ Ollama Error: no response from the model server"
 
 
 def analyze_resume_logic(resume_text: str, job_desc: str):
@@ -384,20 +380,26 @@ def show_resume_analyzer():
         uploaded_file = st.file_uploader("Choose PDF", type="pdf")
         
         if uploaded_file:
-            # extract text locally for immediate display
-            st.session_state.resume_text = extract_pdf_text(uploaded_file)
+            # only extract/store a file once; Streamlit re-runs this on every interaction
+            upload_key = (uploaded_file.name, uploaded_file.size)
+            if st.session_state.get("resume_upload_key") != upload_key:
+                # extract text locally for immediate display
+                st.session_state.resume_text = extract_pdf_text(uploaded_file)
+                st.session_state.resume_id = None
+                st.session_state.resume_upload_key = upload_key
+                # also send file to backend for storage (skills are indexed there once)
+                try:
+                    files = {"file": (uploaded_file.name, uploaded_file.getvalue())}
+                    data = {"user_id": st.session_state.user_id}
+                    resp = requests.post(f"{API_BASE_URL}/resume/upload", files=files, data=data)
+                    if resp.ok:
+                        st.session_state.resume_id = resp.json().get("id")
+                        show_success_message("✅ Resume stored on server")
+                    else:
+                        st.warning(f"Could not store resume: {resp.text}")
+                except Exception as e:
+                    st.warning(f"Resume upload error: {e}")
             show_success_message("Resume uploaded!")
-            # also send file to backend for storage
-            try:
-                files = {"file": (uploaded_file.name, uploaded_file.getvalue())}
-                data = {"user_id": st.session_state.user_id}
-                resp = requests.post(f"{API_BASE_URL}/resume/upload", files=files, data=data)
-                if resp.ok:
-                    show_success_message("✅ Resume stored on server")
-                else:
-                    st.warning(f"Could not store resume: {resp.text}")
-            except Exception as e:
-                st.warning(f"Resume upload error: {e}")
     
     with col2:
         st.subheader("2️⃣ Paste Job Description")
@@ -422,7 +424,8 @@ def show_resume_analyzer():
                             f"{API_BASE_URL}/resume/analyze",
                             json={
                                 "resume_text": st.session_state.resume_text,
-                                "job_description": st.session_state.job_description
+                                "job_description": st.session_state.job_description,
+                                "resume_id": st.session_state.get("resume_id")
                             }
                         )
                         if resp.ok:
@@ -525,13 +528,11 @@ def show_resume_analyzer():
                         st.write(v.get('missing', {}).get('passage', ''))
                     # Automatically get improvement suggestions from LLM
                     if ollama_status:
-                        with st.spinner("🧠 Generating detailed feedback..."):
-                            improv = generate_resume_improvements(
-                                st.session_state.resume_text,
-                                st.session_state.job_description
-                            )
                         st.markdown("### 📝 AI Feedback & Reasons")
-                        st.markdown(improv.get('analysis', 'No additional feedback.'))
+                        st.write_stream(stream_resume_improvements(
+                            st.session_state.resume_text,
+                            st.session_state.job_description
+                        ))
                     else:
                         st.info("Start Ollama server to receive detailed feedback.")
             else:
@@ -546,17 +547,19 @@ def show_resume_analyzer():
                     st.markdown("### 📝 Offline Resume Rewrite")
                     st.text_area("Copy this version", rewritten, height=350)
                 else:
-                    with st.spinner("💡 Generating suggestions..."):
-                        try:
-                            improvements = generate_resume_improvements(
-                                st.session_state.resume_text,
-                                st.session_state.job_description
-                            )
-                            st.markdown("### 🎯 Improvement Suggestions")
-                            st.metric("Improved ATS Score", f"{improvements['ats_score']}%")
-                            st.markdown(improvements['analysis'])
-                        except Exception as e:
-                            show_error_message(f"Resume improvement failed: {e}")
+                    try:
+                        st.markdown("### 🎯 Improvement Suggestions")
+                        ats = extract_ats_keywords(
+                            st.session_state.resume_text,
+                            st.session_state.job_description
+                        )
+                        st.metric("Current ATS Score", f"{ats['ats_score']}%")
+                        st.write_stream(stream_resume_improvements(
+                            st.session_state.resume_text,
+                            st.session_state.job_description
+                        ))
+                    except Exception as e:
+                        show_error_message(f"Resume improvement failed: {e}")
             else:
                 show_error_message("Complete upload and JD first")
     
@@ -682,6 +685,29 @@ def show_interview_practice():
         # Normal flow
         st.markdown(f"### Question {i+1} of {len(questions)}")
         st.info(questions[i])
+        # let the backend prepare rubrics / a follow-up while this answer is written
+        state = st.session_state.interview_state
+        qids = state.get("question_ids", [])
+        if state.get("session_id") and not state.get(f"prefetched_{i}"):
+            try:
+                requests.post(f"{API_BASE_URL}/interview/prefetch", json={
+                    "session_id": state["session_id"],
+                    "question_index": i,
+                    "previous_answer": state["answers"][i - 1] if i > 0 else None,
+                    "language": st.session_state.language
+                }, timeout=2)
+            except Exception:
+                pass
+            state[f"prefetched_{i}"] = True
+        if state.get("session_id") and 0 < i <= len(qids):
+            try:
+                follow = requests.get(
+                    f"{API_BASE_URL}/interview/follow-up/{state['session_id']}/{qids[i - 1]}", timeout=2
+                ).json()
+                if follow.get("ready"):
+                    st.caption(f"💡 Follow-up on your last answer: {follow['follow_up']}")
+            except Exception:
+                pass
         # speak the question once per display for voice/webcam modes
         if mode in ["Voice", "Webcam"]:
             keyname = f"spoken_{i}"
@@ -777,34 +803,44 @@ def show_interview_practice():
             if i == len(questions) - 1:
                 if st.button("✅ Submit & Evaluate", width="stretch"):
                     with st.spinner("📊 Evaluating..."):
-                        scores = []
+                        # the backend scores every answer in one request and stores the results
                         fv_list = st.session_state.interview_state.get("face_verifications", [])
-                        for idx, (q, a) in enumerate(zip(questions, st.session_state.interview_state["answers"])):
-                            result = evaluate_interview_answer(q, a)
-                            score = result.get("score", 50)
-                            # penalize if face verification failed
-                            if fv_list and idx < len(fv_list) and fv_list[idx] is not None:
-                                if not fv_list[idx].get("verified"):
-                                    score = score * 0.8  # 20% penalty for mismatch
-                            scores.append(score)
-                            # send to backend if we have ids
-                            qids = st.session_state.interview_state.get("question_ids", [])
-                            if st.session_state.interview_state.get("session_id") and idx < len(qids):
-                                try:
-                                    payload = {
-                                        "session_id": st.session_state.interview_state.get("session_id"),
-                                        "question_id": qids[idx],
-                                        "answer_text": a,
-                                        "emotion": st.session_state.interview_state.get("emotions", [None])[idx],
-                                        "face_verified": fv_list[idx].get("verified") if fv_list and idx < len(fv_list) and fv_list[idx] is not None else False
-                                    }
-                                    requests.post(f"{API_BASE_URL}/interview/submit-answer", json=payload)
-                                except Exception:
-                                    pass
-                        
-                        st.session_state.interview_state["scores"] = scores
-                        st.session_state.interview_state["completed"] = True
-                        st.rerun()
+                        emotions = st.session_state.interview_state.get("emotions", [])
+                        qids = st.session_state.interview_state.get("question_ids", [])
+                        payload = {
+                            "session_id": st.session_state.interview_state.get("session_id"),
+                            "answers": [
+                                {
+                                    "question_id": qid,
+                                    "answer_text": a,
+                                    "emotion": emotions[idx] if idx < len(emotions) else None,
+                                    "face_verified": fv_list[idx].get("verified") if idx < len(fv_list) and fv_list[idx] is not None else False
+                                }
+                                for idx, (qid, a) in enumerate(zip(qids, st.session_state.interview_state["answers"]))
+                            ]
+                        }
+                        try:
+                            resp = requests.post(f"{API_BASE_URL}/interview/submit-answers", json=payload, timeout=300)
+                            results = resp.json().get("results", []) if resp.ok else []
+                        except Exception:
+                            resp, results = None, []
+                        if resp is not None and resp.status_code == 503:
+                            show_error_message("The evaluator is busy right now. Please submit again in a moment.")
+                        elif not results:
+                            show_error_message("Evaluation failed. Make sure the backend is running and try again.")
+                        else:
+                            scores = []
+                            for idx, result in enumerate(results):
+                                score = result.get("score", 50)
+                                # penalize if face verification failed
+                                if idx < len(fv_list) and fv_list[idx] is not None:
+                                    if not fv_list[idx].get("verified"):
+                                        score = score * 0.8  # 20% penalty for mismatch
+                                scores.append(score)
+                            st.session_state.interview_state["scores"] = scores
+                            st.session_state.interview_state["feedbacks"] = [r.get("feedback", "") for r in results]
+                            st.session_state.interview_state["completed"] = True
+                            st.rerun()
     
     # Results display
     if st.session_state.interview_state["completed"]:
@@ -828,6 +864,9 @@ def show_interview_practice():
             with st.expander(f"Q{idx+1}: {q[:60]}..."):
                 st.write(f"Answer: {st.session_state.interview_state['answers'][idx]}")
                 st.metric("Score", f"{s}/100")
+                feedbacks = st.session_state.interview_state.get("feedbacks", [])
+                if idx < len(feedbacks) and feedbacks[idx]:
+                    st.write(f"Feedback: {feedbacks[idx]}")
                 # emotion if stored
                 emo = st.session_state.interview_state.get("emotions", [])[idx] if st.session_state.interview_state.get("emotions") else {}
                 if emo:
@@ -911,50 +950,14 @@ def show_progress_tracker():
         if not check_ollama():
             st.warning("LLM not available for readiness analysis.")
         else:
-            prompt = f"""
-You are a career performance analyst.
-
-Based on the resume and interview evaluation below,
-score the candidate out of 100 in these areas:
-
-Technical:
-Communication:
-Leadership:
-Problem Solving:
-Adaptability:
-Teamwork:
-
-Return strictly in this format:
-
-Technical: XX
-Communication: XX
-Leadership: XX
-Problem Solving: XX
-Adaptability: XX
-Teamwork: XX
-
-Overall Readiness: XX
-1-line Summary:
-"""
-            prompt += f"\nResume:\n{resume_text[:3000]}"
-            prompt += f"\nInterview Feedback:\n{interview_feedback[:2000]}"
             with st.spinner("📈 Analyzing career readiness..."):
-                result = ask_ollama(prompt)
-            # parse scores
-            categories = [
-                "Technical",
-                "Communication",
-                "Leadership",
-                "Problem Solving",
-                "Adaptability",
-                "Teamwork"
-            ]
-            scores = []
-            for cat in categories:
-                match = re.search(rf"{cat}:\s*(\d+)", result)
-                scores.append(int(match.group(1)) if match else 50)
-            overall_match = re.search(r"Overall Readiness:\s*(\d+)", result)
-            overall_score = int(overall_match.group(1)) if overall_match else sum(scores)//len(scores)
+                readiness = analyze_career_readiness(resume_text, interview_feedback)
+            if readiness is None:
+                st.warning("Could not read the readiness analysis; please try again.")
+                return
+            categories = READINESS_CATEGORIES
+            scores = readiness["scores"]
+            overall_score = readiness["overall"]
             # radar chart
             fig = go.Figure()
             fig.add_trace(go.Scatterpolar(
@@ -975,7 +978,7 @@ Overall Readiness: XX
                 st.write(f"{cat}: {scores[i]}%")
             st.markdown("---")
             st.subheader("📌 AI Summary & Recommendations")
-            st.markdown(result)
+            st.markdown(readiness["summary"])
             # avoid repeating static section
             return
     
@@ -1138,8 +1141,8 @@ Question: <original question>
 Question Text:
 {user_question}
 """
-                    guidance = ask_ollama(prompt)
-                    st.text_area("Chatbot Response", value=guidance, height=250)
+                    st.markdown("**Chatbot Response**")
+                    st.write_stream(ask_ollama_stream(prompt))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,171 @@
+"""
+Pluggable ATS scoring engines.
+
+A score compares a job description's skills with a resume's skills and is
+reported on a 0-100 scale.  Every engine is defined by two element-wise
+functions over NumPy arrays:
+
+* ``term_weights`` - how much each JD skill matters (from the taxonomy
+  weight, how often the JD mentions it and, for corpus-aware engines, how
+  rare it is among stored resumes);
+* ``term_credit`` - how much credit (0-1) a resume earns for a skill given
+  how often it mentions it.
+
+Because both are element-wise, scoring one resume against N JDs, or one JD
+against N resumes, is a single gather/multiply/row-sum over CSR arrays
+rather than a Python loop.  ``config.ATS_SCORE_FORMULA`` picks the default
+engine.
+"""
+
+import hashlib
+import logging
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+from config import ATS_SCORE_FORMULA, BM25_K1, BM25_B
+
+logger = logging.getLogger(__name__)
+
+# resumes get full tf-idf credit for a skill once it is mentioned this often
+TFIDF_FULL_CREDIT_TF = 3
+
+
+def _row_sums(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Sum values per CSR row (rows may be empty)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return cumulative[indptr[1:]] - cumulative[indptr[:-1]]
+
+
+class ScoringEngine:
+    """Plain keyword match: every JD skill counts once, present or not."""
+
+    name = "keyword_match"
+    semantic = False  # True if scores come from text embeddings instead
+
+    def __init__(self, skill_weights: np.ndarray):
+        self.skill_weights = np.asarray(skill_weights, dtype=np.float64)
+        self.idf = np.ones(len(self.skill_weights))
+        self.avg_doc_len = 0.0
+        self.corpus_version = "none"  # changes whenever set_corpus_stats does
+
+    def set_corpus_stats(self, doc_freq: np.ndarray, n_docs: int, avg_doc_len: float):
+        """Update document frequencies from the stored resume corpus."""
+        df = np.asarray(doc_freq, dtype=np.float64)
+        self.idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        self.avg_doc_len = float(avg_doc_len)
+        self.corpus_version = hashlib.sha256(
+            df.tobytes() + f"{n_docs}/{self.avg_doc_len:.6f}".encode()
+        ).hexdigest()[:16]
+
+    def term_weights(self, ids: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        return np.ones(len(ids))
+
+    def term_credit(self, tf: np.ndarray, doc_len: np.ndarray) -> np.ndarray:
+        return (tf > 0).astype(np.float64)
+
+    # ------------------------
+    # BATCH KERNELS
+    # ------------------------
+
+    def score_resumes(
+        self,
+        jd_ids: np.ndarray,
+        jd_counts: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        tf: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Score one JD against many resumes given as CSR (indptr, indices, tf).
+
+        Without ``tf`` every listed skill counts as mentioned once.
+        """
+        n_rows = len(indptr) - 1
+        if tf is None:
+            tf = np.ones(len(indices))
+        weights = np.zeros(len(self.skill_weights))
+        weights[jd_ids] = self.term_weights(jd_ids, jd_counts)
+        total = weights.sum()
+        if not total or not len(indices):
+            return np.zeros(n_rows)
+        doc_len = _row_sums(tf, indptr)
+        row_of = np.repeat(np.arange(n_rows), np.diff(indptr))
+        credit = self.term_credit(tf, doc_len[row_of])
+        return 100.0 * _row_sums(weights[indices] * credit, indptr) / total
+
+    def score_jds(
+        self,
+        resume_ids: np.ndarray,
+        resume_tf: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        counts: np.ndarray
+    ) -> np.ndarray:
+        """Score one resume against many JDs given as CSR (indptr, indices, counts)."""
+        credit = np.zeros(len(self.skill_weights))
+        if len(resume_ids):
+            doc_len = np.full(len(resume_ids), float(resume_tf.sum()))
+            credit[resume_ids] = self.term_credit(resume_tf, doc_len)
+        weights = self.term_weights(indices, counts)
+        totals = _row_sums(weights, indptr)
+        earned = _row_sums(weights * credit[indices], indptr)
+        return np.divide(100.0 * earned, totals, out=np.zeros(len(totals)), where=totals > 0)
+
+
+class TfidfEngine(ScoringEngine):
+    """JD skills weighted by taxonomy weight x idf x log JD frequency;
+    resumes earn sub-linear credit for repeated mentions."""
+
+    name = "tfidf"
+
+    def term_weights(self, ids: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        return self.skill_weights[ids] * self.idf[ids] * (1.0 + np.log(np.maximum(counts, 1)))
+
+    def term_credit(self, tf: np.ndarray, doc_len: np.ndarray) -> np.ndarray:
+        credit = (1.0 + np.log(np.maximum(tf, 1))) / (1.0 + np.log(TFIDF_FULL_CREDIT_TF))
+        return np.where(tf > 0, np.minimum(credit, 1.0), 0.0)
+
+
+class BM25Engine(TfidfEngine):
+    """tf-idf weights with BM25 saturation and document length normalisation."""
+
+    name = "bm25"
+
+    def __init__(self, skill_weights: np.ndarray, k1: float = BM25_K1, b: float = BM25_B):
+        super().__init__(skill_weights)
+        self.k1 = k1
+        self.b = b
+
+    def term_credit(self, tf: np.ndarray, doc_len: np.ndarray) -> np.ndarray:
+        avg = self.avg_doc_len or np.maximum(doc_len, 1)
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avg)
+        return tf * (self.k1 + 1.0) / (tf + norm) / (self.k1 + 1.0)
+
+
+class NeuralEngine(ScoringEngine):
+    """Embedding similarity of resume and JD text (see embedding_utils).
+
+    The skill kernels fall back to keyword matching, which is also used
+    when no embedding backend is available.
+    """
+
+    name = "neural"
+    semantic = True
+
+
+ENGINES: Dict[str, Type[ScoringEngine]] = {
+    ScoringEngine.name: ScoringEngine,
+    TfidfEngine.name: TfidfEngine,
+    BM25Engine.name: BM25Engine,
+    NeuralEngine.name: NeuralEngine,
+}
+
+
+def create_engine(skill_weights: np.ndarray, formula: Optional[str] = None) -> ScoringEngine:
+    """Instantiate the engine named by ``formula`` (default: config.ATS_SCORE_FORMULA)."""
+    formula = formula or ATS_SCORE_FORMULA
+    engine_cls = ENGINES.get(formula)
+    if engine_cls is None:
+        logger.warning("Unknown ATS_SCORE_FORMULA %r, using keyword_match", formula)
+        engine_cls = ScoringEngine
+    return engine_cls(skill_weights)
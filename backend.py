@@ -5,8 +5,10 @@ Run with: uvicorn backend:app --reload
 """
 
 from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import datetime, timedelta
@@ -15,17 +17,31 @@ import json
 from typing import List, Optional
 import os
 import traceback
+import numpy as np
 
 from models import (
     User, Resume, JobDescription, InterviewSession, 
     InterviewQuestion, InterviewAnswer, SkillGap, 
-    LearningProgress, get_db, init_db
+    LearningProgress, SessionLocal, get_db, init_db
 )
-from nlp_utils import extract_ats_keywords, get_skill_recommendations
-from llm_utils import (
-    generate_interview_questions, evaluate_interview_answer,
-    generate_resume_improvements
+from job_queue import job_queue
+from prefetch import interview_prefetcher
+from question_bank import bank_types, fill_bank_job, jd_skills, missing_skills, pick_questions
+from nlp_utils import (
+    SKILL_INDEX, extract_ats_keywords, get_skill_recommendations, rank_job_descriptions
 )
+from cache_utils import cache_stats
+from embedding_utils import embeddings_available, get_chunk_index, semantic_search
+from resume_index import resume_matrix, index_resume, load_corpus_stats, resume_skill_profile
+from config import ATS_SCORE_FORMULA, DEFAULT_INTERVIEW_QUESTIONS, EVALUATION_RETRY_BACKOFF, NUM_TOP_SKILLS
+from llm_utils import MODEL_NAME, check_ollama_status, evaluate_interview_answer, llm_metrics
+from llm_async import (
+    aprime_session_context, agenerate_interview_questions, aevaluate_interview_answers,
+    agenerate_rubric, agenerate_follow_up_question,
+    agenerate_resume_improvements, astream_resume_improvements, astream_chat,
+    allm_flight, close_async_client
+)
+from ollama_client import ollama_health
 
 # Initialize FastAPI
 app = FastAPI(title="InnoCareer AI Backend", version="1.0.0")
@@ -42,6 +58,19 @@ app.add_middleware(
 # Initialize database
 init_db()
 
+
+@app.on_event("startup")
+def start_background_monitors():
+    load_corpus_stats()
+    ollama_health.start()
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    job_queue.stop()
+    await close_async_client()
+
 # ------------------------------------------
 # PYDANTIC MODELS (Request/Response)
 # ------------------------------------------
@@ -65,9 +94,10 @@ class UserResponse(BaseModel):
     created_at: datetime
 
 class ResumeAnalysisRequest(BaseModel):
-    resume_text: str
+    resume_text: str = ""
     job_description: str
     language: str = "en"
+    resume_id: Optional[int] = None  # reuse the skill profile stored at upload
 
 class ResumeAnalysisResponse(BaseModel):
     ats_score: int
@@ -81,6 +111,25 @@ class ResumeAnalysisResponse(BaseModel):
     weaknesses: Optional[list] = None
     raw_improvements: Optional[dict] = None
 
+class ResumeBatchAnalysisRequest(BaseModel):
+    resume_text: str = ""
+    resume_id: Optional[int] = None
+    job_description_ids: List[int] = []  # saved JobDescription rows
+    job_descriptions: List[str] = []  # ad-hoc JD texts
+    user_id: Optional[int] = None  # include every JD saved by this user
+    top_k: Optional[int] = None
+
+class RecruiterRankRequest(BaseModel):
+    job_description: str
+    top_k: int = 20
+
+class ChatRequest(BaseModel):
+    prompt: str
+
+class JobDescriptionRequest(BaseModel):
+    user_id: int
+    text: str
+
 class InterviewSessionRequest(BaseModel):
     session_type: str  # Technical, HR, Mixed
     mode: str  # text, voice, webcam
@@ -101,6 +150,22 @@ class InterviewAnswerRequest(BaseModel):
     confidence_level: Optional[float] = None
     face_verified: Optional[bool] = False
 
+class InterviewPrefetchRequest(BaseModel):
+    session_id: int
+    question_index: int  # 0-based question the candidate is answering now
+    previous_answer: Optional[str] = None  # answer to question_index - 1
+    language: str = "en"
+
+class InterviewAnswerItem(BaseModel):
+    question_id: int
+    answer_text: str
+    emotion: Optional[dict] = None
+    face_verified: Optional[bool] = False
+
+class InterviewAnswersBatchRequest(BaseModel):
+    session_id: int
+    answers: List[InterviewAnswerItem]
+
 # ------------------------------------------
 # HELPER FUNCTIONS
 # ------------------------------------------
@@ -127,6 +192,127 @@ def extract_pdf_text(file_path: str) -> str:
         print(f"❌ PDF extraction error: {e}")
         return ""
 
+async def sse_events(chunks):
+    """Wrap text chunks as Server-Sent Events, ending with a 'done' event."""
+    async for chunk in chunks:
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+def evaluate_answer_job(db: Session, payload: dict):
+    """Job handler: score a pending InterviewAnswer (runs on a worker thread)."""
+    answer = db.query(InterviewAnswer).filter(InterviewAnswer.id == payload["answer_id"]).first()
+    if not answer or answer.status not in (None, "pending"):
+        return
+    question = answer.question
+    evaluation = evaluate_interview_answer(
+        question.question_text if question else "",
+        answer.answer_text or "",
+        interview_type=question.category if question else "technical",
+        context=stored_session_context(question.session if question else None)
+    )
+    if evaluation.get("retry"):
+        # same rule as /submit-answers: only a retryable result is tried again (and
+        # finally marked failed); heuristic grades are stored like LLM grades
+        raise RuntimeError(evaluation["feedback"])
+    answer.score = evaluation.get("score",50)
+    answer.feedback = evaluation.get("feedback","")
+    answer.status = "done"
+
+
+def evaluate_answer_failed(db: Session, payload: dict):
+    answer = db.query(InterviewAnswer).filter(InterviewAnswer.id == payload["answer_id"]).first()
+    if answer:
+        answer.status = "failed"
+        answer.feedback = "Evaluation failed; please resubmit this answer."
+
+
+job_queue.register(
+    "evaluate_answer", evaluate_answer_job, on_failure=evaluate_answer_failed,
+    retry_backoff=EVALUATION_RETRY_BACKOFF
+)
+job_queue.register("fill_question_bank", fill_bank_job)
+
+# JD skills whose missing bank questions are queued for generation per session start
+BANK_FILL_SKILLS = 5
+
+# prefetcher key of the task that primes a session's Ollama context
+SESSION_CONTEXT_KEY = "context"
+# seconds a session turn waits for that task before going without a context
+SESSION_CONTEXT_WAIT = 20.0
+
+
+def stored_session_context(session: Optional[InterviewSession]) -> Optional[List[int]]:
+    """The session's saved Ollama context, if the current model produced it."""
+    if session is None or not session.llm_context or session.llm_context_model != MODEL_NAME:
+        return None
+    return np.frombuffer(session.llm_context, dtype="<i4").tolist()
+
+
+async def prime_session(session_id: int, payload: "InterviewStartRequest", priority: str) -> Optional[List[int]]:
+    """Let the model read the session's JD and resume once and save the resulting context."""
+    context = await aprime_session_context(
+        payload.job_description, payload.resume_text, payload.session_type, payload.language, priority
+    )
+    if context:
+        await run_in_threadpool(save_session_context, session_id, context)
+    return context
+
+
+def save_session_context(session_id: int, context: List[int]):
+    db = SessionLocal()
+    try:
+        db.query(InterviewSession).filter(InterviewSession.id == session_id).update({
+            InterviewSession.llm_context: np.asarray(context, dtype="<i4").tobytes(),
+            InterviewSession.llm_context_model: MODEL_NAME
+        })
+        db.commit()
+    finally:
+        db.close()
+
+
+async def session_context(session_id: int, stored: Optional[List[int]] = None) -> Optional[List[int]]:
+    """A session's context: the saved one, else the result of its priming task."""
+    if stored is not None:
+        return stored
+    return await interview_prefetcher.result(session_id, SESSION_CONTEXT_KEY, SESSION_CONTEXT_WAIT)
+
+
+def index_resume_chunks_job(db: Session, payload: dict):
+    """Job handler: add a stored resume to the semantic search index."""
+    resume = db.query(Resume).filter(Resume.id == payload["resume_id"]).first()
+    if not resume or not (resume.extracted_text or "").strip():
+        return
+    index = get_chunk_index()
+    if resume.id in index.resume_ids():
+        return
+    if not embeddings_available():
+        # let the queue retry; the backend is probed again after a while
+        raise RuntimeError("No embedding backend available")
+    index.add(resume.id, resume.extracted_text)
+
+
+job_queue.register("index_resume_chunks", index_resume_chunks_job)
+
+
+def load_resume_profile(resume_id: Optional[int], resume_text: str, db: Session):
+    """Return (resume text, stored skill profile) for an analysis request.
+
+    Without a resume id the profile is None and the request text is used
+    as-is.  A stored profile is recomputed (and saved) only if the taxonomy
+    changed since the resume was indexed.
+    """
+    if resume_id is None:
+        return resume_text, None
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    stale = resume.skill_version
+    profile = resume_skill_profile(resume)
+    if resume.skill_version != stale:
+        db.commit()
+    return resume_text or resume.extracted_text or "", profile
+
 # ------------------------------------------
 # AUTH ENDPOINTS
 # ------------------------------------------
@@ -215,33 +401,56 @@ async def upload_resume(
     try:
         file_path = f"uploads/{user_id}_{datetime.now().timestamp()}.pdf"
         os.makedirs("uploads", exist_ok=True)
-        with open(file_path, "wb") as f:
-            f.write(await file.read())
-        resume_text = extract_pdf_text(file_path)
-        resume = Resume(
-            user_id=user_id,
-            file_name=file.filename,
-            file_path=file_path,
-            extracted_text=resume_text
-        )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
-        return {
-            "id": resume.id,
-            "filename": resume.file_name,
-            "text_length": len(resume_text),
-            "message": "✅ Resume uploaded successfully"
-        }
+        content = await file.read()
+        # PDF parsing, skill indexing and the corpus refresh block; keep them off the event loop
+        return await run_in_threadpool(store_resume, db, user_id, file.filename, file_path, content)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def store_resume(db: Session, user_id: int, file_name: str, file_path: str, content: bytes) -> dict:
+    with open(file_path, "wb") as f:
+        f.write(content)
+    resume_text = extract_pdf_text(file_path)
+    resume = Resume(
+        user_id=user_id,
+        file_name=file_name,
+        file_path=file_path,
+        extracted_text=resume_text
+    )
+    profile = index_resume(resume)
+    db.add(resume)
+    db.flush()
+    if ATS_SCORE_FORMULA == "neural":
+        # the embedding model is loaded for neural scoring anyway; otherwise semantic search backfills on first use
+        job_queue.enqueue(db, "index_resume_chunks", {"resume_id": resume.id})
+    db.commit()
+    db.refresh(resume)
+    job_queue.notify()
+    resume_matrix.refresh(db)  # keeps the engine's corpus statistics current
+    return {
+        "id": resume.id,
+        "filename": resume.file_name,
+        "text_length": len(resume_text),
+        "skills_found": len(profile.ids),
+        "message": "✅ Resume uploaded successfully"
+    }
+
 @app.post("/api/resume/analyze", response_model=ResumeAnalysisResponse)
 def analyze_resume(request: ResumeAnalysisRequest, db: Session = Depends(get_db)):
     try:
-        analysis = extract_ats_keywords(request.resume_text, request.job_description)
+        resume_text, profile = load_resume_profile(request.resume_id, request.resume_text, db)
+        analysis = extract_ats_keywords(
+            resume_text,
+            request.job_description,
+            resume_bag=profile
+        )
         missing_skills = analysis.get("missing", {}).get("technical", []) + analysis.get("missing", {}).get("soft", [])
         recommendations = get_skill_recommendations(missing_skills, request.language)
+        top_keywords = None
+        if profile is not None:
+            order = profile.counts.argsort(kind="stable")[::-1][:NUM_TOP_SKILLS]
+            top_keywords = [SKILL_INDEX.names[i] for i in profile.ids[order].tolist()]
         return ResumeAnalysisResponse(
             ats_score=analysis.get("ats_score", 0),
             matching_skills={
@@ -252,20 +461,80 @@ def analyze_resume(request: ResumeAnalysisRequest, db: Session = Depends(get_db)
                 "technical": analysis.get("missing", {}).get("technical", []),
                 "soft": analysis.get("missing", {}).get("soft", [])
             },
-            recommendations=recommendations
+            recommendations=recommendations,
+            top_keywords=top_keywords
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/resume/analyze-batch")
+def analyze_resume_batch(request: ResumeBatchAnalysisRequest, db: Session = Depends(get_db)):
+    """Score one resume against many job descriptions, best match first"""
+    try:
+        query = db.query(JobDescription)
+        rows = []
+        if request.job_description_ids:
+            rows += query.filter(JobDescription.id.in_(request.job_description_ids)).all()
+        if request.user_id is not None:
+            seen = {r.id for r in rows}
+            rows += [r for r in query.filter(JobDescription.user_id == request.user_id).all() if r.id not in seen]
+        sources = [(r.id, r.text or "") for r in rows] + [(None, text) for text in request.job_descriptions]
+        if not sources:
+            raise HTTPException(status_code=400, detail="No job descriptions to compare against")
+
+        resume_text, profile = load_resume_profile(request.resume_id, request.resume_text, db)
+        ranked = rank_job_descriptions(
+            resume_text,
+            [text for _, text in sources],
+            resume_bag=profile
         )
+        if request.top_k:
+            ranked = ranked[:request.top_k]
+        results = []
+        for r in ranked:
+            jd_id, jd_text = sources[r["index"]]
+            results.append({
+                "rank": r["rank"],
+                "job_description_id": jd_id,
+                "job_description_preview": jd_text[:200],
+                "ats_score": r["ats_score"],
+                "matching_skills": r["matching"],
+                "missing_skills": r["missing"]
+            })
+        return {"results": results, "total": len(sources)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/job-descriptions")
+def save_job_description(payload: JobDescriptionRequest, db: Session = Depends(get_db)):
+    """Save a job description so it can be reused in batch analysis"""
+    try:
+        jd = JobDescription(user_id=payload.user_id, text=payload.text)
+        db.add(jd)
+        db.commit()
+        db.refresh(jd)
+        return {"id": jd.id, "message": "✅ Job description saved"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/job-descriptions/{user_id}")
+def list_job_descriptions(user_id: int, db: Session = Depends(get_db)):
+    jds = db.query(JobDescription).filter(JobDescription.user_id == user_id).all()
+    return {"job_descriptions": [{"id": jd.id, "text": jd.text, "created_at": jd.created_at} for jd in jds]}
+
 @app.post("/api/resume/improve")
-def improve_resume(
+async def improve_resume(
     user_id: int,
     resume_text: str,
     job_description: str,
     db: Session = Depends(get_db)
 ):
     try:
-        improvements = generate_resume_improvements(resume_text, job_description)
+        improvements = await agenerate_resume_improvements(resume_text, job_description)
         return {
             "ats_score": improvements.get("ats_score"),
             "analysis": improvements.get("analysis"),
@@ -274,46 +543,106 @@ def improve_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/resume/improve/stream")
+async def improve_resume_stream(user_id: int, resume_text: str, job_description: str):
+    """Resume feedback streamed as Server-Sent Events (JSON-encoded text chunks)"""
+    return StreamingResponse(
+        sse_events(astream_resume_improvements(resume_text, job_description)),
+        media_type="text/event-stream"
+    )
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Chatbot completion streamed as Server-Sent Events"""
+    return StreamingResponse(sse_events(astream_chat(request.prompt)), media_type="text/event-stream")
+
+# ------------------------------------------
+# RECRUITER ENDPOINTS
+# ------------------------------------------
+
+@app.post("/api/recruiter/rank")
+def rank_resumes(request: RecruiterRankRequest, db: Session = Depends(get_db)):
+    """Rank every stored resume against one job description"""
+    try:
+        resume_matrix.refresh(db)
+        ranked = resume_matrix.top_k(request.job_description, request.top_k)
+        ids = [r["resume_id"] for r in ranked]
+        rows = {r.id: r for r in db.query(Resume.id, Resume.user_id, Resume.file_name).filter(Resume.id.in_(ids))}
+        for r in ranked:
+            row = rows.get(r["resume_id"])
+            r["user_id"] = row.user_id if row else None
+            r["file_name"] = row.file_name if row else None
+        return {"results": ranked, "total_resumes": len(resume_matrix)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/recruiter/semantic-search")
+def semantic_search_resumes(request: RecruiterRankRequest, db: Session = Depends(get_db)):
+    """Rank indexed resumes by embedding similarity to a job description.
+
+    Resumes not in the index yet are queued for indexing and counted in
+    ``pending_indexing``; they show up in later searches.
+    """
+    try:
+        if not embeddings_available():
+            raise HTTPException(status_code=503, detail="No embedding backend available")
+        index = get_chunk_index()
+        indexed = index.resume_ids()
+        stored = db.query(Resume.id).filter(
+            Resume.extracted_text.isnot(None), func.trim(Resume.extracted_text) != ""
+        )
+        pending = [rid for (rid,) in stored if rid not in indexed]
+        for rid in pending:
+            job_queue.enqueue_once(db, "index_resume_chunks", {"resume_id": rid})
+        if pending:
+            db.commit()
+            job_queue.notify()
+        return {
+            "results": semantic_search(request.job_description, request.top_k),
+            "indexed_chunks": len(index),
+            "pending_indexing": len(pending)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ------------------------------------------
 # INTERVIEW ENDPOINTS
 # ------------------------------------------
 
 @app.post("/api/interview/start")
-def start_interview(
+async def start_interview(
     payload: InterviewStartRequest,
     db: Session = Depends(get_db)
 ):
     try:
-        session = InterviewSession(
-            user_id=payload.user_id,
-            session_type=payload.session_type,
-            mode=payload.mode
-        )
-        db.add(session)
-        db.commit()
-        db.refresh(session)
-        questions = generate_interview_questions(
-            payload.job_description,
-            payload.resume_text,
-            interview_type=payload.session_type,
-            count=5,
-            language=payload.language
-        )
-        question_ids = []
-        for idx, q_text in enumerate(questions):
-            question = InterviewQuestion(
-                session_id=session.id,
-                question_number=idx+1,
-                question_text=q_text,
-                category=payload.session_type,
-                difficulty="Medium"
+        session_id, skills, questions, difficulties = await run_in_threadpool(create_session, db, payload)
+        gap = DEFAULT_INTERVIEW_QUESTIONS - len(questions)
+        # the JD and resume are sent to the model once per session; later turns reuse its context
+        interview_prefetcher.schedule(session_id, SESSION_CONTEXT_KEY, lambda: prime_session(
+            session_id, payload, "interactive" if gap else "batch"
+        ))
+        fill_bank = False
+        if gap:
+            live = await agenerate_interview_questions(
+                payload.job_description,
+                payload.resume_text,
+                interview_type=payload.session_type,
+                count=gap,
+                language=payload.language,
+                context=await session_context(session_id)
             )
-            db.add(question)
-            db.flush()
-            question_ids.append(question.id)
-        db.commit()
+            questions += live[:gap]
+            difficulties += ["Medium"] * len(live[:gap])
+            # generating bank questions needs the LLM; don't queue jobs bound to fail
+            fill_bank = check_ollama_status(probe=False)
+        question_ids = await run_in_threadpool(
+            store_session_questions, db, session_id, payload, questions, difficulties,
+            skills if fill_bank else []
+        )
         return {
-            "session_id": session.id,
+            "session_id": session_id,
             "questions": questions,
             "question_ids": question_ids,
             "total_questions": len(questions),
@@ -322,36 +651,207 @@ def start_interview(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def create_session(db: Session, payload: InterviewStartRequest):
+    """Create the session and pick its bank questions: (id, JD skills, questions, difficulties)."""
+    session = InterviewSession(
+        user_id=payload.user_id,
+        session_type=payload.session_type,
+        mode=payload.mode
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    # questions for the JD's skills come from the bank; the LLM only fills the gap
+    skills = jd_skills(payload.job_description)
+    banked = pick_questions(db, skills, payload.session_type, DEFAULT_INTERVIEW_QUESTIONS, payload.language)
+    return session.id, skills, [q.question_text for q in banked], [q.difficulty for q in banked]
+
+
+def store_session_questions(
+    db: Session,
+    session_id: int,
+    payload: InterviewStartRequest,
+    questions: List[str],
+    difficulties: List[str],
+    fill_skills: List[str]
+) -> List[int]:
+    """Save a session's questions and queue bank questions for ``fill_skills``; their ids."""
+    for bank_type in bank_types(payload.session_type):
+        for skill in missing_skills(db, fill_skills[:BANK_FILL_SKILLS], bank_type, payload.language):
+            job_queue.enqueue_once(db, "fill_question_bank", {
+                "skill": skill, "interview_type": bank_type,
+                "difficulty": "Medium", "language": payload.language
+            })
+    question_ids = []
+    for idx, (q_text, difficulty) in enumerate(zip(questions, difficulties)):
+        question = InterviewQuestion(
+            session_id=session_id,
+            question_number=idx+1,
+            question_text=q_text,
+            category=payload.session_type,
+            difficulty=difficulty
+        )
+        db.add(question)
+        db.flush()
+        question_ids.append(question.id)
+    db.commit()
+    job_queue.notify()
+    return question_ids
+
 @app.post("/api/interview/submit-answer")
 def submit_answer(
     payload: InterviewAnswerRequest,
     db: Session = Depends(get_db)
 ):
+    """Store the answer and queue its evaluation; poll the session endpoint for the score"""
     try:
         question = db.query(InterviewQuestion).filter(InterviewQuestion.id==payload.question_id).first()
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
-        evaluation = evaluate_interview_answer(
-            question.question_text,
-            payload.answer_text,
-            interview_type=question.category
-        )
         answer = InterviewAnswer(
             question_id=payload.question_id,
             answer_text=payload.answer_text,
-            score=evaluation.get("score",50),
-            feedback=evaluation.get("feedback",""),
             emotion=payload.emotion,
             confidence_level=payload.emotion.get("confidence") if payload.emotion else None,
-            face_verified=payload.face_verified
+            face_verified=payload.face_verified,
+            status="pending"
         )
         db.add(answer)
+        db.flush()
+        job_queue.enqueue(db, "evaluate_answer", {"answer_id": answer.id})
         db.commit()
-        db.refresh(answer)
-        return {"answer_id": answer.id, "score": answer.score, "feedback": answer.feedback, "success": True}
+        job_queue.notify()
+        return {"answer_id": answer.id, "status": answer.status, "success": True}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/interview/submit-answers")
+async def submit_answers(
+    payload: InterviewAnswersBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """Evaluate every answer of a session concurrently and store them in one transaction"""
+    try:
+        questions, stored = await run_in_threadpool(load_answered_questions, db, payload)
+        context = await session_context(payload.session_id, stored)
+        evaluations = await aevaluate_interview_answers([
+            {
+                "question": questions[a.question_id][0],
+                "answer_text": a.answer_text,
+                "interview_type": questions[a.question_id][1]
+            }
+            for a in payload.answers
+        ], context=context)
+        if any(e.get("retry") for e in evaluations):
+            # the scheduler turned grading away: ask for a resubmit instead of storing heuristic grades
+            raise HTTPException(
+                status_code=503, detail="Evaluation is busy; please submit again shortly",
+                headers={"Retry-After": "10"}
+            )
+        answers = [
+            InterviewAnswer(
+                question_id=a.question_id,
+                answer_text=a.answer_text,
+                score=evaluation.get("score",50),
+                feedback=evaluation.get("feedback",""),
+                emotion=a.emotion,
+                confidence_level=a.emotion.get("confidence") if a.emotion else None,
+                face_verified=a.face_verified
+            )
+            for a, evaluation in zip(payload.answers, evaluations)
+        ]
+        results = await run_in_threadpool(store_answers, db, answers)
+        interview_prefetcher.cancel_session(payload.session_id)
+        return {"session_id": payload.session_id, "results": results, "success": True}
+    except HTTPException:
+        raise
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def load_answered_questions(db: Session, payload: InterviewAnswersBatchRequest):
+    """({question id: (text, category)}, saved session context) for a batch of answers; 404 if any is unknown."""
+    ids = [a.question_id for a in payload.answers]
+    questions = {
+        q.id: (q.question_text, q.category) for q in db.query(InterviewQuestion).filter(
+            InterviewQuestion.id.in_(ids), InterviewQuestion.session_id == payload.session_id
+        )
+    }
+    unknown = [qid for qid in ids if qid not in questions]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Questions not found in session: {unknown}")
+    session = db.query(InterviewSession).filter(InterviewSession.id==payload.session_id).first()
+    return questions, stored_session_context(session)
+
+
+def store_answers(db: Session, answers: List[InterviewAnswer]) -> List[dict]:
+    db.add_all(answers)
+    db.commit()
+    return [
+        {"question_id": a.question_id, "answer_id": a.id, "score": a.score, "feedback": a.feedback}
+        for a in answers
+    ]
+
+@app.post("/api/interview/prefetch")
+async def prefetch_interview_turn(payload: InterviewPrefetchRequest, db: Session = Depends(get_db)):
+    """Speculatively prepare the next turn while the candidate answers.
+
+    Generates grading rubrics for the current and next question and a
+    follow-up to the previous answer; earlier speculative work of the
+    session that is no longer needed is cancelled.
+    """
+    try:
+        session_id = payload.session_id
+        questions, stored = await run_in_threadpool(load_session_questions, db, session_id)
+        if not questions:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        async def rubric(text, category):
+            return await agenerate_rubric(text, category, context=await session_context(session_id, stored))
+
+        async def follow_up(text, category):
+            return await agenerate_follow_up_question(
+                text, payload.previous_answer, category, payload.language,
+                context=await session_context(session_id, stored)
+            )
+
+        # rubrics of answered questions stay until the session ends: their answers still need grading
+        wanted = [SESSION_CONTEXT_KEY] + [f"rubric:{qid}" for qid, _, _ in questions[:payload.question_index]]
+        for qid, text, category in questions[payload.question_index:payload.question_index + 2]:
+            key = f"rubric:{qid}"
+            interview_prefetcher.schedule(session_id, key, lambda t=text, c=category: rubric(t, c))
+            wanted.append(key)
+        if payload.previous_answer and 0 < payload.question_index <= len(questions):
+            qid, text, category = questions[payload.question_index - 1]
+            key = f"follow_up:{qid}"
+            interview_prefetcher.schedule(session_id, key, lambda: follow_up(text, category))
+            wanted.append(key)
+        interview_prefetcher.keep_only(payload.session_id, wanted)
+        return {"session_id": payload.session_id, "prefetching": wanted}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def load_session_questions(db: Session, session_id: int):
+    """([(id, text, category)] in question order, saved session context)."""
+    questions = [
+        (q.id, q.question_text, q.category)
+        for q in db.query(InterviewQuestion).filter(InterviewQuestion.session_id==session_id)
+                   .order_by(InterviewQuestion.question_number)
+    ]
+    return questions, stored_session_context(db.query(InterviewSession).filter(InterviewSession.id==session_id).first())
+
+@app.get("/api/interview/follow-up/{session_id}/{question_id}")
+async def get_follow_up(session_id: int, question_id: int, wait: float = 0.0):
+    """Prefetched follow-up to the answer of a question, if ready (waits up to `wait` s)"""
+    follow_up = await interview_prefetcher.result(session_id, f"follow_up:{question_id}", min(wait, 10.0))
+    return {"ready": follow_up is not None, "follow_up": follow_up}
+
 @app.get("/api/interview/session/{session_id}")
 def get_session_results(session_id: int, db: Session = Depends(get_db)):
     try:
@@ -359,13 +859,20 @@ def get_session_results(session_id: int, db: Session = Depends(get_db)):
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         answers = db.query(InterviewAnswer).join(InterviewQuestion).filter(InterviewQuestion.session_id==session_id).all()
-        scores=[a.score for a in answers]
+        pending = [a for a in answers if a.status == "pending"]
+        failed = [a for a in answers if a.status == "failed"]
+        scored = [a for a in answers if a.status in (None, "done")]
+        scores=[a.score for a in scored]
         overall = sum(scores)/len(scores) if scores else 0
-        session.overall_score=overall
-        session.completed=True
-        db.commit()
+        if not pending:
+            session.overall_score=overall
+            session.completed=True
+            db.commit()
         return {"session_id":session.id,"overall_score":overall,"total_questions":len(answers),"individual_scores":scores,
-                "answers":[{"question":a.answer_text,"score":a.score,"feedback":a.feedback,"emotion":a.emotion,"face_verified":a.face_verified} for a in answers]}
+                "progress":{"evaluated":len(scored),"pending":len(pending),"failed":len(failed),"complete":not pending},
+                "answers":[{"question":a.answer_text,"score":a.score,"feedback":a.feedback,"emotion":a.emotion,"face_verified":a.face_verified,"status":a.status or "done"} for a in answers]}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -387,10 +894,29 @@ def get_dashboard_summary(user_id: int, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """Hit/miss counters of the in-process result caches"""
+    return cache_stats()
+
+@app.get("/api/jobs/stats")
+def get_job_stats(db: Session = Depends(get_db)):
+    """Background job counts by status"""
+    return job_queue.stats(db)
+
+@app.get("/api/llm/metrics")
+def get_llm_metrics():
+    """Circuit breaker state/counters, cached Ollama health, cache and coalescing stats"""
+    metrics = llm_metrics()
+    metrics["coalescing_async"] = allm_flight.stats()
+    metrics["prefetch"] = interview_prefetcher.stats()
+    return metrics
+
 # health check
 @app.get("/api/health")
 def health_check():
-    return {"status":"✅ Backend is running","timestamp":datetime.now().isoformat()}
+    return {"status":"✅ Backend is running","timestamp":datetime.now().isoformat(),
+            "ollama":ollama_health.status()}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,353 @@
+"""
+Small in-process result caches.
+
+Results are keyed by a content hash of their inputs (plus whatever version
+string invalidates them, e.g. the skill taxonomy version), kept for
+``CACHE_TTL`` seconds and evicted least-recently-used once a cache holds
+``CACHE_MAX_ENTRIES`` items.  Every cache counts hits and misses;
+``cache_stats()`` reports all of them.
+
+PersistentCache adds a SQLite file behind a TTLCache for results that are
+expensive enough to keep across restarts (LLM responses).
+
+SingleFlight / AsyncSingleFlight coalesce concurrent identical requests:
+while a key is being computed, later callers wait for that result instead
+of starting their own computation.
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+from config import CACHE_ENABLED, CACHE_MAX_ENTRIES, CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# every TTLCache registers itself here so stats can be reported in one place
+_caches: Dict[str, "TTLCache"] = {}
+
+
+def content_key(*parts: Any) -> str:
+    """Stable SHA-256 key for arbitrary str/bytes/ndarray/JSON-able parts."""
+    h = hashlib.sha256()
+    _hash_parts(h, parts)
+    return h.hexdigest()
+
+
+def _hash_parts(h, parts):
+    for part in parts:
+        if isinstance(part, (tuple, list)) and any(isinstance(p, (np.ndarray, tuple, list)) for p in part):
+            h.update(b"t")
+            _hash_parts(h, part)
+        elif isinstance(part, np.ndarray):
+            h.update(b"a" + str(part.dtype).encode() + part.tobytes())
+        elif isinstance(part, bytes):
+            h.update(b"b" + part)
+        elif isinstance(part, str):
+            h.update(b"s" + part.encode("utf-8"))
+        else:
+            h.update(b"j" + json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x00")
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL,
+        enabled: bool = CACHE_ENABLED
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not self.enabled:
+            return default
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if not self.enabled:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+class PersistentCache(TTLCache):
+    """TTLCache backed by a SQLite table so entries survive restarts.
+
+    Reads are served from memory; a memory miss falls through to disk.
+    Values must be JSON-serialisable.  The disk table is trimmed to
+    ``max_entries`` by last access time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL,
+        enabled: bool = CACHE_ENABLED,
+        memory_entries: int = CACHE_MAX_ENTRIES
+    ):
+        super().__init__(name, min(memory_entries, max_entries), ttl, enabled)
+        self.path = path
+        self.disk_max_entries = max_entries
+        self.disk_hits = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+            db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            self._db = db
+        return self._db
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = super().get(key, _MISSING)
+        if value is not _MISSING or not self.enabled:
+            return default if value is _MISSING else value
+        now = time.time()
+        try:
+            with self._db_lock:
+                row = self._conn().execute(
+                    "SELECT value, expires FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] < now:
+                    return default
+                self._conn().execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning("Cache %s: disk read failed: %s", self.name, e)
+            return default
+        value = json.loads(row[0])
+        with self._lock:
+            self.misses -= 1  # counted by the memory lookup, but served from disk
+            self.hits += 1
+            self.disk_hits += 1
+        super().set(key, value, ttl=row[1] - now)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if not self.enabled:
+            return
+        super().set(key, value, ttl)
+        now = time.time()
+        try:
+            with self._db_lock:
+                db = self._conn()
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now + (self.ttl if ttl is None else ttl), now)
+                )
+                excess = db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.disk_max_entries
+                if excess > 0:
+                    db.execute(
+                        "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+                        (excess,)
+                    )
+                    self.evictions += excess
+        except sqlite3.Error as e:
+            logger.warning("Cache %s: disk write failed: %s", self.name, e)
+
+    def clear(self):
+        super().clear()
+        with self._db_lock:
+            self._conn().execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            return self._conn().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats.update(size=len(self), memory_size=len(self._data), max_entries=self.disk_max_entries,
+                     disk_hits=self.disk_hits, path=self.path)
+        return stats
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one ``fn`` per key at a time; concurrent callers share its result."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.shared = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "shared": self.shared}
+
+
+class _AsyncFlight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines on one event loop.
+
+    The shared computation runs as its own task, so cancelling one caller
+    (including the first) does not cancel it for the others; it is only
+    cancelled once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.leaders = 0
+        self.shared = 0
+        self._flights: Dict[str, _AsyncFlight] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = self._flights[key] = _AsyncFlight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(
+                lambda _: self._flights.pop(key, None) if self._flights.get(key) is flight else None
+            )
+            self.leaders += 1
+        else:
+            self.shared += 1
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+        return result if leader else copy.deepcopy(result)
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "shared": self.shared}
+
+
+def cached(cache: TTLCache, version: Callable[[], str] = lambda: "") -> Callable:
+    """Memoize a function in ``cache`` keyed on its arguments.
+
+    Values are deep-copied in and out so callers may mutate what they get
+    back (the Streamlit page adds keys to analysis dicts).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            named = [part for name in sorted(kwargs) for part in (name, kwargs[name])]
+            key = content_key(fn.__qualname__, version(), *args, *named)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return copy.deepcopy(value)
+            value = fn(*args, **kwargs)
+            cache.set(key, copy.deepcopy(value))
+            return value
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Hit/miss counters of every cache in this process."""
+    return {name: cache.stats() for name, cache in _caches.items()}
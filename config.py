@@ -17,8 +17,25 @@ DATABASE_URL = f"sqlite:///./{DATABASE_NAME}"
 # LLM Configuration
 OLLAMA_HOST = "localhost"
 OLLAMA_PORT = 11434
-OLLAMA_API_URL = f"http://{OLLAMA_HOST}:{OLLAMA_PORT}/api/generate"
+OLLAMA_BASE_URL = f"http://{OLLAMA_HOST}:{OLLAMA_PORT}"
+OLLAMA_API_URL = f"{OLLAMA_BASE_URL}/api/generate"
 DEFAULT_MODEL = "mistral"  # Options: mistral, llama3, neural-chat, etc.
+OLLAMA_POOL_SIZE = 10  # keep-alive connections shared by all Ollama calls
+OLLAMA_ASYNC_MAX_CONNECTIONS = 200  # in-flight requests of the async client (llm_async)
+OLLAMA_CONNECT_TIMEOUT = 3  # Seconds
+OLLAMA_READ_TIMEOUT = 60  # Seconds, default for generation calls
+OLLAMA_HEALTH_TIMEOUT = 2  # Seconds, for status checks
+OLLAMA_HEALTH_INTERVAL = 10  # Seconds between background health probes
+OLLAMA_HEALTH_TTL = 30  # Seconds a health result is trusted without a new probe
+LLM_MAX_RETRIES = 2  # extra attempts per LLM call on connection errors/timeouts/5xx
+LLM_RETRY_BACKOFF = 0.5  # Seconds, base of the jittered exponential backoff
+LLM_BREAKER_FAILURES = 5  # consecutive failures that open the circuit breaker
+LLM_BREAKER_RESET = 30  # Seconds the breaker stays open before a trial call
+LLM_MAX_CONCURRENCY = 2  # requests sent to Ollama at the same time
+LLM_PRIORITY_CLASSES = ["interactive", "batch"]  # highest priority first
+LLM_CLASS_CONCURRENCY = {"interactive": 2, "batch": 1}  # batch work never takes every slot
+LLM_QUEUE_LIMITS = {"interactive": 50, "batch": 20}  # callers beyond this are rejected at once
+LLM_QUEUE_DEADLINES = {"interactive": 20, "batch": 120}  # Seconds a call may wait for a slot
 
 # Supported Languages
 SUPPORTED_LANGUAGES = ["en", "hi", "ta", "te", "ml"]
@@ -40,6 +57,8 @@ ENABLE_OFFLINE_MODE = True
 
 # Interview Settings
 DEFAULT_INTERVIEW_QUESTIONS = 5
+QUESTION_BANK_PER_SKILL = 8  # questions generated per (skill, type, difficulty, language)
+QUESTION_BANK_WARM_SKILLS = 50  # skills pre-generated by `python question_bank.py`
 INTERVIEW_TIMEOUT_SECONDS = 300
 INTERVIEW_MODES = ["text", "voice", "webcam"]
 INTERVIEW_TYPES = ["Technical", "HR", "Behavioral", "Mixed"]
@@ -56,9 +75,17 @@ ALLOWED_EXTENSIONS = {".pdf", ".txt", ".docx"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
 # PDF Extraction Settings
-MAX_CHARS_TO_EXTRACT = 5000
+MAX_CHARS_TO_EXTRACT = 5000  # hard cap on any document section sent to the LLM
+
+# Prompt budgets (see prompt_utils.py); tokens are estimated from characters
+PROMPT_CHARS_PER_TOKEN = 4
+PROMPT_RESUME_TOKENS = 900
+PROMPT_JD_TOKENS = 600
+PROMPT_FEEDBACK_TOKENS = 500  # interview feedback in the readiness analysis
 
 # NLP Settings
+SKILL_TAXONOMY_PATH = "data/skill_taxonomy.json"  # relative paths resolve next to the code
+SKILL_INDEX_PATH = "data/skill_taxonomy.idx"  # compiled index, rebuilt when the taxonomy changes
 MIN_SKILL_CONFIDENCE = 0.5
 NUM_TOP_SKILLS = 10
 NUM_RECOMMENDATIONS = 5
@@ -66,12 +93,30 @@ NUM_RECOMMENDATIONS = 5
 # ATS Score Settings
 MIN_ATS_SCORE = 0
 MAX_ATS_SCORE = 100
-ATS_SCORE_FORMULA = "keyword_match"  # Options: keyword_match, neural
+ATS_SCORE_FORMULA = "keyword_match"  # Options: keyword_match, tfidf, bm25, neural
+BM25_K1 = 1.2  # term frequency saturation
+BM25_B = 0.75  # resume length normalisation
+
+# Embeddings for the "neural" formula and semantic resume search (CPU only).
+# sentence-transformers is used when installed, otherwise Ollama embeddings.
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+OLLAMA_EMBED_MODEL = "nomic-embed-text"
+OLLAMA_EMBED_URL = f"{OLLAMA_BASE_URL}/api/embed"
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_CHUNK_WORDS = 80
+EMBEDDING_CACHE_SIZE = 10000
+EMBEDDING_RETRY_INTERVAL = 60  # seconds before looking for a missing embedding backend again
+CHUNK_INDEX_PATH = "data/resume_chunks"  # on-disk ANN index of resume chunks
 
 # Interview Answer Evaluation
 MIN_ANSWER_LENGTH = 20
 MAX_ANSWER_LENGTH = 2000
 EVALUATION_TIMEOUT = 30
+EVALUATION_WORKERS = 2  # background threads scoring submitted answers
+JOB_MAX_ATTEMPTS = 3  # a failing background job is retried this often
+JOB_LEASE_SECONDS = 300  # running jobs older than this are requeued (crashed worker)
+JOB_POLL_INTERVAL = 2.0  # Seconds between queue polls when idle
+EVALUATION_RETRY_BACKOFF = 15  # Seconds; a busy evaluation is retried after 30 s, then 60 s
 
 # Emotion Detection Settings
 EMOTION_CONFIDENCE_THRESHOLD = 0.5
@@ -92,6 +137,10 @@ NEEDS_PRACTICE_THRESHOLD = 40
 # Cache Settings
 CACHE_TTL = 3600  # Cache time to live in seconds
 CACHE_ENABLED = True
+CACHE_MAX_ENTRIES = 1024  # per cache; least recently used entries are evicted first
+LLM_CACHE_PATH = "data/llm_cache.sqlite3"  # LLM responses, kept across restarts
+LLM_CACHE_TTL = 7 * 24 * 3600  # Seconds
+LLM_CACHE_MAX_ENTRIES = 20000
 
 # Debug Settings
 DEBUG_MODE = False
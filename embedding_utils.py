@@ -0,0 +1,400 @@
+"""
+Local sentence embeddings for the "neural" ATS formula and semantic search.
+
+Texts are split into overlapping word chunks and embedded on the CPU in
+batches, either with sentence-transformers (if installed) or through the
+local Ollama embeddings endpoint.  Chunk embeddings are cached by content
+hash, L2-normalised, and compared with plain matrix products.
+
+ChunkIndex keeps stored resume chunks in a small on-disk IVF index: vectors
+are clustered with k-means and a query only scans the few closest clusters,
+so semantic search does not have to brute-force every chunk once the
+corpus grows.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache_utils import TTLCache, content_key
+from config import (
+    EMBEDDING_MODEL, OLLAMA_EMBED_MODEL, OLLAMA_EMBED_URL,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_CHUNK_WORDS, EMBEDDING_CACHE_SIZE,
+    EMBEDDING_RETRY_INTERVAL, CHUNK_INDEX_PATH
+)
+from ollama_client import ollama_client
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 30
+
+# IVF settings: brute force below IVF_MIN_VECTORS, otherwise ~sqrt(n) lists
+IVF_MIN_VECTORS = 2048
+IVF_NPROBE = 8
+IVF_KMEANS_ITERATIONS = 10
+
+embedding_cache = TTLCache("embeddings", max_entries=EMBEDDING_CACHE_SIZE)
+
+
+# ------------------------
+# CHUNKING
+# ------------------------
+
+def chunk_text(text: str, max_words: int = EMBEDDING_CHUNK_WORDS) -> List[str]:
+    """Split text into chunks of roughly ``max_words`` words.
+
+    Chunks follow paragraph/sentence boundaries where possible and overlap
+    by one sentence so a statement split across a boundary is still seen
+    whole by one chunk.
+    """
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n\s*\n|\n(?=\s*[-•*])", text or "") if s.strip()]
+    chunks, current, count = [], [], 0
+    for sentence in sentences:
+        words = len(sentence.split())
+        if current and count + words > max_words:
+            chunks.append(" ".join(current))
+            current, count = current[-1:], len(current[-1].split())
+        current.append(sentence)
+        count += words
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+# ------------------------
+# EMBEDDERS
+# ------------------------
+
+class _Embedder:
+    """Lazily picks sentence-transformers, then Ollama, then nothing.
+
+    Finding nothing is not final: detection is retried every
+    EMBEDDING_RETRY_INTERVAL seconds, so embeddings come back once Ollama
+    does without a restart.
+    """
+
+    def __init__(self, retry_interval: float = EMBEDDING_RETRY_INTERVAL):
+        self._model = None
+        self._backend = None
+        self._checked_at = 0.0
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        return self._backend is None or (
+            not self._backend and time.monotonic() - self._checked_at >= self.retry_interval
+        )
+
+    @property
+    def backend(self) -> Optional[str]:
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self._backend = self._load()
+                    self._checked_at = time.monotonic()
+        return self._backend or None
+
+    @property
+    def model_name(self) -> str:
+        return EMBEDDING_MODEL if self.backend == "sentence-transformers" else OLLAMA_EMBED_MODEL
+
+    def _load(self) -> str:
+        try:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+            return "sentence-transformers"
+        except Exception as e:
+            logger.info("sentence-transformers unavailable (%s); trying Ollama embeddings", e)
+        try:
+            self._ollama_embed(["ping"])
+            return "ollama"
+        except Exception as e:
+            logger.warning("No embedding backend available: %s", e)
+            return ""
+
+    def _ollama_embed(self, texts: List[str]) -> np.ndarray:
+        r = ollama_client.post(
+            OLLAMA_EMBED_URL,
+            json={"model": OLLAMA_EMBED_MODEL, "input": texts},
+            timeout=REQUEST_TIMEOUT
+        )
+        r.raise_for_status()
+        return np.array(r.json()["embeddings"], dtype=np.float32)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self.backend == "sentence-transformers":
+            return np.asarray(
+                self._model.encode(texts, batch_size=EMBEDDING_BATCH_SIZE, show_progress_bar=False),
+                dtype=np.float32
+            )
+        return self._ollama_embed(texts)
+
+
+embedder = _Embedder()
+
+
+def embeddings_available() -> bool:
+    return embedder.backend is not None
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Return L2-normalised embeddings (n, dim); cached per text."""
+    keys = [content_key(embedder.model_name, t) for t in texts]
+    vectors: List[Optional[np.ndarray]] = [embedding_cache.get(k) for k in keys]
+    todo = [i for i, v in enumerate(vectors) if v is None]
+    for start in range(0, len(todo), EMBEDDING_BATCH_SIZE):
+        batch = todo[start:start + EMBEDDING_BATCH_SIZE]
+        embedded = embedder.embed([texts[i] for i in batch])
+        embedded /= np.maximum(np.linalg.norm(embedded, axis=1, keepdims=True), 1e-12)
+        for i, vec in zip(batch, embedded):
+            vectors[i] = vec
+            embedding_cache.set(keys[i], vec)
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(vectors)
+
+
+# ------------------------
+# SIMILARITY
+# ------------------------
+
+def semantic_scores(resume_text: str, job_descriptions: List[str]) -> np.ndarray:
+    """Semantic match (0-100) of one resume against many JDs.
+
+    Every JD chunk is compared with every resume chunk in one matrix
+    product; a JD scores the mean over its chunks of the best-matching
+    resume chunk.
+    """
+    resume_chunks = chunk_text(resume_text)
+    jd_chunks = [chunk_text(jd) for jd in job_descriptions]
+    flat = [c for chunks in jd_chunks for c in chunks]
+    if not resume_chunks or not flat:
+        return np.zeros(len(job_descriptions))
+
+    vectors = embed_texts(resume_chunks + flat)
+    resume_vecs, jd_vecs = vectors[:len(resume_chunks)], vectors[len(resume_chunks):]
+    best = np.clip((jd_vecs @ resume_vecs.T).max(axis=1), 0.0, 1.0)
+    rows = np.repeat(np.arange(len(job_descriptions)), [len(c) for c in jd_chunks])
+    totals = np.bincount(rows, weights=best, minlength=len(job_descriptions))
+    counts = np.bincount(rows, minlength=len(job_descriptions))
+    return np.divide(100.0 * totals, counts, out=np.zeros(len(job_descriptions)), where=counts > 0)
+
+
+# ------------------------
+# ON-DISK ANN INDEX
+# ------------------------
+
+class ChunkIndex:
+    """IVF index over stored resume chunk embeddings.
+
+    Layout under ``path``: a clustered base generation - ``vectors.<gen>.npy``
+    (n, dim) float32 sorted by cluster, ``owners.<gen>.npy`` (resume id per
+    vector), ``centroids.<gen>.npy`` and ``offsets.<gen>.npy`` (cluster start
+    positions) - and the vectors added since, appended as raw rows to
+    ``tail_vectors.<gen>.f32`` and ``tail_owners.<gen>.i64``.  ``meta.json``
+    names the generation and the number of tail rows; it is replaced
+    atomically and is the commit point, so an interrupted write leaves the
+    index as it was.  The tail is always scanned exactly; once it grows large
+    the whole index is re-clustered into a new generation.
+    """
+
+    def __init__(self, path: str = CHUNK_INDEX_PATH):
+        self.path = path
+        self.generation = 0
+        self._reset(0, model=None)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _reset(self, dim: int, model: Optional[str]):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)  # clustered base
+        self.owners = np.zeros(0, dtype=np.int64)
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.tail_vectors = np.zeros((0, dim), dtype=np.float32)
+        self.tail_owners = np.zeros(0, dtype=np.int64)
+        self.model = model
+
+    def __len__(self) -> int:
+        return len(self.owners) + len(self.tail_owners)
+
+    def resume_ids(self) -> set:
+        return set(np.unique(np.concatenate((self.owners, self.tail_owners))).tolist())
+
+    def _file(self, name: str, generation: Optional[int] = None) -> str:
+        base, ext = os.path.splitext(name)
+        gen = self.generation if generation is None else generation
+        return os.path.join(self.path, f"{base}.{gen}{ext}")
+
+    def _load(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if "generation" not in meta:
+                logger.info("Ignoring chunk index %s in the old layout; it will be rebuilt", self.path)
+                return
+            self.generation = meta["generation"]
+            dim, tail = meta["dim"], meta["tail"]
+            self.vectors = np.load(self._file("vectors.npy"), mmap_mode="r")
+            self.owners = np.load(self._file("owners.npy"))
+            self.centroids = np.load(self._file("centroids.npy"))
+            self.offsets = np.load(self._file("offsets.npy"))
+            # rows past ``tail`` were written by an append that never committed
+            self.tail_vectors = np.fromfile(
+                self._file("tail_vectors.f32"), dtype=np.float32, count=tail * dim
+            ).reshape(tail, dim)
+            self.tail_owners = np.fromfile(self._file("tail_owners.i64"), dtype=np.int64, count=tail)
+            self.model = meta["model"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable chunk index %s: %s", self.path, e)
+            self._reset(0, model=None)
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "model": self.model,
+                "generation": self.generation,
+                "dim": int(self.tail_vectors.shape[1]),
+                "tail": len(self.tail_owners)
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, meta_path)
+
+    def _append_tail(self, vecs: np.ndarray, owners: np.ndarray):
+        """Append rows to the tail files, dropping any uncommitted rows first."""
+        committed = len(self.tail_owners)
+        for name, rows, width in (
+            ("tail_vectors.f32", vecs, vecs.shape[1] * 4),
+            ("tail_owners.i64", owners, 8)
+        ):
+            with open(self._file(name), "ab") as f:
+                f.truncate(committed * width)
+                f.write(np.ascontiguousarray(rows).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write_generation(self, generation: int):
+        """Write the in-memory base and tail as ``generation`` and commit it."""
+        os.makedirs(self.path, exist_ok=True)
+        old = self.generation
+        np.save(self._file("vectors.npy", generation), np.asarray(self.vectors))
+        np.save(self._file("owners.npy", generation), self.owners)
+        np.save(self._file("centroids.npy", generation), self.centroids)
+        np.save(self._file("offsets.npy", generation), self.offsets)
+        np.ascontiguousarray(self.tail_vectors).tofile(self._file("tail_vectors.f32", generation))
+        self.tail_owners.tofile(self._file("tail_owners.i64", generation))
+        self.generation = generation
+        self._write_meta()
+        if old != generation:
+            for name in ("vectors.npy", "owners.npy", "centroids.npy", "offsets.npy",
+                         "tail_vectors.f32", "tail_owners.i64"):
+                try:
+                    os.remove(self._file(name, old))
+                except OSError:
+                    pass
+        self.vectors = np.load(self._file("vectors.npy"), mmap_mode="r")
+
+    def add(self, resume_id: int, text: str):
+        """Embed a resume's chunks and append them to the index."""
+        chunks = chunk_text(text)
+        if not chunks:
+            return
+        vecs = embed_texts(chunks).astype(np.float32)
+        owners = np.full(len(vecs), resume_id, dtype=np.int64)
+        with self._lock:
+            if self.model != embedder.model_name:
+                # embeddings from another model are not comparable; start over
+                self._reset(vecs.shape[1], model=embedder.model_name)
+                self.tail_vectors = vecs
+                self.tail_owners = owners
+                self._write_generation(self.generation + 1)
+                return
+            self._append_tail(vecs, owners)
+            self.tail_vectors = np.vstack((self.tail_vectors, vecs))
+            self.tail_owners = np.concatenate((self.tail_owners, owners))
+            clustered = len(self.owners)
+            tail = len(self.tail_owners)
+            if len(self) >= IVF_MIN_VECTORS and tail > max(clustered // 4, IVF_MIN_VECTORS // 4):
+                self._recluster()
+            else:
+                self._write_meta()
+
+    def _recluster(self):
+        """Cluster base and tail together into a new generation."""
+        vectors = np.vstack((np.asarray(self.vectors), self.tail_vectors))
+        owners = np.concatenate((self.owners, self.tail_owners))
+        n_lists = max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(IVF_KMEANS_ITERATIONS):
+            assign = (vectors @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        assign = (vectors @ centroids.T).argmax(axis=1)
+        order = np.argsort(assign, kind="stable")
+        self.vectors = vectors[order]
+        self.owners = owners[order]
+        self.centroids = centroids.astype(np.float32)
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(assign, minlength=n_lists)))).astype(np.int64)
+        self.tail_vectors = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        self.tail_owners = np.zeros(0, dtype=np.int64)
+        self._write_generation(self.generation + 1)
+
+    def search(self, query: np.ndarray, top_k: int = 20, nprobe: int = IVF_NPROBE) -> List[Tuple[int, float]]:
+        """Best (resume_id, similarity) pairs for a normalised query vector."""
+        with self._lock:
+            sims = [self.tail_vectors @ query] if len(self.tail_owners) else []
+            owners = [self.tail_owners]
+            if len(self.owners) and len(self.centroids):
+                probe = np.argsort(-(self.centroids @ query))[:nprobe]
+                rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in probe])
+                sims.append(np.asarray(self.vectors)[rows] @ query)
+                owners.append(self.owners[rows])
+            if not sims:
+                return []
+            sims = np.concatenate(sims)
+            owners = np.concatenate(owners)
+        if not len(sims):
+            return []
+        # best chunk per resume
+        order = np.argsort(-sims, kind="stable")
+        _, first = np.unique(owners[order], return_index=True)
+        best = order[first]
+        best = best[np.argsort(-sims[best], kind="stable")][:top_k]
+        return [(int(owners[i]), float(sims[i])) for i in best]
+
+
+_chunk_index: Optional[ChunkIndex] = None
+
+
+def get_chunk_index() -> ChunkIndex:
+    global _chunk_index
+    if _chunk_index is None:
+        _chunk_index = ChunkIndex()
+    return _chunk_index
+
+
+def semantic_search(job_description: str, top_k: int = 20) -> List[Dict]:
+    """Rank indexed resumes by semantic similarity to a job description."""
+    chunks = chunk_text(job_description)
+    if not chunks or not len(get_chunk_index()):
+        return []
+    query = embed_texts(chunks).mean(axis=0)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+    return [
+        {"resume_id": rid, "score": round(100.0 * max(sim, 0.0), 1)}
+        for rid, sim in get_chunk_index().search(query, top_k)
+    ]
@@ -0,0 +1,194 @@
+"""
+SQLite-backed background job queue with an in-process worker pool.
+
+Jobs are rows of the ``jobs`` table, so queued work survives restarts and
+needs no external broker.  Workers claim a job with a conditional UPDATE
+(only one worker can flip it from queued to running), run the handler
+registered for its kind, and mark it done.  Failing jobs are retried with
+backoff up to JOB_MAX_ATTEMPTS; jobs left running by a crashed process are
+requeued once their lease expires.
+"""
+
+import json
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from config import EVALUATION_WORKERS, JOB_MAX_ATTEMPTS, JOB_LEASE_SECONDS, JOB_POLL_INTERVAL
+from models import Job, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# handler(db, payload) does the work inside the worker's session; the queue commits
+Handler = Callable[[Session, Dict], None]
+
+
+class JobQueue:
+    """Registry of job handlers plus the worker threads that run them."""
+
+    def __init__(
+        self,
+        workers: int = EVALUATION_WORKERS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        poll_interval: float = JOB_POLL_INTERVAL
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Handler] = {}
+        self._on_failure: Dict[str, Handler] = {}
+        self._retry_backoff: Dict[str, float] = {}
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+    def register(
+        self,
+        kind: str,
+        handler: Handler,
+        on_failure: Optional[Handler] = None,
+        retry_backoff: float = 1.0
+    ):
+        """Handle jobs of ``kind``; ``on_failure`` runs once retries are exhausted.
+
+        The n-th retry waits ``retry_backoff * 2 ** n`` seconds.
+        """
+        self._handlers[kind] = handler
+        self._retry_backoff[kind] = retry_backoff
+        if on_failure is not None:
+            self._on_failure[kind] = on_failure
+
+    def enqueue(self, db: Session, kind: str, payload: Dict) -> Job:
+        """Add a job to the caller's transaction; workers see it after commit."""
+        job = Job(kind=kind, payload=json.dumps(payload, sort_keys=True), status="queued", attempts=0,
+                  available_at=datetime.utcnow())
+        db.add(job)
+        return job
+
+    def enqueue_once(self, db: Session, kind: str, payload: Dict) -> Optional[Job]:
+        """Like enqueue, unless an identical job is already queued or running."""
+        pending = db.query(Job.id).filter(
+            Job.kind == kind,
+            Job.payload == json.dumps(payload, sort_keys=True),
+            Job.status.in_(["queued", "running"])
+        ).first()
+        if pending:
+            return None
+        return self.enqueue(db, kind, payload)
+
+    def notify(self):
+        """Wake idle workers (call after committing new jobs)."""
+        self._wakeup.set()
+
+    # ------------------------
+    # WORKERS
+    # ------------------------
+
+    def start(self):
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        self._requeue_expired()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                logger.exception("Job worker error")
+                worked = False
+            if not worked:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _requeue_expired(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        db = SessionLocal()
+        try:
+            n = db.query(Job).filter(Job.status == "running", Job.locked_at < cutoff).update(
+                {"status": "queued", "locked_at": None}, synchronize_session=False
+            )
+            db.commit()
+            if n:
+                logger.warning("Requeued %d expired jobs", n)
+        finally:
+            db.close()
+
+    def _claim(self, db: Session) -> Optional[Job]:
+        now = datetime.utcnow()
+        candidates = db.query(Job.id).filter(
+            Job.status == "queued",
+            Job.kind.in_(list(self._handlers)),
+            or_(Job.available_at.is_(None), Job.available_at <= now)
+        ).order_by(Job.id).limit(self.workers + 1).all()
+        for (job_id,) in candidates:
+            claimed = db.query(Job).filter(Job.id == job_id, Job.status == "queued").update(
+                {"status": "running", "locked_at": now, "attempts": Job.attempts + 1},
+                synchronize_session=False
+            )
+            db.commit()
+            if claimed:
+                return db.get(Job, job_id)
+        return None
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False if none was ready."""
+        db = SessionLocal()
+        try:
+            job = self._claim(db)
+            if job is None:
+                return False
+            payload = json.loads(job.payload or "{}")
+            try:
+                self._handlers[job.kind](db, payload)
+                job.status = "done"
+                job.error = None
+                job.finished_at = datetime.utcnow()
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                job = db.get(Job, job.id)
+                job.error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                if job.attempts >= self.max_attempts:
+                    job.status = "failed"
+                    job.finished_at = datetime.utcnow()
+                    logger.error("Job %s (%s) failed: %s", job.id, job.kind, job.error)
+                    on_failure = self._on_failure.get(job.kind)
+                    if on_failure is not None:
+                        on_failure(db, payload)
+                else:
+                    job.status = "queued"
+                    delay = self._retry_backoff.get(job.kind, 1.0) * 2 ** job.attempts
+                    job.available_at = datetime.utcnow() + timedelta(seconds=delay)
+                    logger.warning("Job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, job.error)
+                db.commit()
+            return True
+        finally:
+            db.close()
+
+    def stats(self, db: Session) -> Dict:
+        counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+        counts.update(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        return {"workers": sum(t.is_alive() for t in self._threads), **counts}
+
+
+job_queue = JobQueue()
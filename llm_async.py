@@ -0,0 +1,368 @@
+"""
+Async variants of the llm_utils API for FastAPI's event loop.
+
+The sync helpers block a threadpool worker for as long as Ollama takes to
+answer.  These coroutines use one shared ``httpx.AsyncClient`` instead, so a
+single worker can keep many LLM calls in flight.  Prompts, parsers,
+fallbacks, caching, the circuit breaker and the health monitor are the same
+ones llm_utils uses; only the transport differs.
+
+Nothing here blocks the loop: availability is read from the health
+monitor without probing, and the LLM cache (which may hit SQLite) is
+read and written on worker threads.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from config import (
+    OLLAMA_API_URL, OLLAMA_POOL_SIZE, OLLAMA_ASYNC_MAX_CONNECTIONS,
+    OLLAMA_CONNECT_TIMEOUT, LLM_MAX_RETRIES, LLM_RETRY_BACKOFF
+)
+from cache_utils import AsyncSingleFlight, content_key
+from llm_utils import (
+    MODEL_NAME, REQUEST_TIMEOUT, improvement_cache, llm_cache, check_ollama_status,
+    RUBRIC_PARAMS, FOLLOW_UP_PARAMS, SESSION_PARAMS, _rubric_prompt, _follow_up_prompt,
+    _session_prompt, _session_questions_prompt, cached_rubric,
+    _llm_cache_key, _generate_payload, _malformed, _fallback_questions, _fallback_improvements,
+    _offline_evaluation, _busy_evaluation, EVALUATION_SCHEMA, IMPROVEMENTS_SCHEMA,
+    _questions_prompt, _parse_questions, _evaluation_prompt, _parse_evaluation,
+    _improvements_prompt, _improvements_stream_prompt, _parse_improvements
+)
+from structured_output import Field
+from ollama_client import LLMOverloaded, llm_breaker, llm_scheduler, ollama_health
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+# concurrent identical prompts on the event loop share one upstream generation
+allm_flight = AsyncSingleFlight("llm_responses_async")
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared pooled client, created on first use inside the running loop."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OLLAMA_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=OLLAMA_POOL_SIZE
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT)
+        )
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _cache_get(key: str):
+    return await asyncio.to_thread(llm_cache.get, key)
+
+
+async def _cache_set(key: str, value):
+    await asyncio.to_thread(llm_cache.set, key, value)
+
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, (httpx.TransportError, httpx.TimeoutException)):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500
+
+
+async def _acall_ollama(
+    prompt: str,
+    max_tokens: int = 200,
+    temperature: float = 0.3,
+    priority: str = "interactive",
+    context: Optional[List[int]] = None,
+    json_mode: bool = False,
+    schema: Optional[Dict[str, Field]] = None,
+    raise_overloaded: bool = False
+) -> Optional[str]:
+    """Async ``llm_utils._call_ollama``: same cache, validation, coalescing, scheduling, retries and breaker."""
+    key = _llm_cache_key(prompt, max_tokens, temperature, context, json_mode)
+    payload = _generate_payload(prompt, max_tokens, temperature, context, json_mode)
+    text = await _cache_get(key)
+    if text is not None and not _malformed(payload, text, schema):
+        return text
+    try:
+        return await allm_flight.do(key, lambda: _agenerate(key, payload, priority, schema=schema))
+    except LLMOverloaded:
+        if raise_overloaded:
+            raise
+        return None
+
+
+async def _agenerate(
+    key: str,
+    payload: Dict,
+    priority: str,
+    field: str = "response",
+    schema: Optional[Dict[str, Field]] = None
+):
+    deadline = time.monotonic() + llm_scheduler.deadlines.get(priority, REQUEST_TIMEOUT)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            async with llm_scheduler.aslot(priority, max(0.0, deadline - time.monotonic())):
+                if not llm_breaker.allow():
+                    logger.info("Ollama circuit open; skipping LLM call")
+                    return None
+                r = await get_async_client().post(OLLAMA_API_URL, json=payload)
+                r.raise_for_status()
+                text = r.json().get(field)
+        except LLMOverloaded as e:
+            logger.warning("Ollama call dropped: %s", e)
+            raise
+        except Exception as e:
+            llm_breaker.record_failure()
+            if isinstance(e, httpx.ConnectError):
+                ollama_health.report(False)
+            logger.warning("Ollama call failed (attempt %d): %s", attempt + 1, e)
+            if not _retryable(e) or attempt == LLM_MAX_RETRIES:
+                return None
+            llm_breaker.record_retry()
+            await asyncio.sleep(random.uniform(0, LLM_RETRY_BACKOFF * 2 ** attempt))
+            continue
+        llm_breaker.record_success()
+        ollama_health.report(True)
+        if _malformed(payload, text, schema):
+            logger.warning("Ollama returned malformed JSON (attempt %d)", attempt + 1)
+            if attempt < LLM_MAX_RETRIES:
+                llm_breaker.record_retry()
+                continue
+            return text
+        if text:
+            await _cache_set(key, text)
+        return text
+    return None
+
+
+async def _astream_ollama(
+    prompt: str,
+    max_tokens: int = 300,
+    temperature: float = 0.3,
+    priority: str = "interactive"
+) -> AsyncIterator[str]:
+    """Async ``llm_utils._stream_ollama``."""
+    key = _llm_cache_key(prompt, max_tokens, temperature)
+    cached_text = await _cache_get(key)
+    if cached_text is not None:
+        yield cached_text
+        return
+    payload = dict(_generate_payload(prompt, max_tokens, temperature), stream=True)
+    parts = []
+    done = False
+    try:
+        async with llm_scheduler.aslot(priority):
+            if not llm_breaker.allow():
+                logger.info("Ollama circuit open; skipping LLM call")
+                return
+            async with get_async_client().stream("POST", OLLAMA_API_URL, json=payload) as r:
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        parts.append(chunk["response"])
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        done = True
+                        break
+    except LLMOverloaded as e:
+        logger.warning("Ollama stream dropped: %s", e)
+        return
+    except (GeneratorExit, asyncio.CancelledError):
+        # client went away; the server itself was fine
+        llm_breaker.record_success()
+        raise
+    except Exception as e:
+        llm_breaker.record_failure()
+        if isinstance(e, httpx.ConnectError):
+            ollama_health.report(False)
+        logger.warning("Ollama stream failed: %s", e)
+        return
+    llm_breaker.record_success()
+    ollama_health.report(True)
+    if done and parts:
+        await _cache_set(key, "".join(parts))
+
+# ------------------------
+# HIGH-LEVEL FUNCTIONS
+# ------------------------
+
+async def agenerate_interview_questions(
+    job_description: str,
+    resume_text: str,
+    interview_type: str = "technical",
+    count: int = 5,
+    language: str = "en",
+    context: Optional[List[int]] = None
+) -> List[str]:
+    """Async ``generate_interview_questions``.
+
+    With a session ``context`` (see aprime_session_context) the JD and
+    resume are already known to the model and are not sent again.
+    """
+    if not check_ollama_status(probe=False):
+        return _fallback_questions(interview_type, count)
+    if context:
+        prompt = _session_questions_prompt(interview_type, count)
+    else:
+        prompt = _questions_prompt(job_description, resume_text, interview_type, count)
+    text = await _acall_ollama(prompt, max_tokens=300, context=context, json_mode=True)
+    if not text:
+        return _fallback_questions(interview_type, count)
+    return _parse_questions(text, count)
+
+
+async def aprime_session_context(
+    job_description: str,
+    resume_text: str,
+    interview_type: str = "technical",
+    language: str = "en",
+    priority: str = "batch"
+) -> Optional[List[int]]:
+    """Have Ollama read an interview's JD and resume once and return its context tokens.
+
+    Passing the result as ``context`` to the evaluation and follow-up calls
+    of that session continues from this state, so those prompts carry only
+    the new question and answer.  None if the LLM is unavailable.
+    """
+    if not check_ollama_status(probe=False) or not (job_description or resume_text):
+        return None
+    prompt = _session_prompt(job_description or "", resume_text or "", interview_type, language)
+    key = "context:" + _llm_cache_key(prompt, **SESSION_PARAMS)
+    context = await _cache_get(key)
+    if context is not None:
+        return context
+    payload = _generate_payload(prompt, **SESSION_PARAMS)
+    try:
+        return await allm_flight.do(key, lambda: _agenerate(key, payload, priority, field="context"))
+    except LLMOverloaded:
+        return None
+
+
+async def aevaluate_interview_answer(
+    question: str,
+    answer_text: str,
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None
+) -> Dict:
+    """Async ``evaluate_interview_answer``."""
+    if not check_ollama_status(probe=False):
+        return _offline_evaluation(answer_text)
+    try:
+        # a prefetched rubric sharpens the grade, but is never waited for
+        rubric = await asyncio.to_thread(cached_rubric, question, interview_type, context)
+        text = await _acall_ollama(
+            _evaluation_prompt(question, answer_text, rubric), max_tokens=200, context=context,
+            json_mode=True, schema=EVALUATION_SCHEMA, raise_overloaded=True
+        )
+    except LLMOverloaded:
+        return _busy_evaluation(answer_text)
+    if not text:
+        return _offline_evaluation(answer_text, "LLM request failed")
+    return _parse_evaluation(text, answer_text)
+
+
+async def aevaluate_interview_answers(
+    answers: List[Dict],
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None
+) -> List[Dict]:
+    """Async ``evaluate_interview_answers``: all answers in flight at once."""
+    return list(await asyncio.gather(*[
+        aevaluate_interview_answer(
+            item["question"], item["answer_text"], item.get("interview_type") or interview_type, context
+        )
+        for item in answers
+    ]))
+
+
+async def agenerate_rubric(
+    question: str,
+    interview_type: str = "technical",
+    priority: str = "batch",
+    context: Optional[List[int]] = None
+) -> Optional[str]:
+    """Grading rubric for a question; cached, so the evaluation that needs it finds it."""
+    if not check_ollama_status(probe=False):
+        return None
+    return await _acall_ollama(
+        _rubric_prompt(question, interview_type), priority=priority, context=context, **RUBRIC_PARAMS
+    )
+
+
+async def agenerate_follow_up_question(
+    question: str,
+    answer_text: str,
+    interview_type: str = "technical",
+    language: str = "en",
+    priority: str = "batch",
+    context: Optional[List[int]] = None
+) -> Optional[str]:
+    """One follow-up question probing an answer; None if the LLM is unavailable."""
+    if not check_ollama_status(probe=False) or not answer_text.strip():
+        return None
+    text = await _acall_ollama(
+        _follow_up_prompt(question, answer_text, interview_type, language),
+        priority=priority, context=context, **FOLLOW_UP_PARAMS
+    )
+    return text.strip() if text else None
+
+
+async def agenerate_resume_improvements(resume_text: str, job_description: str) -> Dict:
+    """Async ``generate_resume_improvements`` (shares its result cache)."""
+    key = content_key(MODEL_NAME, resume_text, job_description)
+    cached_result = improvement_cache.get(key)
+    if cached_result is not None:
+        return dict(cached_result)
+
+    if not check_ollama_status(probe=False):
+        return _fallback_improvements(resume_text, job_description)
+    text = await _acall_ollama(
+        _improvements_prompt(resume_text, job_description), max_tokens=300, priority="batch",
+        json_mode=True, schema=IMPROVEMENTS_SCHEMA
+    )
+    if not text:
+        return _fallback_improvements(resume_text, job_description)
+    data = _parse_improvements(text)
+    if data is None:
+        return {"analysis": text, "ats_score": 0, "success": False}
+    improvement_cache.set(key, dict(data))
+    return data
+
+
+async def astream_resume_improvements(resume_text: str, job_description: str) -> AsyncIterator[str]:
+    """Async ``stream_resume_improvements``."""
+    cached_result = improvement_cache.get(content_key(MODEL_NAME, resume_text, job_description))
+    if cached_result is not None:
+        yield cached_result.get("analysis") or ""
+        return
+    produced = False
+    if check_ollama_status(probe=False):
+        async for chunk in _astream_ollama(_improvements_stream_prompt(resume_text, job_description), priority="batch"):
+            produced = True
+            yield chunk
+    if not produced:
+        yield _fallback_improvements(resume_text, job_description)["analysis"]
+
+
+async def astream_chat(prompt: str, max_tokens: int = 500) -> AsyncIterator[str]:
+    """Async ``stream_chat``."""
+    if check_ollama_status(probe=False):
+        async for chunk in _astream_ollama(prompt, max_tokens=max_tokens, temperature=0.7):
+            yield chunk
@@ -5,51 +5,460 @@ prompts and JSON parsing; here we recreate a minimal version so that the
 frontend and backend continue to function after the accidental rollback.
 """
 
-import requests
 import json
 import logging
+import random
+import re
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import requests
 
-from config import OLLAMA_API_URL
+from config import (
+    DEFAULT_MODEL, OLLAMA_API_URL, ENABLE_OFFLINE_MODE, LLM_MAX_RETRIES, LLM_RETRY_BACKOFF,
+    PROMPT_RESUME_TOKENS, PROMPT_FEEDBACK_TOKENS,
+    LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+)
+from cache_utils import PersistentCache, SingleFlight, TTLCache, content_key
+from prompt_utils import budget_documents, fit_text
+from structured_output import Field, extract_json, parse_object, parse_string_list
+from ollama_client import LLMOverloaded, llm_breaker, llm_scheduler, ollama_client, ollama_health
 
 # default Ollama model name
-MODEL_NAME = "mistral"
+MODEL_NAME = DEFAULT_MODEL
 
-# timeout for HTTP calls (seconds)
+# timeout for generation calls (seconds)
 REQUEST_TIMEOUT = 15
 
 logger = logging.getLogger(__name__)
 
+# LLM reviews of identical (resume, JD) pairs; heuristic fallbacks are not cached
+improvement_cache = TTLCache("resume_improvements")
+
+# raw completions keyed by model, normalised prompt and sampling params;
+# persisted so repeated prompts are answered without Ollama after a restart
+llm_cache = PersistentCache("llm_responses", LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL)
+
+# concurrent identical prompts (same cache key) share one upstream generation
+llm_flight = SingleFlight("llm_responses")
+
 # ------------------------
 # LOW-LEVEL HTTP HELPERS
 # ------------------------
 
-def check_ollama_status() -> bool:
-    try:
-        resp = requests.get(OLLAMA_API_URL.replace("/generate", "/status"), timeout=3)
-        return resp.ok
-    except Exception:
-        return False
+def check_ollama_status(probe: bool = True) -> bool:
+    """Cached Ollama availability (see ollama_client.OllamaHealthMonitor).
+
+    Also False while the circuit breaker is open, so callers go straight to
+    their fallbacks.  Async callers pass ``probe=False`` so a stale result
+    never means a blocking HTTP check on the event loop.
+    """
+    return ollama_health.is_up(probe) and not llm_breaker.is_open()
+
 
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
 
-def _call_ollama(prompt: str, max_tokens: int = 200, temperature: float = 0.3) -> Optional[str]:
+
+def _generate_payload(
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    context: Optional[List[int]] = None,
+    json_mode: bool = False
+) -> Dict:
     payload = {
         "model": MODEL_NAME,
         "prompt": prompt,
-        "max_tokens": max_tokens,
-        "temperature": temperature
+        "stream": False,
+        "options": {"num_predict": max_tokens, "temperature": temperature}
     }
+    if context:
+        # continue from a session's saved token state instead of resending its documents
+        payload["context"] = context
+    if json_mode:
+        # constrain sampling to valid JSON
+        payload["format"] = "json"
+    return payload
+
+
+def _llm_cache_key(
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    context: Optional[List[int]] = None,
+    json_mode: bool = False
+) -> str:
+    normalized = " ".join(prompt.split())
+    parts = [MODEL_NAME, normalized, max_tokens, round(temperature, 3)]
+    if context:
+        parts.append(np.asarray(context, dtype=np.int64))
+    if json_mode:
+        parts.append("json")
+    return content_key(*parts)
+
+
+def _malformed(payload: Dict, text: Optional[str], schema: Optional[Dict[str, Field]] = None) -> bool:
+    """True if a JSON-mode response holds no JSON (e.g. cut off by num_predict),
+    or none that satisfies ``schema``."""
+    if not text or payload.get("format") != "json":
+        return False
+    return (parse_object(text, schema) if schema else extract_json(text)) is None
+
+
+def _call_ollama(
+    prompt: str,
+    max_tokens: int = 200,
+    temperature: float = 0.3,
+    priority: str = "interactive",
+    context: Optional[List[int]] = None,
+    json_mode: bool = False,
+    schema: Optional[Dict[str, Field]] = None,
+    raise_overloaded: bool = False
+) -> Optional[str]:
+    """Generate a completion; None if the model server fails or the breaker is open.
+
+    Responses are served from / stored in ``llm_cache``, and concurrent
+    identical calls share one request (``llm_flight``).  Requests wait for a
+    ``llm_scheduler`` slot of their priority class and give up when the
+    queue is full or their deadline passes: None, or LLMOverloaded with
+    ``raise_overloaded``.  Connection errors, timeouts and 5xx responses
+    are retried up to LLM_MAX_RETRIES times with jittered exponential
+    backoff.  ``context`` continues an interview session's saved Ollama
+    context (see llm_async.aprime_session_context).  ``json_mode`` requests
+    Ollama's JSON format; a response without parseable JSON - or, given a
+    ``schema``, without a valid object - is regenerated (within the retry
+    budget) and never cached.
+    """
+    key = _llm_cache_key(prompt, max_tokens, temperature, context, json_mode)
+    payload = _generate_payload(prompt, max_tokens, temperature, context, json_mode)
+    text = llm_cache.get(key)
+    if text is not None and not _malformed(payload, text, schema):
+        return text
     try:
-        r = requests.post(OLLAMA_API_URL, json=payload, timeout=REQUEST_TIMEOUT)
-        r.raise_for_status()
-        data = r.json()
-        # Ollama returns choices list
-        return data.get("choices", [{}])[0].get("text")
-    except Exception as e:
-        logger.warning("Ollama call failed: %s", e)
+        return llm_flight.do(key, lambda: _generate(key, payload, priority, schema))
+    except LLMOverloaded:
+        if raise_overloaded:
+            raise
         return None
 
+
+def _generate(key: str, payload: Dict, priority: str, schema: Optional[Dict[str, Field]] = None) -> Optional[str]:
+    deadline = time.monotonic() + llm_scheduler.deadlines.get(priority, REQUEST_TIMEOUT)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            with llm_scheduler.slot(priority, max(0.0, deadline - time.monotonic())):
+                if not llm_breaker.allow():
+                    logger.info("Ollama circuit open; skipping LLM call")
+                    return None
+                r = ollama_client.post(OLLAMA_API_URL, json=payload, timeout=REQUEST_TIMEOUT)
+                r.raise_for_status()
+                text = r.json().get("response")
+        except LLMOverloaded as e:
+            logger.warning("Ollama call dropped: %s", e)
+            raise
+        except Exception as e:
+            llm_breaker.record_failure()
+            if isinstance(e, requests.ConnectionError):
+                ollama_health.report(False)
+            logger.warning("Ollama call failed (attempt %d): %s", attempt + 1, e)
+            if not _retryable(e) or attempt == LLM_MAX_RETRIES:
+                return None
+            llm_breaker.record_retry()
+            time.sleep(random.uniform(0, LLM_RETRY_BACKOFF * 2 ** attempt))
+            continue
+        llm_breaker.record_success()
+        ollama_health.report(True)
+        if _malformed(payload, text, schema):
+            logger.warning("Ollama returned malformed JSON (attempt %d)", attempt + 1)
+            if attempt < LLM_MAX_RETRIES:
+                llm_breaker.record_retry()
+                continue
+            return text
+        if text:
+            llm_cache.set(key, text)
+        return text
+    return None
+
+
+def _stream_ollama(
+    prompt: str,
+    max_tokens: int = 300,
+    temperature: float = 0.3,
+    priority: str = "interactive"
+) -> Iterator[str]:
+    """Yield completion text as Ollama generates it (no retries once started).
+
+    Yields nothing if the breaker is open or the call fails before the first
+    token; a failure mid-stream just ends the stream.  A cached response is
+    yielded in one piece; complete streams are cached.
+    """
+    key = _llm_cache_key(prompt, max_tokens, temperature)
+    cached_text = llm_cache.get(key)
+    if cached_text is not None:
+        yield cached_text
+        return
+    payload = dict(_generate_payload(prompt, max_tokens, temperature), stream=True)
+    parts = []
+    done = False
+    try:
+        with llm_scheduler.slot(priority):
+            if not llm_breaker.allow():
+                logger.info("Ollama circuit open; skipping LLM call")
+                return
+            with ollama_client.post(OLLAMA_API_URL, json=payload, timeout=REQUEST_TIMEOUT, stream=True) as r:
+                r.raise_for_status()
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        parts.append(chunk["response"])
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        done = True
+                        break
+    except LLMOverloaded as e:
+        logger.warning("Ollama stream dropped: %s", e)
+        return
+    except GeneratorExit:
+        # consumer stopped reading; the server itself was fine
+        llm_breaker.record_success()
+        raise
+    except Exception as e:
+        llm_breaker.record_failure()
+        if isinstance(e, requests.ConnectionError):
+            ollama_health.report(False)
+        logger.warning("Ollama stream failed: %s", e)
+        return
+    llm_breaker.record_success()
+    ollama_health.report(True)
+    if done and parts:
+        llm_cache.set(key, "".join(parts))
+
+
+def llm_metrics() -> Dict:
+    """Circuit breaker counters, cached server health and response cache stats."""
+    return {
+        "breaker": llm_breaker.stats(),
+        "health": ollama_health.status(),
+        "cache": llm_cache.stats(),
+        "coalescing": llm_flight.stats(),
+        "scheduler": llm_scheduler.stats()
+    }
+
+# ------------------------
+# FALLBACKS
+# ------------------------
+
+def _fallback_questions(interview_type: str, count: int) -> List[str]:
+    base = {
+        "technical": [
+            "Explain a challenging bug you fixed.",
+            "Describe your experience with the primary technology in the JD.",
+        ],
+        "hr": [
+            "Tell me about yourself.",
+            "Why do you want this job?",
+        ],
+        "behavioral": [
+            "Describe a time you worked in a team.",
+            "Give an example of handling conflict.",
+        ],
+        "mixed": []
+    }
+    questions = list(base.get(interview_type, []))
+    # pad to count
+    while len(questions) < count:
+        questions.append(f"(Additional {interview_type} question placeholder)")
+    return questions[:count]
+
+
+def _fallback_improvements(resume_text: str, job_description: str) -> Dict:
+    from nlp_utils import extract_ats_keywords
+    analysis = extract_ats_keywords(resume_text, job_description)
+    return {
+        "ats_score": analysis.get("ats_score"),
+        "analysis": "Add more keywords from the job description and quantify achievements.",
+        "success": True,
+    }
+
+# ------------------------
+# PROMPTS AND PARSERS
+# ------------------------
+# shared by the sync functions below and their async twins in llm_async
+
+def _questions_prompt(job_description: str, resume_text: str, interview_type: str, count: int) -> str:
+    resume_text, job_description = budget_documents(resume_text, job_description)
+    return (
+        f"You are a helpful interview coach.\n"
+        f"Generate {count} {interview_type} interview questions tailored to the following job description and resume.\n"
+        f"Job Description:\n{job_description}\n"
+        f"Resume Text:\n{resume_text}\n"
+        f"Return a JSON object {{\"questions\": [...]}} without any commentary."
+    )
+
+
+def _session_questions_prompt(interview_type: str, count: int) -> str:
+    # continues a session context that already holds the JD and resume
+    return (
+        f"Generate {count} {interview_type} interview questions tailored to that job description and resume.\n"
+        f"Return a JSON object {{\"questions\": [...]}} without any commentary."
+    )
+
+
+def _parse_questions(text: str, count: int) -> List[str]:
+    questions = parse_string_list(text, count)
+    if questions is not None:
+        return questions
+    # not JSON at all: one question per line, without list markers
+    lines = [re.sub(r"^(?:\d+[.)]|[-*•])\s*", "", l.strip()) for l in text.splitlines()]
+    return [l for l in lines if l and not l.endswith(":")][:count]
+
+
+def _skill_questions_prompt(skill: str, interview_type: str, difficulty: str, count: int, language: str) -> str:
+    return (
+        f"You are a helpful interview coach.\n"
+        f"Write {count} distinct {difficulty.lower()} {interview_type} interview questions that test a candidate's {skill}.\n"
+        f"Write them in the language with code '{language}'.\n"
+        f"Return a JSON object {{\"questions\": [...]}} without any commentary."
+    )
+
+
+def _evaluation_prompt(question: str, answer_text: str, rubric: Optional[str] = None) -> str:
+    return (
+        f"You are an expert interviewer.\n"
+        f"Question: {question}\n"
+        + (f"Rubric (points a strong answer covers):\n{rubric}\n" if rubric else "")
+        + f"Answer: {answer_text}\n"
+        f"Provide a JSON object with 'score' (0-100) and 'feedback' fields."
+    )
+
+
+# sampling settings of the speculative helpers, so prefetched results are
+# found in llm_cache by the calls that need them
+RUBRIC_PARAMS = {"max_tokens": 150, "temperature": 0.2}
+SESSION_PARAMS = {"max_tokens": 1, "temperature": 0.0}
+FOLLOW_UP_PARAMS = {"max_tokens": 80, "temperature": 0.3}
+
+
+def _rubric_prompt(question: str, interview_type: str) -> str:
+    return (
+        f"You are an expert interviewer preparing to grade a {interview_type} interview.\n"
+        f"Question: {question}\n"
+        f"List the 3-5 key points a strong answer should cover, one per line, without commentary."
+    )
+
+
+def _follow_up_prompt(question: str, answer_text: str, interview_type: str, language: str) -> str:
+    return (
+        f"You are an expert interviewer running a {interview_type} interview.\n"
+        f"Previous question: {question}\n"
+        f"Candidate's answer: {answer_text}\n"
+        f"Ask one short follow-up question that probes the weakest or vaguest part of the answer.\n"
+        f"Write it in the language with code '{language}' and return only the question."
+    )
+
+
+def _session_prompt(job_description: str, resume_text: str, interview_type: str, language: str) -> str:
+    # sent once per interview; its context lets later turns skip both documents
+    resume_text, job_description = budget_documents(resume_text, job_description)
+    return (
+        f"You are an expert interviewer running a {interview_type} interview in the language with code '{language}'.\n"
+        f"Job Description:\n{job_description}\n"
+        f"Candidate's Resume:\n{resume_text}\n"
+        f"Keep both in mind for the rest of this interview. Reply with OK."
+    )
+
+
+def _fallback_evaluation(answer_text: str, reason: str = "No LLM available", retry: bool = False) -> Dict:
+    # simple heuristic: longer answers score higher; 'fallback' marks it as not an LLM grade
+    score = min(100, len(answer_text.split()) * 2)
+    return {"score": score, "feedback": f"{reason}; using heuristic scoring.", "fallback": True, "retry": retry}
+
+
+def _offline_evaluation(answer_text: str, reason: str = "No LLM available") -> Dict:
+    # Ollama unreachable: a final heuristic grade in offline mode, else try again later
+    return _fallback_evaluation(answer_text, reason, retry=not ENABLE_OFFLINE_MODE)
+
+
+def _busy_evaluation(answer_text: str) -> Dict:
+    # the scheduler turned the call away: Ollama is up, so grading again later will work
+    return _fallback_evaluation(answer_text, "LLM is busy", retry=True)
+
+
+EVALUATION_SCHEMA = {
+    "score": Field(int, minimum=0, maximum=100),
+    "feedback": Field(str, required=False, default="")
+}
+
+
+def _parse_evaluation(text: str, answer_text: str) -> Dict:
+    result = parse_object(text, EVALUATION_SCHEMA)
+    if result is None:
+        logger.warning("Unreadable evaluation from LLM: %.200r", text)
+        return _fallback_evaluation(answer_text, "Could not read the LLM evaluation")
+    return result
+
+
+def _improvements_prompt(resume_text: str, job_description: str) -> str:
+    resume_text, job_description = budget_documents(resume_text, job_description)
+    return (
+        f"You are a resume reviewer.\n"
+        f"Provide constructive feedback for improving the resume text below to better match the job description.\n"
+        f"Job Description:\n{job_description}\n"
+        f"Resume:\n{resume_text}\n"
+        f"Return a JSON object with fields 'analysis' (string), 'ats_score' (number 0-100), 'success' (boolean)."
+    )
+
+
+def _improvements_stream_prompt(resume_text: str, job_description: str) -> str:
+    resume_text, job_description = budget_documents(resume_text, job_description)
+    return (
+        f"You are a resume reviewer.\n"
+        f"Provide constructive feedback for improving the resume text below to better match the job description.\n"
+        f"Job Description:\n{job_description}\n"
+        f"Resume:\n{resume_text}\n"
+        f"Answer in concise Markdown: the main gaps first, then concrete rewrites."
+    )
+
+
+IMPROVEMENTS_SCHEMA = {
+    "analysis": Field(str),
+    "ats_score": Field(int, required=False, default=0, minimum=0, maximum=100),
+    "success": Field(bool, required=False, default=True)
+}
+
+
+def _parse_improvements(text: str) -> Optional[Dict]:
+    """The validated improvements object; None if the response holds none."""
+    return parse_object(text, IMPROVEMENTS_SCHEMA)
+
+
+READINESS_CATEGORIES = ["Technical", "Communication", "Leadership", "Problem Solving", "Adaptability", "Teamwork"]
+READINESS_SCHEMA = {
+    **{category: Field(int, minimum=0, maximum=100) for category in READINESS_CATEGORIES},
+    "Overall Readiness": Field(int, required=False, minimum=0, maximum=100),
+    "Summary": Field(str, required=False, default="")
+}
+
+
+def _readiness_prompt(resume_text: str, interview_feedback: str) -> str:
+    scores = ", ".join(f'"{key}"' for key in READINESS_CATEGORIES + ["Overall Readiness"])
+    return (
+        f"You are a career performance analyst.\n"
+        f"Based on the resume and interview evaluation below, score the candidate out of 100 in these areas: "
+        f"{', '.join(READINESS_CATEGORIES)}.\n"
+        f"Resume:\n{fit_text(resume_text, PROMPT_RESUME_TOKENS)}\n"
+        f"Interview Feedback:\n{fit_text(interview_feedback, PROMPT_FEEDBACK_TOKENS)}\n"
+        f"Return a JSON object with integer fields {scores} and a one-line \"Summary\" of recommendations."
+    )
+
 # ------------------------
 # HIGH-LEVEL FUNCTIONS
 # ------------------------
@@ -67,114 +476,186 @@ def generate_interview_questions(
     fallback set of questions based on the type.
     """
     if not check_ollama_status():
-        # simple fallback
-        base = {
-            "technical": [
-                "Explain a challenging bug you fixed.",
-                "Describe your experience with the primary technology in the JD.",
-            ],
-            "hr": [
-                "Tell me about yourself.",
-                "Why do you want this job?",
-            ],
-            "behavioral": [
-                "Describe a time you worked in a team.",
-                "Give an example of handling conflict.",
-            ],
-            "mixed": []
-        }
-        questions = base.get(interview_type, [])
-        # pad to count
-        while len(questions) < count:
-            questions.append(f"(Additional {interview_type} question placeholder)")
-        return questions[:count]
-
-    prompt = (
-        f"You are a helpful interview coach.\n"
-        f"Generate {count} {interview_type} interview questions tailored to the following job description and resume.\n"
-        f"Job Description:\n{job_description}\n"
-        f"Resume Text:\n{resume_text}\n"
-        f"Return the questions as a JSON array without any commentary."
+        return _fallback_questions(interview_type, count)
+    text = _call_ollama(
+        _questions_prompt(job_description, resume_text, interview_type, count), max_tokens=300, json_mode=True
     )
-    text = _call_ollama(prompt, max_tokens=300)
     if not text:
-        return generate_interview_questions(job_description, resume_text, interview_type, count, language)
+        return _fallback_questions(interview_type, count)
+    return _parse_questions(text, count)
+
+
+def generate_skill_questions(
+    skill: str,
+    interview_type: str = "technical",
+    difficulty: str = "Medium",
+    count: int = 5,
+    language: str = "en"
+) -> List[str]:
+    """Generic questions about one skill for the question bank.
+
+    Runs at batch priority and returns [] rather than placeholder questions
+    when the LLM is unavailable, so nothing generic gets stored.
+    """
+    if not check_ollama_status():
+        return []
+    text = _call_ollama(
+        _skill_questions_prompt(skill, interview_type, difficulty, count, language),
+        max_tokens=60 * count, temperature=0.7, priority="batch", json_mode=True
+    )
+    if not text:
+        return []
+    return _parse_questions(text, count)
 
-    try:
-        questions = json.loads(text)
-        if isinstance(questions, list):
-            return questions[:count]
-    except Exception:
-        # split by lines as fallback
-        lines = [l.strip() for l in text.splitlines() if l.strip()]
-        return lines[:count]
 
-    return []
+def generate_rubric(
+    question: str,
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None,
+    priority: str = "interactive"
+) -> Optional[str]:
+    """Grading rubric for a question; a cache hit when it was prefetched."""
+    return _call_ollama(_rubric_prompt(question, interview_type), priority=priority, context=context, **RUBRIC_PARAMS)
+
+
+def cached_rubric(
+    question: str,
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None
+) -> Optional[str]:
+    """The question's rubric if a prefetch already generated it; never calls the model."""
+    return llm_cache.get(_llm_cache_key(_rubric_prompt(question, interview_type), context=context, **RUBRIC_PARAMS))
 
 
 def evaluate_interview_answer(
     question: str,
     answer_text: str,
-    interview_type: str = "technical"
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None
 ) -> Dict:
     """Score the user's answer and provide feedback.
 
-    Returns a dict with keys 'score' (0-100) and 'feedback'.
+    The question's rubric is part of the prompt when a prefetch already
+    cached it; grading never waits for one, so an evaluation costs a single
+    model call.  ``context`` is the session's Ollama context, so the model
+    already knows the JD and resume.  Returns a dict with keys 'score'
+    (0-100) and 'feedback'.  Heuristic scores used when no LLM grade could
+    be obtained also carry 'fallback': True, and 'retry': True when
+    grading again later should succeed (the scheduler was full, or Ollama
+    is offline and ENABLE_OFFLINE_MODE is off); callers store every other
+    result as the answer's grade.
     """
     if not check_ollama_status():
-        # simple heuristic: longer answers score higher
-        score = min(100, len(answer_text.split()) * 2)
-        return {"score": score, "feedback": "No LLM available; using heuristic scoring."}
-
-    prompt = (
-        f"You are an expert interviewer.\n"
-        f"Question: {question}\n"
-        f"Answer: {answer_text}\n"
-        f"Provide a JSON object with 'score' (0-100) and 'feedback' fields."
-    )
-    text = _call_ollama(prompt, max_tokens=200)
+        return _offline_evaluation(answer_text)
+    try:
+        rubric = cached_rubric(question, interview_type, context)
+        text = _call_ollama(
+            _evaluation_prompt(question, answer_text, rubric), max_tokens=200, context=context,
+            json_mode=True, schema=EVALUATION_SCHEMA, raise_overloaded=True
+        )
+    except LLMOverloaded:
+        return _busy_evaluation(answer_text)
     if not text:
-        return {"score": 0, "feedback": "LLM request failed"}
+        # failed request or open breaker: never a grade of 0
+        return _offline_evaluation(answer_text, "LLM request failed")
+    return _parse_evaluation(text, answer_text)
 
-    try:
-        result = json.loads(text)
-        if "score" in result and "feedback" in result:
-            return result
-    except Exception:
-        pass
-    # fallback
-    return {"score": 50, "feedback": text}
+
+def evaluate_interview_answers(
+    answers: List[Dict],
+    interview_type: str = "technical",
+    context: Optional[List[int]] = None
+) -> List[Dict]:
+    """Evaluate several answers concurrently; ``answers`` holds dicts with
+    'question' and 'answer_text' (and optionally 'interview_type').
+
+    Results come back in input order.  Concurrency towards Ollama is still
+    bounded by the scheduler.
+    """
+    if not answers:
+        return []
+
+    def run(item: Dict) -> Dict:
+        return evaluate_interview_answer(
+            item["question"], item["answer_text"], item.get("interview_type") or interview_type, context
+        )
+
+    with ThreadPoolExecutor(max_workers=min(len(answers), llm_scheduler.max_concurrency)) as pool:
+        return list(pool.map(run, answers))
 
 
 def generate_resume_improvements(resume_text: str, job_description: str) -> Dict:
     """Produce advice for improving the resume.
 
     On failure the function returns a simple ATS score calculation.
+    LLM results are cached per (model, resume, JD) content hash.
     """
+    key = content_key(MODEL_NAME, resume_text, job_description)
+    cached_result = improvement_cache.get(key)
+    if cached_result is not None:
+        return dict(cached_result)
+
     if not check_ollama_status():
-        from nlp_utils import extract_ats_keywords
-        analysis = extract_ats_keywords(resume_text, job_description)
-        return {
-            "ats_score": analysis.get("ats_score"),
-            "analysis": "Add more keywords from the job description and quantify achievements.",
-            "success": True,
-        }
-
-    prompt = (
-        f"You are a resume reviewer.\n"
-        f"Provide constructive feedback for improving the resume text below to better match the job description.\n"
-        f"Job Description:\n{job_description}\n"
-        f"Resume:\n{resume_text}\n"
-        f"Return a JSON object with fields 'analysis' (string), 'ats_score' (number 0-100), 'success' (boolean)."
+        return _fallback_improvements(resume_text, job_description)
+    text = _call_ollama(
+        _improvements_prompt(resume_text, job_description), max_tokens=300, priority="batch",
+        json_mode=True, schema=IMPROVEMENTS_SCHEMA
     )
-    text = _call_ollama(prompt, max_tokens=300)
     if not text:
-        return generate_resume_improvements(resume_text, job_description)
-    try:
-        data = json.loads(text)
-        return data
-    except Exception:
+        return _fallback_improvements(resume_text, job_description)
+    data = _parse_improvements(text)
+    if data is None:
         return {"analysis": text, "ats_score": 0, "success": False}
+    improvement_cache.set(key, dict(data))
+    return data
+
+
+def analyze_career_readiness(resume_text: str, interview_feedback: str) -> Optional[Dict]:
+    """Score a candidate per READINESS_CATEGORIES from their resume and interview feedback.
+
+    Returns {'scores': [...] in category order, 'overall': int, 'summary': str},
+    or None if the LLM is unavailable or its answer cannot be read.
+    """
+    if not check_ollama_status():
+        return None
+    text = _call_ollama(
+        _readiness_prompt(resume_text, interview_feedback), max_tokens=250, json_mode=True, schema=READINESS_SCHEMA
+    )
+    result = parse_object(text, READINESS_SCHEMA)
+    if result is None:
+        return None
+    scores = [result[category] for category in READINESS_CATEGORIES]
+    overall = result["Overall Readiness"]
+    return {
+        "scores": scores,
+        "overall": overall if overall is not None else sum(scores) // len(scores),
+        "summary": result["Summary"]
+    }
+
+
+# ------------------------
+# STREAMING
+# ------------------------
+
+def stream_resume_improvements(resume_text: str, job_description: str) -> Iterator[str]:
+    """Resume feedback as Markdown chunks, yielded as the model writes them."""
+    cached_result = improvement_cache.get(content_key(MODEL_NAME, resume_text, job_description))
+    if cached_result is not None:
+        yield cached_result.get("analysis") or ""
+        return
+    produced = False
+    if check_ollama_status():
+        for chunk in _stream_ollama(_improvements_stream_prompt(resume_text, job_description), priority="batch"):
+            produced = True
+            yield chunk
+    if not produced:
+        yield _fallback_improvements(resume_text, job_description)["analysis"]
+
+
+def stream_chat(prompt: str, max_tokens: int = 500) -> Iterator[str]:
+    """Free-form completion chunks (chatbot); nothing if the LLM is unavailable."""
+    if check_ollama_status():
+        yield from _stream_ollama(prompt, max_tokens=max_tokens, temperature=0.7)
 
 
 def get_interview_prep_tips() -> List[str]:
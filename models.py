@@ -1,15 +1,17 @@
 """
 SQLAlchemy models for InnoCareer AI app.  Reconstructed after accidental deletion.
 Includes user, resume, job description, interview/session/answer, skill gaps,
-learning progress, plus helper functions for database initialization.
+learning progress, background jobs, the interview question bank, plus
+helper functions for database initialization.
 """
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+    Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float,
+    LargeBinary, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from datetime import datetime
 
 Base = declarative_base()
@@ -30,6 +32,25 @@ def get_db():
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """Add columns introduced after a table was first created.
+
+    create_all() only creates missing tables, so existing SQLite files would
+    otherwise lack newer nullable columns.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    col_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
 
 
 # ------------------------------------------
@@ -62,6 +83,13 @@ class Resume(Base):
     file_path = Column(String)
     extracted_text = Column(Text)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    # skill profile computed at upload (see resume_index.py): sorted int32
+    # skill ids, per-skill occurrence counts, (start, end) character offsets
+    # grouped by skill, and the taxonomy version they came from
+    skill_ids = Column(LargeBinary, nullable=True)
+    skill_counts = Column(LargeBinary, nullable=True)
+    skill_positions = Column(LargeBinary, nullable=True)
+    skill_version = Column(String, nullable=True)
 
     user = relationship("User", back_populates="resumes")
 
@@ -85,6 +113,8 @@ class InterviewSession(Base):
     started_at = Column(DateTime, default=datetime.utcnow)
     completed = Column(Boolean, default=False)
     overall_score = Column(Float, default=0.0)
+    llm_context = Column(LargeBinary)  # Ollama context tokens after reading the JD and resume (int32)
+    llm_context_model = Column(String)  # model that produced llm_context
 
     user = relationship("User", back_populates="sessions")
     questions = relationship("InterviewQuestion", back_populates="session")
@@ -113,6 +143,7 @@ class InterviewAnswer(Base):
     emotion = Column(Text)
     confidence_level = Column(Float)
     face_verified = Column(Boolean, default=False)
+    status = Column(String, default="done")  # pending -> done | failed; NULL on old rows means done
 
     question = relationship("InterviewQuestion", back_populates="answers")
 
@@ -136,3 +167,35 @@ class LearningProgress(Base):
     updated_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="learn_progress")
+
+class Job(Base):
+    """Background work item (see job_queue)."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True)
+    payload = Column(Text)  # JSON
+    status = Column(String, default="queued", index=True)  # queued, running, done, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    available_at = Column(DateTime, default=datetime.utcnow)  # not claimed before this (retry backoff)
+    locked_at = Column(DateTime)  # when a worker claimed it
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+class BankQuestion(Base):
+    """Pre-generated interview question for one skill (see question_bank)."""
+    __tablename__ = "question_bank"
+    __table_args__ = (
+        Index("ix_question_bank_lookup", "interview_type", "language", "skill", "difficulty"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    skill = Column(String)
+    interview_type = Column(String)
+    difficulty = Column(String, default="Medium")
+    language = Column(String, default="en")
+    question_text = Column(Text)
+    text_hash = Column(String, unique=True, index=True)  # normalised text, for deduplication
+    times_served = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
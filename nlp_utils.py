@@ -6,21 +6,37 @@ basic keyword matching but can be extended later with spaCy patterns,
 word embeddings, or a proper NER model.
 """
 
-from typing import List, Dict
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import List, Dict, Optional, Tuple
 
-# Predefined skill lists (can be expanded or loaded from file)
-TECHNICAL_SKILLS = {
-    "Python", "Java", "C++", "SQL", "JavaScript", "React", "Django",
-    "Flask", "AWS", "Docker", "Kubernetes", "Linux", "Node.js",
-    "HTML", "CSS", "Git", "TensorFlow", "PyTorch", "spaCy", "Pandas",
-    "NumPy", "Pandas", "Machine Learning", "Data Science"
-}
+import numpy as np
 
-SOFT_SKILLS = {
-    "communication", "teamwork", "leadership", "problem solving",
-    "adaptability", "creativity", "critical thinking", "time management",
-    "work ethic", "collaboration", "conflict resolution", "empathy"
-}
+from ats_scoring import create_engine
+from cache_utils import TTLCache, cached, content_key
+from embedding_utils import embeddings_available, semantic_scores
+from skill_index import SkillBag, load_skill_index, tokenize
+
+# Skill taxonomy (data/skill_taxonomy.json), compiled once and memory-mapped.
+# TAXONOMY_VERSION changes whenever the taxonomy does, so anything derived
+# from skill matches can be invalidated with it.
+SKILL_INDEX = load_skill_index()
+TAXONOMY_VERSION = SKILL_INDEX.version
+
+SOFT_SKILLS = {n for n, c in zip(SKILL_INDEX.names, SKILL_INDEX.categories) if c == "soft"}
+TECHNICAL_SKILLS = set(SKILL_INDEX.names) - SOFT_SKILLS
+
+# scoring formula from config.ATS_SCORE_FORMULA (see ats_scoring.py)
+SCORING_ENGINE = create_engine(SKILL_INDEX.weights)
+
+# identical (resume, JD) pairs are common: Streamlit reruns, repeated clicks
+ats_cache = TTLCache("ats")
+
+# per-resume incremental analyzers, so edits to a JD only re-extract the
+# paragraphs that changed (see IncrementalATSAnalyzer)
+analyzer_cache = TTLCache("ats_analyzers", max_entries=256)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
 
 
 # -------------------------
@@ -28,43 +44,252 @@ SOFT_SKILLS = {
 # -------------------------
 
 def extract_skills_from_text(text: str) -> List[str]:
-    """Return a list of skills found in the provided text."""
+    """Return a list of canonical skill names found in the provided text.
+
+    Skills are matched on whole tokens, so "Java" is not reported for a
+    resume that only mentions "JavaScript".  Aliases from the taxonomy
+    ("JS", "k8s", "Postgres", ...) are reported under their canonical name.
+    """
     if not text:
         return []
-    found = set()
-    lower = text.lower()
+    return sorted(SKILL_INDEX.extract(text))
+
+
+def normalize_skill(name: str) -> str:
+    """Map a skill name or alias to its canonical taxonomy name.
+
+    Unknown names are returned unchanged (stripped).
+    """
+    return SKILL_INDEX.canonical(name) or name.strip()
 
-    for skill in TECHNICAL_SKILLS.union(SOFT_SKILLS):
-        if skill.lower() in lower:
-            found.add(skill)
-    return sorted(found)
 
+def scoring_version() -> str:
+    """Everything a cached score depends on: taxonomy, engine and corpus statistics."""
+    return f"{TAXONOMY_VERSION}/{SCORING_ENGINE.name}/{SCORING_ENGINE.corpus_version}"
 
-def extract_ats_keywords(resume_text: str, job_description: str) -> Dict:
+
+@cached(ats_cache, version=scoring_version)
+def extract_ats_keywords(
+    resume_text: str,
+    job_description: str,
+    resume_bag: Optional[SkillBag] = None
+) -> Dict:
     """Compare resume text to job description to compute a simple ATS-like score.
 
     The function identifies skills present in the job description and then
     checks which of those appear in the resume. It returns matching and
     missing skills separated into "technical" and "soft" categories along
-    with a very basic percentage score.
+    with a percentage score computed by the configured scoring engine.  Both
+    lists use canonical skill names, so a JD asking for "k8s" matches a
+    resume listing "Kubernetes".
+
+    ``resume_bag`` (skill ids and counts, e.g. a stored resume profile)
+    skips re-extracting skills from ``resume_text``.  Analyses of the same
+    resume share an IncrementalATSAnalyzer, so re-analysing an edited JD
+    only re-extracts the changed paragraphs.
     """
-    resume_skills = set(extract_skills_from_text(resume_text))
-    jd_skills = set(extract_skills_from_text(job_description))
+    return get_incremental_analyzer(resume_text, resume_bag).analyze(job_description)
+
 
+def _ats_result(jd_ids: np.ndarray, hits: np.ndarray, score: int) -> Dict:
+    """Split one JD's skills into matching/missing by category."""
     matching = {"technical": [], "soft": []}
     missing = {"technical": [], "soft": []}
+    for skill_id, hit in zip(jd_ids.tolist(), hits.tolist()):
+        target = "soft" if SKILL_INDEX.categories[skill_id] == "soft" else "technical"
+        (matching if hit else missing)[target].append(SKILL_INDEX.names[skill_id])
+    return {"ats_score": score, "matching": matching, "missing": missing}
+
+
+def score_resume_against_jds(
+    resume_text: str,
+    job_descriptions: List[str],
+    resume_bag: Optional[SkillBag] = None
+) -> List[Dict]:
+    """Score one resume against many job descriptions.
+
+    The resume is matched once (or not at all when ``resume_bag`` is
+    given); all JDs are then scored by the configured engine in one
+    vectorized pass.  Results are returned in input order, each shaped like
+    ``extract_ats_keywords`` output.
+    """
+    if resume_bag is None:
+        resume_bag = SKILL_INDEX.extract_bag(resume_text or "")
+    resume_mask = np.zeros(len(SKILL_INDEX), dtype=bool)
+    resume_mask[resume_bag.ids] = True
+
+    jd_bags = [SKILL_INDEX.extract_bag(jd or "") for jd in job_descriptions]
+    if not jd_bags:
+        return []
+    lengths = np.array([len(bag.ids) for bag in jd_bags])
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    flat_ids = np.concatenate([bag.ids for bag in jd_bags])
+    flat_counts = np.concatenate([bag.counts for bag in jd_bags])
+    if SCORING_ENGINE.semantic and resume_text and embeddings_available():
+        scores = semantic_scores(resume_text, job_descriptions)
+    else:
+        scores = SCORING_ENGINE.score_jds(resume_bag.ids, resume_bag.counts, indptr, flat_ids, flat_counts)
+    hits = resume_mask[flat_ids]
+
+    return [
+        _ats_result(bag.ids, hits[indptr[i]:indptr[i + 1]], int(scores[i]))
+        for i, bag in enumerate(jd_bags)
+    ]
 
-    for skill in jd_skills:
-        target = "technical" if skill in TECHNICAL_SKILLS else "soft"
-        if skill in resume_skills:
-            matching[target].append(skill)
+
+def rank_job_descriptions(
+    resume_text: str,
+    job_descriptions: List[str],
+    resume_bag: Optional[SkillBag] = None
+) -> List[Dict]:
+    """Like ``score_resume_against_jds`` but ordered best match first.
+
+    Each result carries ``index`` (position in the input list) and ``rank``.
+    """
+    results = score_resume_against_jds(resume_text, job_descriptions, resume_bag)
+    for i, result in enumerate(results):
+        result["index"] = i
+    results.sort(key=lambda r: r["ats_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return results
+
+
+# -------------------------
+# INCREMENTAL ANALYSIS
+# -------------------------
+
+class IncrementalATSAnalyzer:
+    """ATS analysis of one resume against successive versions of a JD.
+
+    Skill counts are kept per JD paragraph (text between blank lines).  On
+    each call only paragraphs not seen before are matched; the JD's
+    aggregate skill counts are updated by subtracting removed paragraphs
+    and adding new ones, and the score is recomputed from those counts.
+    Re-analysing an edited JD therefore costs about as much as the edit,
+    not the whole document.
+
+    A multi-word skill can span a paragraph break ("Machine" / "Learning"),
+    and such a match changes how the rest of the next paragraph is parsed.
+    So each paragraph is matched together with a lookahead of the next
+    ``max_phrase_len - 1`` tokens, starting after the tokens a match from
+    the previous paragraph already covers; only matches starting inside
+    the paragraph count.  Leftmost-longest matching never looks further
+    ahead than that, so the counts equal those of matching the whole JD at
+    once.  Results are cached per (paragraph, skipped tokens, lookahead):
+    an edit re-matches the edited paragraph and the one before it.
+    """
+
+    def __init__(self, resume_text: str = "", resume_bag: Optional[SkillBag] = None, max_paragraphs: int = 2048):
+        self.resume_text = resume_text or ""
+        self.resume_bag = resume_bag if resume_bag is not None else SKILL_INDEX.extract_bag(self.resume_text)
+        self.max_paragraphs = max_paragraphs
+        self.last_reextracted = 0
+        self._history: "OrderedDict[object, tuple]" = OrderedDict()
+        self._current: Counter = Counter()
+        self._jd_counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _remember(self, key, entry: tuple, matched: bool = True) -> tuple:
+        self.last_reextracted += matched
+        self._history[key] = entry
+        while len(self._history) > self.max_paragraphs:
+            self._history.popitem(last=False)
+        return entry
+
+    def _tokens(self, paragraph: str) -> tuple:
+        """(token start offsets, token end offsets) of a paragraph."""
+        entry = self._history.get(paragraph)
+        if entry is not None:
+            self._history.move_to_end(paragraph)
+            return entry
+        tokens = tokenize(paragraph)
+        return self._remember(paragraph, (tuple(t[1] for t in tokens), tuple(t[2] for t in tokens)), matched=False)
+
+    def _piece(self, piece: Tuple[str, int, str]) -> tuple:
+        """(skill counts, lookahead tokens covered) of a paragraph matched from token ``skip`` on."""
+        entry = self._history.get(piece)
+        if entry is not None:
+            self._history.move_to_end(piece)
+            return entry
+        paragraph, skip, lookahead = piece
+        text = paragraph[self._tokens(paragraph)[0][skip]:]
+        counts: Counter = Counter()
+        covered = 0
+        for m in SKILL_INDEX.find(f"{text} {lookahead}" if lookahead else text):
+            if m.start >= len(text):
+                break
+            counts[m.skill_id] += 1
+            if m.end > len(text):
+                covered = sum(1 for _, _, end in tokenize(lookahead) if end <= m.end - len(text) - 1)
+        return self._remember(piece, (dict(counts), covered))
+
+    def _pieces(self, paragraphs: List[str]) -> Counter:
+        """The (paragraph, skip, lookahead) pieces of a JD, matched in order."""
+        edge = SKILL_INDEX.max_phrase_len - 1
+        pieces: Counter = Counter()
+        skip = 0
+        for i, paragraph in enumerate(paragraphs):
+            n_tokens = len(self._tokens(paragraph)[0])
+            if skip >= n_tokens:
+                # covered entirely by a match starting in an earlier paragraph
+                skip -= n_tokens
+                continue
+            lookahead = []
+            for following in paragraphs[i + 1:]:
+                if len(lookahead) >= edge:
+                    break
+                starts, ends = self._tokens(following)
+                take = min(edge - len(lookahead), len(starts))
+                if take:
+                    lookahead.append(following[:ends[take - 1]])
+            piece = (paragraph, skip, " ".join(lookahead))
+            pieces[piece] += 1
+            skip = self._piece(piece)[1]
+        return pieces
+
+    def _apply(self, pieces: Counter, sign: int):
+        for piece, times in pieces.items():
+            counts = self._piece(piece)[0]
+            for skill_id, count in counts.items():
+                self._jd_counts[skill_id] += sign * times * count
+                if not self._jd_counts[skill_id]:
+                    del self._jd_counts[skill_id]
+
+    def analyze(self, job_description: str) -> Dict:
+        """Return the ``extract_ats_keywords`` result for this JD version."""
+        with self._lock:
+            self.last_reextracted = 0
+            paragraphs = [p.strip() for p in _PARAGRAPH_BREAK.split(job_description or "") if p.strip()]
+            pieces = self._pieces(paragraphs)
+            # removed pieces were seen last time, so their counts are usually still in history
+            self._apply(self._current - pieces, -1)
+            self._apply(pieces - self._current, +1)
+            self._current = pieces
+
+            jd_ids = np.array(sorted(k for k, v in self._jd_counts.items() if v > 0), dtype=np.int32)
+            jd_counts = np.array([self._jd_counts[i] for i in jd_ids.tolist()], dtype=np.int32)
+
+        resume_mask = np.zeros(len(SKILL_INDEX), dtype=bool)
+        resume_mask[self.resume_bag.ids] = True
+        if SCORING_ENGINE.semantic and self.resume_text and embeddings_available():
+            score = semantic_scores(self.resume_text, [job_description])[0]
         else:
-            missing[target].append(skill)
+            score = SCORING_ENGINE.score_jds(
+                self.resume_bag.ids, self.resume_bag.counts,
+                np.array([0, len(jd_ids)]), jd_ids, jd_counts
+            )[0]
+        return _ats_result(jd_ids, resume_mask[jd_ids], int(score))
 
-    total_jd = len(jd_skills) or 1
-    score = int(100 * (len(matching["technical"]) + len(matching["soft"])) / total_jd)
 
-    return {"ats_score": score, "matching": matching, "missing": missing}
+def get_incremental_analyzer(resume_text: str, resume_bag: Optional[SkillBag] = None) -> IncrementalATSAnalyzer:
+    """Shared analyzer for a resume (keyed by its text or stored skill bag)."""
+    key = content_key(TAXONOMY_VERSION, resume_text or "", resume_bag)
+    analyzer = analyzer_cache.get(key)
+    if analyzer is None:
+        analyzer = IncrementalATSAnalyzer(resume_text, resume_bag)
+        analyzer_cache.set(key, analyzer)
+    return analyzer
 
 
 def get_skill_recommendations(missing_skills: List[str], language: str = "en") -> List[str]:
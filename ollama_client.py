@@ -0,0 +1,421 @@
+"""
+Shared HTTP client for the local Ollama server.
+
+Every Ollama call (generation, embeddings, health checks, the Streamlit
+chatbot) goes through one ``requests.Session`` with a keep-alive connection
+pool, so repeated calls reuse TCP connections instead of opening a new one
+each time.  Pool size and timeouts come from config.
+
+Server availability is tracked by OllamaHealthMonitor: a daemon thread
+probes the server periodically and callers read the cached state instead of
+making a blocking request before every LLM call.  Real calls report their
+outcome too, so a dead server is noticed on the first failed request.
+
+CircuitBreaker stops calling a failing server altogether: after a run of
+consecutive failures it opens and every call fails fast until a cool-down
+has passed, then a single trial call decides whether it closes again.
+
+PriorityScheduler is the admission control in front of the server: calls
+take a slot of their priority class (interactive interview/chat turns
+before batch reviews), wait in a bounded per-class queue when none is free,
+and are dropped once their deadline passes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    OLLAMA_BASE_URL, OLLAMA_POOL_SIZE,
+    OLLAMA_CONNECT_TIMEOUT, OLLAMA_READ_TIMEOUT, OLLAMA_HEALTH_TIMEOUT,
+    OLLAMA_HEALTH_INTERVAL, OLLAMA_HEALTH_TTL,
+    LLM_BREAKER_FAILURES, LLM_BREAKER_RESET,
+    LLM_MAX_CONCURRENCY, LLM_PRIORITY_CLASSES, LLM_CLASS_CONCURRENCY,
+    LLM_QUEUE_LIMITS, LLM_QUEUE_DEADLINES
+)
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class OllamaClient:
+    """Thread-safe pooled client; ``path`` arguments are relative to the base URL."""
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_BASE_URL,
+        pool_size: int = OLLAMA_POOL_SIZE,
+        connect_timeout: float = OLLAMA_CONNECT_TIMEOUT,
+        read_timeout: float = OLLAMA_READ_TIMEOUT
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=False)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def url(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _timeout(self, timeout: Optional[Timeout]) -> Tuple[float, float]:
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (min(self.connect_timeout, timeout), timeout)
+
+    def get(self, path: str = "", timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        return self.session.get(self.url(path), timeout=self._timeout(timeout), **kwargs)
+
+    def post(self, path: str, json: Dict, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        return self.session.post(self.url(path), json=json, timeout=self._timeout(timeout), **kwargs)
+
+    def is_up(self, timeout: float = OLLAMA_HEALTH_TIMEOUT) -> bool:
+        """True if the server answers on its base URL ("Ollama is running")."""
+        try:
+            return self.get("", timeout=timeout).ok
+        except requests.RequestException:
+            return False
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+ollama_client = OllamaClient()
+
+
+# ------------------------
+# HEALTH MONITOR
+# ------------------------
+
+class OllamaHealthMonitor:
+    """Background-refreshed, TTL-cached view of whether Ollama is up."""
+
+    def __init__(
+        self,
+        client: OllamaClient,
+        interval: float = OLLAMA_HEALTH_INTERVAL,
+        ttl: float = OLLAMA_HEALTH_TTL
+    ):
+        self.client = client
+        self.interval = interval
+        self.ttl = ttl
+        self._up = False
+        self._checked_at = 0.0  # monotonic time of the last probe/report, 0 = never
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._probe_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the probe thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+
+    def probe(self) -> bool:
+        """Check the server now and cache the result."""
+        with self._probe_lock:
+            up = self.client.is_up()
+            if up != self._up and self._checked_at:
+                logger.info("Ollama is %s", "up" if up else "down")
+            self._up, self._checked_at = up, time.monotonic()
+            return up
+
+    def report(self, ok: bool):
+        """Record the outcome of a real request (cheaper than waiting for a probe)."""
+        if ok != self._up:
+            logger.info("Ollama is %s", "up" if ok else "down")
+        self._up, self._checked_at = ok, time.monotonic()
+
+    def is_up(self, probe: bool = True) -> bool:
+        """Cached availability; only probes inline if nothing fresh is known.
+
+        With ``probe=False`` it never blocks: the last known state is
+        returned and the background thread refreshes it (for callers on an
+        event loop).
+        """
+        self.start()
+        if probe and (not self._checked_at or time.monotonic() - self._checked_at > self.ttl):
+            return self.probe()
+        return self._up
+
+    def status(self) -> Dict:
+        age = time.monotonic() - self._checked_at if self._checked_at else None
+        return {"up": self._up, "checked_seconds_ago": round(age, 1) if age is not None else None}
+
+
+ollama_health = OllamaHealthMonitor(ollama_client)
+
+
+# ------------------------
+# CIRCUIT BREAKER
+# ------------------------
+
+class CircuitBreaker:
+    """closed -> (failure_threshold failures) -> open -> (reset_timeout) -> half_open.
+
+    In half_open one trial call is let through; its success closes the
+    breaker, its failure re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = LLM_BREAKER_FAILURES, reset_timeout: float = LLM_BREAKER_RESET):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self.metrics = {"calls": 0, "successes": 0, "failures": 0, "rejected": 0, "opened": 0, "retries": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; counts rejections."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._trial_running):
+                self._trial_running = self.state == self.HALF_OPEN
+                self.metrics["calls"] += 1
+                return True
+            self.metrics["rejected"] += 1
+            return False
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (does not change state)."""
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.metrics["successes"] += 1
+            self.consecutive_failures = 0
+            self._trial_running = False
+            if self.state != self.CLOSED:
+                logger.info("Circuit %s closed", self.name)
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.metrics["failures"] += 1
+            self.consecutive_failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.metrics["opened"] += 1
+                logger.warning("Circuit %s opened after %d failures", self.name, self.consecutive_failures)
+
+    def record_retry(self):
+        with self._lock:
+            self.metrics["retries"] += 1
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            **self.metrics
+        }
+
+
+llm_breaker = CircuitBreaker("ollama")
+
+
+# ------------------------
+# SCHEDULER
+# ------------------------
+
+class LLMOverloaded(Exception):
+    """A call was rejected by the scheduler (queue full or deadline passed)."""
+
+
+class _Waiter:
+    __slots__ = ("priority", "deadline", "granted", "wake")
+
+    def __init__(self, priority: str, deadline: float, wake):
+        self.priority = priority
+        self.deadline = deadline
+        self.granted = False
+        self.wake = wake  # called (under the scheduler lock) when granted or expired
+
+
+class PriorityScheduler:
+    """Priority classes with per-class concurrency caps over a shared limit.
+
+    A freed slot goes to the oldest waiter of the highest-priority class
+    that is below its own cap.  Sync callers wait on a threading.Event,
+    async callers on a future of their event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        classes: List[str] = LLM_PRIORITY_CLASSES,
+        class_limits: Dict[str, int] = LLM_CLASS_CONCURRENCY,
+        queue_limits: Dict[str, int] = LLM_QUEUE_LIMITS,
+        deadlines: Dict[str, float] = LLM_QUEUE_DEADLINES
+    ):
+        self.max_concurrency = max_concurrency
+        self.classes = list(classes)
+        self.class_limits = dict(class_limits)
+        self.queue_limits = dict(queue_limits)
+        self.deadlines = dict(deadlines)
+        self.running: Counter = Counter()
+        self._queues: Dict[str, Deque[_Waiter]] = {c: deque() for c in self.classes}
+        self._lock = threading.Lock()
+        self.metrics = {c: Counter() for c in self.classes}
+
+    def _check(self, priority: str):
+        if priority not in self._queues:
+            raise ValueError(f"Unknown LLM priority class {priority!r}")
+
+    def _free(self, priority: str) -> bool:
+        return (sum(self.running.values()) < self.max_concurrency
+                and self.running[priority] < self.class_limits.get(priority, self.max_concurrency))
+
+    def _enter(self, priority: str, deadline: Optional[float], wake) -> Optional[_Waiter]:
+        """Queue a waiter and dispatch; None if it got a slot at once.  Raises if the queue is full."""
+        self._check(priority)
+        deadline = time.monotonic() + (self.deadlines.get(priority, 60) if deadline is None else deadline)
+        with self._lock:
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_limits.get(priority, 0):
+                self.metrics[priority]["rejected"] += 1
+                raise LLMOverloaded(f"LLM queue for {priority} requests is full")
+            waiter = _Waiter(priority, deadline, wake)
+            queue.append(waiter)
+            self._dispatch()
+            return None if waiter.granted else waiter
+
+    def _dispatch(self):
+        """Hand free slots to waiters, best class first; drop expired ones (lock held)."""
+        now = time.monotonic()
+        for priority in self.classes:
+            queue = self._queues[priority]
+            while queue and (queue[0].deadline <= now or self._free(priority)):
+                waiter = queue.popleft()
+                if waiter.deadline > now:
+                    waiter.granted = True
+                    self.running[priority] += 1
+                    self.metrics[priority]["admitted"] += 1
+                else:
+                    self.metrics[priority]["expired"] += 1
+                waiter.wake()
+
+    def _leave(self, priority: str):
+        with self._lock:
+            self.running[priority] -= 1
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter, reason: str = "expired") -> bool:
+        """Stop waiting; True if the slot was granted in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            if waiter in self._queues[waiter.priority]:
+                self._queues[waiter.priority].remove(waiter)
+                self.metrics[waiter.priority][reason] += 1
+            return False
+
+    @contextmanager
+    def slot(self, priority: str, deadline: Optional[float] = None):
+        """Hold one LLM slot; ``deadline`` is the max seconds to wait for it."""
+        event = threading.Event()
+        waiter = self._enter(priority, deadline, event.set)
+        if waiter is not None:
+            event.wait(max(0.0, waiter.deadline - time.monotonic()))
+            if not self._abandon(waiter):
+                raise LLMOverloaded(f"No LLM slot for {priority} request before its deadline")
+        try:
+            yield
+        finally:
+            self._leave(priority)
+
+    @asynccontextmanager
+    async def aslot(self, priority: str, deadline: Optional[float] = None):
+        """Async ``slot``."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enter(priority, deadline, wake)
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), max(0.0, waiter.deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                if self._abandon(waiter, "cancelled"):
+                    self._leave(priority)
+                raise
+            if not self._abandon(waiter):
+                raise LLMOverloaded(f"No LLM slot for {priority} request before its deadline")
+        try:
+            yield
+        finally:
+            self._leave(priority)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "classes": {
+                    c: {
+                        "running": self.running[c],
+                        "queued": len(self._queues[c]),
+                        "limit": self.class_limits.get(c),
+                        "queue_limit": self.queue_limits.get(c),
+                        **self.metrics[c]
+                    }
+                    for c in self.classes
+                }
+            }
+
+
+llm_scheduler = PriorityScheduler()
@@ -0,0 +1,103 @@
+"""
+Speculative work for live interview sessions.
+
+While a candidate answers question N, the backend can already prepare what
+the next turn needs: grading rubrics for the current and next question and
+a follow-up question probing the previous answer.  Each piece runs as an
+asyncio task owned by its session; results land in the LLM response cache,
+so the evaluation that needs a rubric finds it without another model call.
+Work that becomes irrelevant (the candidate moved on, the session ended) is
+cancelled, which also releases its scheduler slot and HTTP request.
+"""
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# sessions whose speculative tasks are tracked at once; the oldest is dropped
+MAX_PREFETCH_SESSIONS = 256
+
+
+def _failed(task: asyncio.Task) -> bool:
+    """True if a finished task left nothing usable behind."""
+    if not task.done():
+        return False
+    return task.cancelled() or task.exception() is not None or task.result() is None
+
+
+class SessionPrefetcher:
+    """Per-session named speculative tasks on the running event loop."""
+
+    def __init__(self, max_sessions: int = MAX_PREFETCH_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[int, Dict[str, asyncio.Task]]" = OrderedDict()
+        self.metrics: Counter = Counter()
+
+    def schedule(self, session_id: int, key: str, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """Start ``factory()`` for ``key`` unless it is running or already produced a result.
+
+        A task that was cancelled, raised or returned None is started again.
+        """
+        tasks = self._sessions.get(session_id)
+        if tasks is None:
+            tasks = self._sessions[session_id] = {}
+            while len(self._sessions) > self.max_sessions:
+                _, old = self._sessions.popitem(last=False)
+                self._cancel(old.values())
+        self._sessions.move_to_end(session_id)
+        task = tasks.get(key)
+        if task is not None and not _failed(task):
+            return False
+        tasks[key] = asyncio.ensure_future(factory())
+        tasks[key].add_done_callback(self._log_failure)
+        self.metrics["scheduled"] += 1
+        return True
+
+    def keep_only(self, session_id: int, keys: Iterable[str]):
+        """Cancel the session's unfinished tasks that are not in ``keys``."""
+        keep = set(keys)
+        tasks = self._sessions.get(session_id, {})
+        self._cancel(task for key, task in tasks.items() if key not in keep)
+        for key in [k for k, t in tasks.items() if k not in keep and t.done()]:
+            del tasks[key]
+
+    def cancel_session(self, session_id: int):
+        self._cancel(self._sessions.pop(session_id, {}).values())
+
+    async def result(self, session_id: int, key: str, timeout: float = 0.0) -> Optional[Any]:
+        """The task's result, waiting at most ``timeout`` seconds; None if not ready."""
+        task = self._sessions.get(session_id, {}).get(key)
+        if task is None or task.cancelled():
+            self.metrics["misses"] += 1
+            return None
+        if not task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except (asyncio.TimeoutError, Exception):
+                pass
+        if task.done() and not task.cancelled() and task.exception() is None:
+            self.metrics["hits"] += 1
+            return task.result()
+        self.metrics["misses"] += 1
+        return None
+
+    def _cancel(self, tasks: Iterable[asyncio.Task]):
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                self.metrics["cancelled"] += 1
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Speculative task failed: %s", task.exception())
+
+    def stats(self) -> Dict:
+        running = sum(not t.done() for tasks in self._sessions.values() for t in tasks.values())
+        return {"sessions": len(self._sessions), "running": running, **self.metrics}
+
+
+interview_prefetcher = SessionPrefetcher()
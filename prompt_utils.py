@@ -0,0 +1,120 @@
+"""
+Token-budgeted resume and job description sections for LLM prompts.
+
+Prompt size drives generation latency, so documents are not pasted in raw.
+Each section gets a token budget (estimated as characters /
+PROMPT_CHARS_PER_TOKEN; no tokenizer is needed for a bound this coarse).
+A document that fits is used as is.  A longer one is split into sentences
+and bullet lines, boilerplate without skills (contact details, links, EEO
+and legal text) is dropped, and the remaining sentences are ranked by the
+skills the matcher finds in them - skills the other document also
+mentions count most.  The best sentences that fit the budget are kept in
+their original order.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    MAX_CHARS_TO_EXTRACT, PROMPT_CHARS_PER_TOKEN, PROMPT_RESUME_TOKENS, PROMPT_JD_TOKENS
+)
+from cache_utils import TTLCache, cached
+from nlp_utils import SKILL_INDEX, TAXONOMY_VERSION
+
+# sentences and bullet lines; very long runs (PDF text without punctuation)
+# are cut into windows of about this many characters
+_BOUNDARY = re.compile(r"\n+|(?<=[.!?])\s+")
+MAX_SENTENCE_CHARS = 300
+
+BOILERPLATE = re.compile(
+    r"\S+@\S+\.\w+|https?://|www\.|linkedin\.com|equal (?:opportunity|employment)|"
+    r"regardless of (?:race|gender|age)|reasonable accommodation|references (?:are )?available|"
+    r"curriculum vitae|page \d+ of \d+|all rights reserved|privacy policy|apply now|click here",
+    re.IGNORECASE
+)
+
+# the same (resume, JD) pair is budgeted for every prompt of a session
+prompt_cache = TTLCache("prompt_sections", max_entries=256)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or "") // PROMPT_CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the sentences and bullet lines in text."""
+    spans = []
+    bounds = [0] + [i for m in _BOUNDARY.finditer(text) for i in m.span()] + [len(text)]
+    for start, end in zip(bounds[::2], bounds[1::2]):
+        while start < end and text[start] in " \t-*•·|":
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        while end - start > MAX_SENTENCE_CHARS:
+            cut = text.rfind(" ", start, start + MAX_SENTENCE_CHARS)
+            cut = cut if cut > start else start + MAX_SENTENCE_CHARS
+            spans.append((start, cut))
+            start = cut + 1
+        if end > start:
+            spans.append((start, end))
+    return spans
+
+
+def fit_text(text: str, max_tokens: int, focus_ids: Optional[np.ndarray] = None) -> str:
+    """Shorten ``text`` to about ``max_tokens``, keeping its most skill-relevant sentences.
+
+    ``focus_ids`` are skill ids that matter most (e.g. the JD's skills when
+    fitting a resume).  Never longer than MAX_CHARS_TO_EXTRACT characters.
+    """
+    text = (text or "").strip()
+    max_chars = min(max_tokens * PROMPT_CHARS_PER_TOKEN, MAX_CHARS_TO_EXTRACT)
+    if len(text) <= max_chars:
+        return text
+    spans = split_sentences(text)
+    if not spans:
+        return text[:max_chars]
+
+    # skill matches per sentence, from one pass of the matcher over the whole text
+    starts = np.array([s for s, _ in spans])
+    hits = [set() for _ in spans]
+    for m in SKILL_INDEX.find(text):
+        hits[int(np.searchsorted(starts, m.start, side="right")) - 1].add(m.skill_id)
+    focus = set(focus_ids.tolist()) if focus_ids is not None else set()
+
+    seen = set()
+    ranked = []
+    for i, (start, end) in enumerate(spans):
+        sentence = " ".join(text[start:end].split())
+        key = sentence.lower()
+        if key in seen or (not hits[i] and (BOILERPLATE.search(sentence) or len(sentence) < 3)):
+            continue
+        seen.add(key)
+        score = 3 * len(hits[i] & focus) + len(hits[i]) + (1 if i < 2 else 0)  # titles come first
+        ranked.append((-score, i, sentence))
+    ranked.sort()
+
+    kept = []
+    used = 0
+    for _, i, sentence in ranked:
+        if used + len(sentence) + 1 <= max_chars:
+            kept.append((i, sentence))
+            used += len(sentence) + 1
+    return "\n".join(sentence for _, sentence in sorted(kept))
+
+
+@cached(prompt_cache, version=lambda: TAXONOMY_VERSION)
+def budget_documents(
+    resume_text: str,
+    job_description: str,
+    resume_tokens: int = PROMPT_RESUME_TOKENS,
+    jd_tokens: int = PROMPT_JD_TOKENS
+) -> Tuple[str, str]:
+    """The resume and JD fitted to their prompt budgets, each focused on the other's skills."""
+    resume_ids = SKILL_INDEX.extract_ids(resume_text or "")
+    jd_ids = SKILL_INDEX.extract_ids(job_description or "")
+    return (
+        fit_text(resume_text, resume_tokens, focus_ids=jd_ids),
+        fit_text(job_description, jd_tokens, focus_ids=resume_ids)
+    )
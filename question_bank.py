@@ -0,0 +1,211 @@
+"""
+Interview question bank.
+
+Questions are generated per (skill, interview type, difficulty, language),
+ahead of time or by background jobs, and stored in the indexed
+``question_bank`` table, deduplicated by their normalised text.  Starting
+an interview then only needs the job description's skills (from the skill
+index) and one indexed query; the LLM is called live only for the
+questions the bank cannot supply.
+
+Run ``python question_bank.py`` to pre-generate questions for the
+highest-weighted taxonomy skills.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import QUESTION_BANK_PER_SKILL, QUESTION_BANK_WARM_SKILLS, INTERVIEW_TYPES
+from llm_utils import generate_skill_questions
+from models import BankQuestion
+from nlp_utils import SKILL_INDEX
+
+logger = logging.getLogger(__name__)
+
+# interview types whose questions a "mixed" interview may draw on
+MIXED_TYPES = [t.lower() for t in INTERVIEW_TYPES if t.lower() != "mixed"]
+
+
+def question_hash(question: str) -> str:
+    normalized = re.sub(r"[^a-z0-9 ]", "", " ".join(question.lower().split()))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def jd_skills(job_description: str) -> List[str]:
+    """Skills of a job description, most mentioned first."""
+    bag = SKILL_INDEX.extract_bag(job_description or "")
+    order = np.argsort(-bag.counts, kind="stable")
+    return [SKILL_INDEX.names[i] for i in bag.ids[order].tolist()]
+
+
+def bank_types(interview_type: str) -> List[str]:
+    """Bank keys an interview of this type draws on."""
+    interview_type = interview_type.lower()
+    return MIXED_TYPES if interview_type == "mixed" else [interview_type]
+
+
+def add_questions(
+    db: Session,
+    skill: str,
+    interview_type: str,
+    questions: Sequence[str],
+    difficulty: str = "Medium",
+    language: str = "en"
+) -> int:
+    """Store new questions, skipping duplicates; the caller commits. Returns the count added."""
+    by_hash: Dict[str, str] = {}
+    for q in questions:
+        q = q.strip()
+        if q:
+            by_hash.setdefault(question_hash(q), q)
+    if not by_hash:
+        return 0
+    existing = {h for (h,) in db.query(BankQuestion.text_hash).filter(BankQuestion.text_hash.in_(list(by_hash)))}
+    new = [
+        BankQuestion(skill=skill, interview_type=interview_type.lower(), difficulty=difficulty,
+                     language=language, question_text=q, text_hash=h, times_served=0)
+        for h, q in by_hash.items() if h not in existing
+    ]
+    db.add_all(new)
+    return len(new)
+
+
+def pick_questions(
+    db: Session,
+    skills: Sequence[str],
+    interview_type: str,
+    count: int,
+    language: str = "en",
+    difficulty: Optional[str] = None
+) -> List[BankQuestion]:
+    """Up to ``count`` bank questions, one skill at a time in JD order.
+
+    Least-served questions are preferred so repeated sessions rotate through
+    the bank.  Marks the picked rows as served; the caller commits.
+    """
+    if not skills or count <= 0:
+        return []
+    query = db.query(BankQuestion).filter(
+        BankQuestion.interview_type.in_(bank_types(interview_type)),
+        BankQuestion.language == language,
+        BankQuestion.skill.in_(list(skills))
+    )
+    if difficulty:
+        query = query.filter(BankQuestion.difficulty == difficulty)
+    by_skill: Dict[str, List[BankQuestion]] = {}
+    for q in query.order_by(BankQuestion.times_served, BankQuestion.id):
+        by_skill.setdefault(q.skill, []).append(q)
+
+    picked: List[BankQuestion] = []
+    queues = [by_skill[s] for s in skills if s in by_skill]
+    while len(picked) < count and any(queues):
+        for queue in queues:
+            if queue and len(picked) < count:
+                picked.append(queue.pop(0))
+    for q in picked:
+        q.times_served = (q.times_served or 0) + 1
+    return picked
+
+
+def missing_skills(
+    db: Session,
+    skills: Sequence[str],
+    interview_type: str,
+    language: str = "en",
+    difficulty: str = "Medium"
+) -> List[str]:
+    """Skills with no bank questions yet for this type/language/difficulty."""
+    if not skills:
+        return []
+    have = {
+        s for (s,) in db.query(BankQuestion.skill).filter(
+            BankQuestion.interview_type == interview_type.lower(),
+            BankQuestion.language == language,
+            BankQuestion.difficulty == difficulty,
+            BankQuestion.skill.in_(list(skills))
+        ).distinct()
+    }
+    return [s for s in skills if s not in have]
+
+
+def fill_skill(
+    db: Session,
+    skill: str,
+    interview_type: str,
+    difficulty: str = "Medium",
+    language: str = "en",
+    count: int = QUESTION_BANK_PER_SKILL
+) -> int:
+    """Generate and store questions for one bank key; the caller commits."""
+    questions = generate_skill_questions(skill, interview_type, difficulty, count, language)
+    if not questions:
+        raise RuntimeError(f"No questions generated for {skill!r}")
+    return add_questions(db, skill, interview_type, questions, difficulty, language)
+
+
+def fill_bank_job(db: Session, payload: Dict):
+    """Job handler (kind "fill_question_bank"): payload has skill, interview_type,
+    difficulty and language."""
+    difficulty = payload.get("difficulty", "Medium")
+    language = payload.get("language", "en")
+    if missing_skills(db, [payload["skill"]], payload["interview_type"], language, difficulty):
+        fill_skill(db, payload["skill"], payload["interview_type"], difficulty, language)
+
+
+def warm_question_bank(
+    db: Session,
+    skills: Optional[Sequence[str]] = None,
+    interview_types: Sequence[str] = ("technical",),
+    difficulty: str = "Medium",
+    language: str = "en"
+) -> Tuple[int, int]:
+    """Pre-generate questions (default: the highest-weighted technical skills).
+
+    Returns (questions added, keys that failed).
+    """
+    if skills is None:
+        ranked = np.argsort(-np.asarray(SKILL_INDEX.weights), kind="stable")
+        skills = [
+            SKILL_INDEX.names[i] for i in ranked.tolist()
+            if SKILL_INDEX.categories[i] == "technical"
+        ][:QUESTION_BANK_WARM_SKILLS]
+    added = failed = 0
+    for interview_type in interview_types:
+        for skill in missing_skills(db, skills, interview_type, language, difficulty):
+            try:
+                added += fill_skill(db, skill, interview_type, difficulty, language)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                logger.warning("Question bank: %s/%s failed: %s", skill, interview_type, e)
+    return added, failed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from models import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Pre-generate interview questions into the question bank")
+    parser.add_argument("skills", nargs="*", help="skills to fill (default: top taxonomy skills)")
+    parser.add_argument("--types", nargs="+", default=["technical"], help="interview types")
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    session = SessionLocal()
+    try:
+        added, failed = warm_question_bank(
+            session, args.skills or None, [t.lower() for t in args.types], args.difficulty, args.language
+        )
+        print(f"Added {added} questions ({failed} skill/type pairs failed)")
+    finally:
+        session.close()
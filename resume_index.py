@@ -0,0 +1,218 @@
+"""
+Precomputed skill profiles for stored resumes.
+
+Skill extraction runs once, when a resume is uploaded.  The Resume row keeps
+the sorted skill ids found in its text, how often each occurs and where,
+tagged with the taxonomy version they were computed with; the profile is
+only recomputed when that version changes.
+
+ResumeSkillMatrix loads the skill counts of all resumes into one CSR-style
+matrix (indptr/indices/counts arrays) so a job description can be scored
+against every stored resume by the configured scoring engine with a handful
+of NumPy operations (recruiter mode).  It also feeds corpus document
+frequencies to the engine for its idf weights.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from models import Resume, SessionLocal
+from nlp_utils import SCORING_ENGINE, SKILL_INDEX, TAXONOMY_VERSION
+from skill_index import SkillBag
+
+BACKFILL_BATCH_SIZE = 500
+
+
+# ------------------------
+# ENCODING
+# ------------------------
+
+def encode_skill_ids(ids: np.ndarray) -> bytes:
+    return np.asarray(ids, dtype="<i4").tobytes()
+
+
+def decode_skill_ids(blob: Optional[bytes]) -> np.ndarray:
+    if not blob:
+        return np.zeros(0, dtype=np.int32)
+    return np.frombuffer(blob, dtype="<i4").astype(np.int32)
+
+
+class SkillProfile(NamedTuple):
+    ids: np.ndarray  # sorted distinct skill ids
+    counts: np.ndarray  # occurrences of each id
+    positions: np.ndarray  # (n, 2) start/end offsets, grouped by id in ids order
+
+    def spans(self, i: int) -> np.ndarray:
+        """Character spans of the i-th skill in ids."""
+        start = int(self.counts[:i].sum())
+        return self.positions[start:start + int(self.counts[i])]
+
+
+def build_skill_profile(text: str) -> SkillProfile:
+    matches = SKILL_INDEX.find(text or "")
+    if not matches:
+        return SkillProfile(
+            np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros((0, 2), dtype=np.int32)
+        )
+    found = np.array(matches, dtype=np.int32)  # rows of (skill_id, start, end)
+    found = found[np.lexsort((found[:, 1], found[:, 0]))]
+    ids, counts = np.unique(found[:, 0], return_counts=True)
+    return SkillProfile(ids.astype(np.int32), counts.astype(np.int32), found[:, 1:].copy())
+
+
+def index_resume(resume: Resume) -> SkillProfile:
+    """Compute and attach the skill profile of a resume; the caller commits."""
+    profile = build_skill_profile(resume.extracted_text)
+    resume.skill_ids = encode_skill_ids(profile.ids)
+    resume.skill_counts = encode_skill_ids(profile.counts)
+    resume.skill_positions = encode_skill_ids(profile.positions.ravel())
+    resume.skill_version = TAXONOMY_VERSION
+    return profile
+
+
+def resume_skill_profile(resume: Resume) -> SkillProfile:
+    """Return the stored profile, recomputing it only if the taxonomy changed."""
+    if resume.skill_version != TAXONOMY_VERSION or resume.skill_counts is None:
+        return index_resume(resume)
+    return SkillProfile(
+        decode_skill_ids(resume.skill_ids),
+        decode_skill_ids(resume.skill_counts),
+        decode_skill_ids(resume.skill_positions).reshape(-1, 2)
+    )
+
+
+def backfill_resume_skills(db: Session) -> int:
+    """Index every resume whose profile is missing or stale. Returns the count."""
+    stale = [
+        rid for (rid,) in db.query(Resume.id).filter(or_(
+            Resume.skill_version.is_(None),
+            Resume.skill_version != TAXONOMY_VERSION,
+            Resume.skill_counts.is_(None)
+        ))
+    ]
+    for start in range(0, len(stale), BACKFILL_BATCH_SIZE):
+        batch = stale[start:start + BACKFILL_BATCH_SIZE]
+        for resume in db.query(Resume).filter(Resume.id.in_(batch)):
+            index_resume(resume)
+        db.commit()
+    return len(stale)
+
+
+# ------------------------
+# MATRIX
+# ------------------------
+
+class ResumeSkillMatrix:
+    """All stored resume skill counts as one sparse matrix."""
+
+    def __init__(self):
+        self.resume_ids = np.zeros(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.counts = np.zeros(0, dtype=np.int32)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    def refresh(self, db: Session):
+        """Sync with the database.
+
+        Resumes uploaded since the last refresh are appended; a full reload
+        only happens when rows were removed or the taxonomy changed.
+        """
+        count, max_id = db.query(func.count(Resume.id), func.max(Resume.id)).one()
+        state = (count, max_id, TAXONOMY_VERSION)
+        if state == self._state:
+            return
+        with self._lock:
+            if state == self._state:
+                return
+            backfill_resume_skills(db)
+            appending = False
+            if self._state is not None and self._state[2] == TAXONOMY_VERSION:
+                old_count, old_max, _ = self._state
+                added = db.query(func.count(Resume.id)).filter(Resume.id > (old_max or 0)).scalar()
+                appending = count == old_count + added
+            query = db.query(Resume.id, Resume.skill_ids, Resume.skill_counts).order_by(Resume.id)
+            if appending:
+                query = query.filter(Resume.id > (self._state[1] or 0))
+            rows = query.all()
+            vectors = [decode_skill_ids(ids) for _, ids, _ in rows]
+            lengths = np.array([len(v) for v in vectors], dtype=np.int64)
+            new_ids = np.array([rid for rid, _, _ in rows], dtype=np.int64)
+            new_indices = np.concatenate(vectors) if vectors else np.zeros(0, dtype=np.int32)
+            new_counts = np.concatenate([decode_skill_ids(c) for _, _, c in rows]) if rows else np.zeros(0, dtype=np.int32)
+            if appending:
+                self.resume_ids = np.concatenate((self.resume_ids, new_ids))
+                self.indptr = np.concatenate((self.indptr, self.indptr[-1] + np.cumsum(lengths)))
+                self.indices = np.concatenate((self.indices, new_indices))
+                self.counts = np.concatenate((self.counts, new_counts))
+            else:
+                self.resume_ids = new_ids
+                self.indptr = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+                self.indices = new_indices
+                self.counts = new_counts
+            self._state = state
+            if len(self.resume_ids):
+                SCORING_ENGINE.set_corpus_stats(
+                    np.bincount(self.indices, minlength=len(SKILL_INDEX)),
+                    len(self.resume_ids),
+                    float(self.counts.sum()) / len(self.resume_ids)
+                )
+
+    def scores(self, jd_bag: SkillBag) -> np.ndarray:
+        """Score of every stored resume (0-100) against a JD's skills."""
+        if not len(jd_bag.ids) or not len(self.resume_ids):
+            return np.zeros(len(self.resume_ids))
+        return SCORING_ENGINE.score_resumes(
+            jd_bag.ids, jd_bag.counts, self.indptr, self.indices, self.counts.astype(np.float64)
+        )
+
+    def top_k(self, job_description: str, k: int = 20) -> List[Dict]:
+        """Rank stored resumes against a job description, best first."""
+        jd_bag = SKILL_INDEX.extract_bag(job_description or "")
+        jd_ids = jd_bag.ids
+        scores = self.scores(jd_bag)
+        if not len(scores):
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        jd_set = set(jd_ids.tolist())
+        results = []
+        for row in top.tolist():
+            have = self.indices[self.indptr[row]:self.indptr[row + 1]].tolist()
+            matched = sorted(jd_set.intersection(have))
+            results.append({
+                "resume_id": int(self.resume_ids[row]),
+                "score": round(float(scores[row]), 1),
+                "matching_skills": [SKILL_INDEX.names[i] for i in matched],
+                "missing_skills": [SKILL_INDEX.names[i] for i in sorted(jd_set.difference(matched))]
+            })
+        return results
+
+
+resume_matrix = ResumeSkillMatrix()
+
+
+def load_corpus_stats() -> int:
+    """Load the stored resumes into ``resume_matrix``, which also hands the
+    scoring engine its corpus statistics.
+
+    Every process that scores resumes calls this at startup, so tf-idf/BM25
+    scores do not depend on which endpoints a process happened to serve.
+    Returns the number of resumes.
+    """
+    db = SessionLocal()
+    try:
+        resume_matrix.refresh(db)
+        return len(resume_matrix)
+    finally:
+        db.close()
@@ -0,0 +1,405 @@
+"""
+Compiled skill index used by the NLP helpers.
+
+Every skill phrase is tokenised and inserted into a token trie.  The trie
+nodes are stored as a sorted array of 64-bit prefix hashes (a node's key is
+the rolling hash of the tokens leading to it), so matching walks the trie for
+all token positions of a document at once with NumPy.  One pass costs
+O(tokens x longest phrase x log(nodes)) no matter how many skills the
+taxonomy holds, and skills only ever match whole tokens ("Java" is not found
+inside "JavaScript", "Git" is not found inside "digital").
+
+The taxonomy itself lives in a JSON file (see data/skill_taxonomy.json) and
+is compiled once into a flat binary index that workers memory-map at
+startup instead of re-parsing the JSON.  The index is rebuilt automatically
+whenever the taxonomy file changes; its ``version`` string changes with it so
+cached ATS results can be keyed on it.
+
+Rebuild by hand with:  python skill_index.py [taxonomy.json] [index.idx]
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import SKILL_TAXONOMY_PATH, SKILL_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+# a token starts and ends on a letter/digit but may keep '+', '#' and '.'
+# inside so that "C++", "C#" and "Node.js" survive as single tokens
+_TOKEN_RE = re.compile(r"[^\W_](?:[\w+#.]*[\w+#])?")
+
+# spelling variants folded away before hashing, on both the taxonomy and the
+# text side: "Node.js" / "NodeJS" and "React.js" / "ReactJS" hash the same
+_TOKEN_FOLD = str.maketrans("", "", ".")
+
+_HASH_SEED = 0xCBF29CE484222325
+_HASH_PRIME = 0x100000001B3
+_HASH_MASK = (1 << 64) - 1
+
+# node value for trie nodes that are only a prefix of longer phrases
+NO_SKILL = -1
+
+# bump when tokenisation or the on-disk layout changes so old indexes rebuild
+_INDEX_FORMAT = 2
+_INDEX_MAGIC = b"SKIDX\x00\x00\x00"
+
+
+class SkillMatch(NamedTuple):
+    skill_id: int
+    start: int  # character offset in the source text
+    end: int
+
+
+class SkillBag(NamedTuple):
+    ids: np.ndarray  # sorted distinct skill ids
+    counts: np.ndarray  # occurrences of each id
+
+
+# ------------------------
+# TOKENISATION / HASHING
+# ------------------------
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Split text into normalised (token, start, end) triples."""
+    if not text:
+        return []
+    return [
+        (m.group().lower().translate(_TOKEN_FOLD), m.start(), m.end())
+        for m in _TOKEN_RE.finditer(text)
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _prefix_hashes(tokens: Sequence[str]) -> List[int]:
+    """Rolling hash of every prefix of a token sequence (one per trie node)."""
+    h = _HASH_SEED
+    out = []
+    for tok in tokens:
+        h = ((h * _HASH_PRIME) & _HASH_MASK) ^ _token_hash(tok)
+        out.append(h)
+    return out
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _taxonomy_version(data: Dict, raw: bytes) -> str:
+    """Declared taxonomy version plus a content hash, e.g. '2026.10.1+3fa2c9e1'."""
+    digest = hashlib.sha256(raw + str(_INDEX_FORMAT).encode()).hexdigest()
+    return f"{data.get('version', '0')}+{digest[:8]}"
+
+
+def _resolve(path: str) -> str:
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+# ------------------------
+# INDEX
+# ------------------------
+
+class SkillIndex:
+    """Immutable skill matcher; build once and reuse across calls."""
+
+    def __init__(
+        self,
+        names: List[str],
+        categories: List[str],
+        weights: np.ndarray,
+        node_keys: np.ndarray,
+        node_values: np.ndarray,
+        max_phrase_len: int,
+        version: str = "builtin"
+    ):
+        self.names = names
+        self.categories = categories
+        self.weights = weights
+        self.node_keys = node_keys
+        self.node_values = node_values
+        self.max_phrase_len = max_phrase_len
+        self.version = version
+        self._ids = {name: i for i, name in enumerate(names)}
+        self._buffer = None  # keeps a memory map alive for loaded indexes
+
+    @classmethod
+    def build(cls, skills: Iterable[Dict], version: str = "builtin") -> "SkillIndex":
+        """Compile taxonomy entries.
+
+        Each entry is a dict with ``name`` and optional ``category``,
+        ``aliases`` and ``weight``.  Aliases compile into the same trie and
+        resolve to the canonical name; duplicate names are ignored.
+        """
+        names: List[str] = []
+        categories: List[str] = []
+        weights: List[float] = []
+        nodes: Dict[int, int] = {}
+        max_len = 0
+        conflicts = 0
+        for entry in skills:
+            name = entry["name"].strip()
+            tokens = [t for t, _, _ in tokenize(name)]
+            if not tokens:
+                continue
+            hashes = _prefix_hashes(tokens)
+            if nodes.get(hashes[-1], NO_SKILL) != NO_SKILL:
+                logger.debug("Skipping duplicate skill %r", name)
+                continue
+            skill_id = len(names)
+            names.append(name)
+            categories.append(entry.get("category") or "technical")
+            weights.append(float(entry.get("weight", 1.0)))
+            for phrase in [name] + list(entry.get("aliases") or []):
+                tokens = [t for t, _, _ in tokenize(phrase)]
+                if not tokens:
+                    continue
+                hashes = _prefix_hashes(tokens)
+                for h in hashes[:-1]:
+                    nodes.setdefault(h, NO_SKILL)
+                current = nodes.get(hashes[-1], NO_SKILL)
+                if current == NO_SKILL:
+                    nodes[hashes[-1]] = skill_id
+                elif current != skill_id:
+                    logger.debug("Alias %r of %r already maps to %r", phrase, name, names[current])
+                    conflicts += 1
+                max_len = max(max_len, len(tokens))
+        if conflicts:
+            logger.warning("%d aliases clash with an earlier skill and were ignored", conflicts)
+
+        keys = np.array(sorted(nodes), dtype=np.uint64)
+        values = np.array([nodes[int(k)] for k in keys], dtype=np.int32)
+        return cls(names, categories, np.array(weights, dtype=np.float32), keys, values, max_len, version)
+
+    @classmethod
+    def from_taxonomy(cls, path: str) -> "SkillIndex":
+        """Parse and compile a taxonomy JSON file."""
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+        return cls.build(data.get("skills", []), version=_taxonomy_version(data, raw))
+
+    # ------------------------
+    # BINARY INDEX
+    # ------------------------
+
+    def save(self, path: str, source_sha256: str = ""):
+        """Write the compiled index atomically so readers never see a partial file."""
+        category_table = sorted(set(self.categories))
+        codes = {c: i for i, c in enumerate(category_table)}
+        sections = [
+            ("node_keys", self.node_keys.astype(np.uint64).tobytes()),
+            ("node_values", self.node_values.astype(np.int32).tobytes()),
+            ("weights", self.weights.astype(np.float32).tobytes()),
+            ("category_codes", np.array([codes[c] for c in self.categories], dtype=np.uint16).tobytes()),
+            ("names", "\n".join(self.names).encode("utf-8")),
+        ]
+        offsets = {}
+        offset = 0
+        for section, blob in sections:
+            offsets[section] = [offset, len(blob)]
+            offset += _pad8(len(blob))
+        header = json.dumps({
+            "format": _INDEX_FORMAT,
+            "version": self.version,
+            "source_sha256": source_sha256,
+            "n_skills": len(self.names),
+            "max_phrase_len": self.max_phrase_len,
+            "categories": category_table,
+            "sections": offsets,
+        }).encode("utf-8")
+        header += b" " * (_pad8(len(header) + 12) - len(header) - 12)
+
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(_INDEX_MAGIC)
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(header)
+            for _, blob in sections:
+                f.write(blob)
+                f.write(b"\0" * (_pad8(len(blob)) - len(blob)))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def read_header(path: str) -> Optional[Dict]:
+        """Return the JSON header of an index file, or None if unreadable."""
+        try:
+            with open(path, "rb") as f:
+                if f.read(8) != _INDEX_MAGIC:
+                    return None
+                size = int.from_bytes(f.read(4), "little")
+                return json.loads(f.read(size).decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, path: str) -> "SkillIndex":
+        """Memory-map a compiled index; trie arrays are not copied into memory."""
+        header = cls.read_header(path)
+        if header is None or header.get("format") != _INDEX_FORMAT:
+            raise ValueError(f"{path} is not a compatible skill index")
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        base = 12 + int.from_bytes(buf[8:12], "little")
+
+        def section(name, dtype):
+            start, length = header["sections"][name]
+            count = length // np.dtype(dtype).itemsize
+            return np.frombuffer(buf, dtype=dtype, count=count, offset=base + start)
+
+        start, length = header["sections"]["names"]
+        names = bytes(buf[base + start:base + start + length]).decode("utf-8").split("\n") if length else []
+        category_table = header["categories"]
+        categories = [category_table[c] for c in section("category_codes", np.uint16).tolist()]
+        index = cls(
+            names,
+            categories,
+            section("weights", np.float32),
+            section("node_keys", np.uint64),
+            section("node_values", np.int32),
+            header["max_phrase_len"],
+            header["version"]
+        )
+        index._buffer = buf
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def skill_id(self, name: str) -> int:
+        return self._ids.get(name, NO_SKILL)
+
+    def canonical(self, phrase: str) -> Optional[str]:
+        """Return the canonical skill name for a skill name or alias, if known."""
+        tokens = [t for t, _, _ in tokenize(phrase)]
+        if not tokens or len(tokens) > self.max_phrase_len:
+            return None
+        key = np.uint64(_prefix_hashes(tokens)[-1])
+        pos = int(np.searchsorted(self.node_keys, key))
+        if pos < len(self.node_keys) and self.node_keys[pos] == key:
+            value = int(self.node_values[pos])
+            if value != NO_SKILL:
+                return self.names[value]
+        return None
+
+    def category(self, name: str) -> Optional[str]:
+        i = self._ids.get(name)
+        return self.categories[i] if i is not None else None
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """Return leftmost-longest, non-overlapping skill matches in text."""
+        tokens = tokenize(text)
+        if not tokens or not len(self.node_keys):
+            return []
+        tok_hashes = np.array([_token_hash(t) for t, _, _ in tokens], dtype=np.uint64)
+        n = len(tok_hashes)
+
+        # walk the trie one level at a time for every start position at once
+        starts = np.arange(n)
+        h = np.full(n, _HASH_SEED, dtype=np.uint64)
+        prime = np.uint64(_HASH_PRIME)
+        last_node = len(self.node_keys) - 1
+        hit_starts, hit_lens, hit_ids = [], [], []
+        for depth in range(self.max_phrase_len):
+            live = starts + depth < n
+            starts, h = starts[live], h[live]
+            if not len(starts):
+                break
+            h = (h * prime) ^ tok_hashes[starts + depth]
+            pos = np.minimum(np.searchsorted(self.node_keys, h), last_node)
+            found = self.node_keys[pos] == h
+            starts, h, pos = starts[found], h[found], pos[found]
+            values = self.node_values[pos]
+            terminal = values != NO_SKILL
+            if terminal.any():
+                hit_starts.append(starts[terminal])
+                hit_lens.append(np.full(int(terminal.sum()), depth + 1))
+                hit_ids.append(values[terminal])
+
+        if not hit_starts:
+            return []
+        all_starts = np.concatenate(hit_starts)
+        all_lens = np.concatenate(hit_lens)
+        all_ids = np.concatenate(hit_ids)
+        order = np.lexsort((-all_lens, all_starts))
+
+        matches = []
+        covered = 0
+        for i in order.tolist():
+            s = int(all_starts[i])
+            if s < covered:
+                continue
+            e = s + int(all_lens[i])
+            covered = e
+            matches.append(SkillMatch(int(all_ids[i]), tokens[s][1], tokens[e - 1][2]))
+        return matches
+
+    def extract_ids(self, text: str) -> np.ndarray:
+        """Return the sorted, distinct skill ids found in text."""
+        return np.unique(np.array([m.skill_id for m in self.find(text)], dtype=np.int32))
+
+    def extract_bag(self, text: str) -> SkillBag:
+        """Return the distinct skill ids found in text with their counts."""
+        ids, counts = np.unique(np.array([m.skill_id for m in self.find(text)], dtype=np.int32), return_counts=True)
+        return SkillBag(ids.astype(np.int32), counts.astype(np.int32))
+
+    def extract(self, text: str) -> List[str]:
+        """Return the distinct skill names found in text."""
+        seen = {m.skill_id for m in self.find(text)}
+        return [self.names[i] for i in sorted(seen)]
+
+
+# ------------------------
+# LOADING
+# ------------------------
+
+def load_skill_index(
+    taxonomy_path: str = SKILL_TAXONOMY_PATH,
+    index_path: str = SKILL_INDEX_PATH
+) -> SkillIndex:
+    """Return the compiled index for a taxonomy, rebuilding it when stale.
+
+    The compiled file records the hash of the taxonomy it was built from, so
+    an edited taxonomy is recompiled on the next start.  If the index cannot
+    be written (read-only checkout) the freshly compiled copy is still used.
+    """
+    taxonomy_path = _resolve(taxonomy_path)
+    index_path = _resolve(index_path)
+    with open(taxonomy_path, "rb") as f:
+        source_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    header = SkillIndex.read_header(index_path)
+    if header and header.get("format") == _INDEX_FORMAT and header.get("source_sha256") == source_sha256:
+        try:
+            return SkillIndex.load(index_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load skill index %s: %s", index_path, e)
+
+    index = SkillIndex.from_taxonomy(taxonomy_path)
+    try:
+        index.save(index_path, source_sha256=source_sha256)
+    except OSError as e:
+        logger.warning("Could not write skill index %s: %s", index_path, e)
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+
+    src = sys.argv[1] if len(sys.argv) > 1 else SKILL_TAXONOMY_PATH
+    dst = sys.argv[2] if len(sys.argv) > 2 else SKILL_INDEX_PATH
+    compiled = load_skill_index(src, dst)
+    print(f"✅ {len(compiled)} skills, version {compiled.version} -> {_resolve(dst)}")
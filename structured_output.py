@@ -0,0 +1,213 @@
+"""
+Structured (JSON) output from LLM responses.
+
+Models asked for JSON often wrap it in a Markdown fence or chat around it
+("Sure! Here is the evaluation: ...").  JSONExtractor scans the text once,
+tracking string and bracket state - it can also be fed a stream chunk by
+chunk - and returns the first complete JSON object or array that decodes.
+Schemas (dicts of Field) then validate and coerce the value: numbers given
+as "85" or "8/10" become numbers, scores are clamped to their range, keys
+match regardless of case and spacing.  Callers get a well-formed result or
+None, never a made-up score.
+
+Requests that expect JSON also set Ollama's ``format: "json"`` (see
+llm_utils), which constrains generation to valid JSON; whole-text
+``json.loads`` is then the fast path.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_MISSING = object()
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_FRACTION = re.compile(r"(-?\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _loads(candidate: str) -> Any:
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        # the most common near-miss: a trailing comma before } or ]
+        return json.loads(_TRAILING_COMMA.sub(r"\1", candidate))
+
+
+class JSONExtractor:
+    """Find the first JSON object/array in text that may arrive in chunks."""
+
+    def __init__(self):
+        self.text = ""
+        self.value: Any = _MISSING
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self.value is not _MISSING
+
+    def feed(self, chunk: str) -> bool:
+        """Scan another chunk; True once a complete value has been decoded."""
+        if self.done:
+            return True
+        self.text += chunk
+        text = self.text
+        i = self._pos
+        while i < len(text):
+            ch = text[i]
+            if self._start is None:
+                if ch in "{[":
+                    self._start, self._depth, self._in_string = i, 1, False
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if not self._depth:
+                    start, self._start = self._start, None
+                    try:
+                        self.value = _loads(text[start:i + 1])
+                        self._pos = i + 1
+                        return True
+                    except ValueError:
+                        i = start  # not JSON after all; rescan from the next bracket
+            i += 1
+        self._pos = i
+        return False
+
+
+def extract_json(text: Optional[str]) -> Any:
+    """The JSON value in an LLM response (bare, fenced or amid prose); None if there is none."""
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    extractor = JSONExtractor()
+    return extractor.value if extractor.feed(text) else None
+
+
+# ------------------------
+# SCHEMAS
+# ------------------------
+
+def _key(name: str) -> str:
+    return re.sub(r"[\s_\-]+", "_", str(name).strip().lower())
+
+
+class Field:
+    """One expected key of a JSON object: its type, default and numeric range."""
+
+    def __init__(
+        self,
+        kind: type,
+        required: bool = True,
+        default: Any = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None
+    ):
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def coerce(self, value: Any) -> Any:
+        """The value converted to this field's type; raises ValueError if it can't be."""
+        if self.kind in (int, float):
+            return self._number(value)
+        if self.kind is bool:
+            if isinstance(value, str):
+                if value.strip().lower() in ("true", "yes", "1"):
+                    return True
+                if value.strip().lower() in ("false", "no", "0"):
+                    return False
+                raise ValueError(f"not a boolean: {value!r}")
+            return bool(value)
+        if self.kind is list:
+            return as_string_list(value)
+        if isinstance(value, (dict, list)):
+            value = "\n".join(as_string_list(value))
+        return str(value).strip()
+
+    def _number(self, value: Any) -> Any:
+        if isinstance(value, bool):
+            raise ValueError("boolean is not a number")
+        if isinstance(value, str):
+            fraction = _FRACTION.search(value)
+            if fraction and self.maximum is not None and float(fraction.group(2)) > 0:
+                # "8/10" on a 0-100 field
+                value = float(fraction.group(1)) / float(fraction.group(2)) * self.maximum
+            else:
+                number = _NUMBER.search(value)
+                if not number:
+                    raise ValueError(f"not a number: {value!r}")
+                value = float(number.group())
+        value = float(value)
+        if self.minimum is not None:
+            value = max(self.minimum, value)
+        if self.maximum is not None:
+            value = min(self.maximum, value)
+        return int(round(value)) if self.kind is int else value
+
+
+def validate(value: Any, schema: Dict[str, Field]) -> Optional[Dict]:
+    """The object with every schema key coerced; None if it is not an object or a required key is unusable."""
+    if not isinstance(value, dict):
+        return None
+    given = {_key(k): v for k, v in value.items()}
+    result = {}
+    for name, field in schema.items():
+        raw = given.get(_key(name), _MISSING)
+        try:
+            if raw is _MISSING or raw is None:
+                raise ValueError(f"missing {name}")
+            result[name] = field.coerce(raw)
+        except (TypeError, ValueError):
+            if field.required:
+                return None
+            result[name] = field.default
+    return result
+
+
+def parse_object(text: Optional[str], schema: Dict[str, Field]) -> Optional[Dict]:
+    """Extract and validate a JSON object from an LLM response."""
+    return validate(extract_json(text), schema)
+
+
+def as_string_list(value: Any) -> List[str]:
+    """Non-empty strings from a JSON list (items may be {"question": ...}-style objects)."""
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, list):
+        return []
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            item = next((v for v in item.values() if isinstance(v, str)), "")
+        if isinstance(item, (str, int, float)) and str(item).strip():
+            items.append(str(item).strip())
+    return items
+
+
+def parse_string_list(text: Optional[str], max_items: Optional[int] = None) -> Optional[List[str]]:
+    """A list of strings from an LLM response: a JSON array, or the first array inside a JSON object."""
+    value = extract_json(text)
+    if isinstance(value, dict):
+        value = next((v for v in value.values() if isinstance(v, list)), None)
+    items = as_string_list(value) if isinstance(value, list) else []
+    if not items:
+        return None
+    return items[:max_items] if max_items is not None else items
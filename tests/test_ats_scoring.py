@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from ats_scoring import ENGINES, create_engine
+from nlp_utils import SKILL_INDEX, extract_ats_keywords, score_resume_against_jds
+
+RESUME = "Python developer: Python, Docker, Kubernetes, SQL and AWS; strong communication."
+JDS = [
+    "Python and SQL engineer with Docker experience",
+    "Java, Spring and Kubernetes; AWS a plus. Python Python",
+    "Leadership and communication",
+    "",
+]
+
+SKILL_ENGINES = [name for name, cls in ENGINES.items() if not cls.semantic]
+
+
+def _engine(name):
+    engine = create_engine(SKILL_INDEX.weights, name)
+    rng = np.random.default_rng(0)
+    engine.set_corpus_stats(rng.integers(0, 50, len(SKILL_INDEX)), 50, 6.0)
+    return engine
+
+
+def _csr(bags):
+    indptr = np.concatenate(([0], np.cumsum([len(b.ids) for b in bags])))
+    return (indptr, np.concatenate([b.ids for b in bags]).astype(np.int64),
+            np.concatenate([b.counts for b in bags]).astype(np.float64))
+
+
+@pytest.mark.parametrize("name", SKILL_ENGINES)
+def test_batch_scores_equal_single_scores(name):
+    engine = _engine(name)
+    resume = SKILL_INDEX.extract_bag(RESUME)
+    jds = [SKILL_INDEX.extract_bag(jd) for jd in JDS]
+    batch = engine.score_jds(resume.ids, resume.counts.astype(np.float64), *_csr(jds))
+    for jd, score in zip(jds, batch):
+        single = engine.score_jds(resume.ids, resume.counts.astype(np.float64), *_csr([jd]))
+        assert single[0] == pytest.approx(score)
+
+
+@pytest.mark.parametrize("name", SKILL_ENGINES)
+def test_resume_side_kernel_agrees_with_jd_side_kernel(name):
+    engine = _engine(name)
+    resumes = [SKILL_INDEX.extract_bag(t) for t in (RESUME, "Java Spring", "communication", "")]
+    indptr, indices, tf = _csr(resumes)
+    for jd_text in JDS:
+        jd = SKILL_INDEX.extract_bag(jd_text)
+        by_resume = engine.score_resumes(jd.ids, jd.counts, indptr, indices, tf)
+        for resume, score in zip(resumes, by_resume):
+            by_jd = engine.score_jds(resume.ids, resume.counts.astype(np.float64), *_csr([jd]))
+            assert by_jd[0] == pytest.approx(score)
+
+
+def test_single_analysis_equals_batch_analysis():
+    batch = score_resume_against_jds(RESUME, JDS)
+    assert [extract_ats_keywords(RESUME, jd) for jd in JDS] == batch
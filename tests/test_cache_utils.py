@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cache_utils import AsyncSingleFlight, PersistentCache, SingleFlight, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache("test_ttl", max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    clock[0] += 10
+    assert cache.get("a") == 1
+    assert cache.get("b", "gone") == "gone"
+    clock[0] += 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache("test_lru", max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache("test_disabled", enabled=False)
+    cache.set("a", 1)
+    assert cache.get("a", "miss") == "miss"
+
+
+def test_persistent_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    PersistentCache("test_disk", path, ttl=60).set("a", {"score": 80})
+    reopened = PersistentCache("test_disk", path, ttl=60)
+    assert reopened.get("a") == {"score": 80}
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("a") == {"score": 80}  # now from memory
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_persistent_cache_drops_expired_and_excess_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentCache("test_disk_trim", path, max_entries=2, ttl=60)
+    cache.set("old", 1, ttl=-1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert len(cache) == 2
+    reopened = PersistentCache("test_disk_trim", path, max_entries=2, ttl=60)
+    assert reopened.get("old") is None
+    assert (reopened.get("a"), reopened.get("b")) == (1, 2)
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight = SingleFlight("test_flight")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.do, "k", work)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "k", work) for _ in range(3)]
+        while flight.stats()["shared"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+    assert calls == [1]
+    assert results == [{"value": 42}] * 4
+    assert results[1] is not results[0]  # followers get copies
+
+
+def test_single_flight_shares_errors_and_forgets_the_key():
+    flight = SingleFlight("test_flight_error")
+
+    def fail():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_single_flight_survives_a_cancelled_caller():
+    async def run():
+        flight = AsyncSingleFlight("test_async_flight")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+        assert calls == [1]
+
+    asyncio.run(run())
@@ -0,0 +1,62 @@
+import hashlib
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import embedding_utils
+from embedding_utils import ChunkIndex
+
+
+def _fake_embed(texts):
+    vectors = np.stack([
+        np.random.default_rng(int(hashlib.sha256(t.encode()).hexdigest()[:8], 16)).normal(size=16)
+        for t in texts
+    ]).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture(autouse=True)
+def fake_embedder(monkeypatch):
+    monkeypatch.setattr(embedding_utils, "embed_texts", _fake_embed)
+    monkeypatch.setattr(embedding_utils, "embedder", SimpleNamespace(model_name="fake"))
+
+
+def _query(text):
+    return _fake_embed(embedding_utils.chunk_text(text))[0]
+
+
+def test_tail_is_committed_and_reloaded(tmp_path):
+    index = ChunkIndex(str(tmp_path))
+    index.add(1, "Python developer with Docker experience")
+    index.add(2, "Accountant familiar with Excel")
+    reloaded = ChunkIndex(str(tmp_path))
+    assert len(reloaded) == 2 and reloaded.resume_ids() == {1, 2}
+    assert reloaded.search(_query("Accountant familiar with Excel"), top_k=1)[0][0] == 2
+
+
+def test_uncommitted_tail_rows_are_ignored(tmp_path):
+    index = ChunkIndex(str(tmp_path))
+    index.add(1, "Python developer with Docker experience")
+    # an append that crashed before meta.json was replaced
+    with open(index._file("tail_vectors.f32"), "ab") as f:
+        f.write(np.ones(16, dtype=np.float32).tobytes())
+    with open(index._file("tail_owners.i64"), "ab") as f:
+        f.write(np.array([99], dtype=np.int64).tobytes())
+    reloaded = ChunkIndex(str(tmp_path))
+    assert reloaded.resume_ids() == {1}
+    reloaded.add(2, "Accountant familiar with Excel")
+    assert ChunkIndex(str(tmp_path)).resume_ids() == {1, 2}
+
+
+def test_recluster_starts_a_new_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_utils, "IVF_MIN_VECTORS", 8)
+    index = ChunkIndex(str(tmp_path))
+    for rid in range(12):
+        index.add(rid, f"resume number {rid}")
+    assert index.generation > 1 and len(index.tail_owners) < len(index)
+    reloaded = ChunkIndex(str(tmp_path))
+    assert len(reloaded) == 12 and reloaded.generation == index.generation
+    assert not any(name.startswith("vectors.1.") for name in os.listdir(tmp_path))
+    assert reloaded.search(_query("resume number 7"), top_k=1, nprobe=len(reloaded.centroids))[0][0] == 7
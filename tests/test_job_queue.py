@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import job_queue as job_queue_module
+from job_queue import JobQueue
+from models import Base, Job
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(job_queue_module, "SessionLocal", factory)
+    return factory
+
+
+def _enqueue(factory, queue, kind, payload):
+    db = factory()
+    try:
+        job = queue.enqueue(db, kind, payload)
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def _job(factory, job_id):
+    db = factory()
+    try:
+        return db.get(Job, job_id)
+    finally:
+        db.close()
+
+
+def _ready_now(factory, job_id):
+    db = factory()
+    db.query(Job).filter(Job.id == job_id).update({"available_at": datetime.utcnow()})
+    db.commit()
+    db.close()
+
+
+def test_failed_job_is_retried_with_backoff_until_it_succeeds(session_factory):
+    queue = JobQueue(workers=1, max_attempts=3)
+    outcomes = [RuntimeError("busy"), None]
+
+    def handler(db, payload):
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    queue.register("flaky", handler, retry_backoff=10)
+    job_id = _enqueue(session_factory, queue, "flaky", {"n": 1})
+
+    before = datetime.utcnow()
+    assert queue.run_once()
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts) == ("queued", 1)
+    assert "busy" in job.error
+    assert job.available_at >= before + timedelta(seconds=19)
+    assert not queue.run_once()  # not due yet
+
+    _ready_now(session_factory, job_id)
+    assert queue.run_once()
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts, job.error) == ("done", 2, None)
+
+
+def test_job_fails_after_max_attempts_and_runs_on_failure_once(session_factory):
+    queue = JobQueue(workers=1, max_attempts=3)
+    failed = []
+
+    def handler(db, payload):
+        raise RuntimeError("no grade")
+
+    queue.register("broken", handler, on_failure=lambda db, payload: failed.append(payload), retry_backoff=0)
+    job_id = _enqueue(session_factory, queue, "broken", {"answer_id": 7})
+    for _ in range(3):
+        _ready_now(session_factory, job_id)
+        assert queue.run_once()
+    job = _job(session_factory, job_id)
+    assert (job.status, job.attempts) == ("failed", 3)
+    assert failed == [{"answer_id": 7}]
+    assert not queue.run_once()
+
+
+def test_enqueue_once_skips_pending_duplicates(session_factory):
+    queue = JobQueue(workers=1)
+    queue.register("noop", lambda db, payload: None)
+    db = session_factory()
+    assert queue.enqueue_once(db, "noop", {"a": 1, "b": 2}) is not None
+    db.commit()
+    assert queue.enqueue_once(db, "noop", {"b": 2, "a": 1}) is None
+    db.close()
+    assert queue.run_once()
+    db = session_factory()
+    assert queue.enqueue_once(db, "noop", {"a": 1, "b": 2}) is not None
+    db.close()
@@ -0,0 +1,69 @@
+import pytest
+
+import llm_utils
+from cache_utils import TTLCache
+from ollama_client import LLMOverloaded
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"response": self.text}
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Fake Ollama: answers rubric prompts with a rubric and grading prompts with ``grades[0]``."""
+    calls = []
+    grades = ['{"score": 80, "feedback": "good"}']
+
+    def post(url, json=None, **kwargs):
+        calls.append(json["prompt"])
+        return _Response("- covers the basics" if "key points" in json["prompt"] else grades[0])
+
+    monkeypatch.setattr(llm_utils, "llm_cache", TTLCache("test_llm_responses"))
+    monkeypatch.setattr(llm_utils, "check_ollama_status", lambda probe=True: True)
+    monkeypatch.setattr(llm_utils.ollama_client, "post", post)
+    monkeypatch.setattr(llm_utils.llm_breaker, "allow", lambda: True)
+    return calls, grades
+
+
+def test_valid_grade_is_cached(ollama):
+    calls, _ = ollama
+    first = llm_utils.evaluate_interview_answer("What is Python?", "A language")
+    assert first == {"score": 80, "feedback": "good"}
+    assert llm_utils.evaluate_interview_answer("What is Python?", "A language") == first
+    assert len(calls) == 1  # one grading call, then the cache
+
+
+def test_grading_uses_only_a_cached_rubric(ollama):
+    calls, _ = ollama
+    llm_utils.evaluate_interview_answer("What is Python?", "A language")
+    assert "Rubric" not in calls[-1]
+    llm_utils.generate_rubric("What is Python?")
+    llm_utils.evaluate_interview_answer("What is Python?", "A language")
+    assert len(calls) == 3 and "covers the basics" in calls[-1]
+
+
+def test_grade_failing_the_schema_is_never_cached(ollama):
+    calls, grades = ollama
+    grades[0] = '{"rating": 80, "comment": "good"}'
+    for _ in range(2):
+        result = llm_utils.evaluate_interview_answer("What is Python?", "A language")
+        assert result["fallback"] and not result["retry"]
+    grades[0] = '{"score": 75, "feedback": "fine"}'
+    assert llm_utils.evaluate_interview_answer("What is Python?", "A language")["score"] == 75
+
+
+def test_only_scheduler_rejection_asks_for_a_retry(ollama, monkeypatch):
+    def overloaded(*args, **kwargs):
+        raise LLMOverloaded("queue full")
+
+    monkeypatch.setattr(llm_utils, "_generate", overloaded)
+    result = llm_utils.evaluate_interview_answer("What is Python?", "A language")
+    assert result["fallback"] and result["retry"]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import nlp_utils
+from nlp_utils import IncrementalATSAnalyzer, SKILL_INDEX, score_resume_against_jds
+from skill_index import SkillIndex
+
+RESUME = "Python Docker Kubernetes AWS engineer"
+
+
+def _summary(result):
+    return result["ats_score"], result["matching"], result["missing"]
+
+
+@pytest.mark.parametrize("jd", [
+    "Python Docker Kubernetes AWS\nMachine\nLearning",
+    "Python Docker Kubernetes AWS\n\nMachine\n\nLearning",
+    "We need Machine\n\nLearning and Amazon Web\n\nServices.",
+])
+def test_incremental_matches_full_analysis_across_breaks(jd):
+    analyzer = IncrementalATSAnalyzer(RESUME)
+    assert _summary(analyzer.analyze(jd)) == _summary(score_resume_against_jds(RESUME, [jd])[0])
+
+
+def test_incremental_matches_full_analysis_over_edits():
+    analyzer = IncrementalATSAnalyzer(RESUME)
+    rng = random.Random(7)
+    words = SKILL_INDEX.names + ["and", "with", "the"]
+    for _ in range(100):
+        jd = "".join(rng.choice(words) + rng.choice([" ", " ", "\n", "\n\n"]) for _ in range(30))
+        assert _summary(analyzer.analyze(jd)) == _summary(score_resume_against_jds(RESUME, [jd])[0])
+
+
+def test_edit_reextracts_only_changed_paragraphs():
+    analyzer = IncrementalATSAnalyzer(RESUME)
+    paragraphs = [f"Paragraph {i} needs Python and SQL." for i in range(20)]
+    analyzer.analyze("\n\n".join(paragraphs))
+    paragraphs[5] = "Paragraph 5 needs Go."
+    analyzer.analyze("\n\n".join(paragraphs))
+    # the paragraph itself and the one before it, whose lookahead changed
+    assert analyzer.last_reextracted <= 2
+
+
+@pytest.fixture
+def overlapping(monkeypatch):
+    index = SkillIndex.build([
+        {"name": "Machine Learning"},
+        {"name": "Machine"},
+        {"name": "Learning Management System"},
+        {"name": "Management"},
+        {"name": "Python"},
+    ])
+    monkeypatch.setattr(nlp_utils, "SKILL_INDEX", index)
+    monkeypatch.setattr(nlp_utils, "SCORING_ENGINE", nlp_utils.create_engine(index.weights))
+    return index
+
+
+@pytest.mark.parametrize("jd", [
+    "Python Machine\n\nLearning Management System",
+    "Machine\n\nLearning\n\nManagement System",
+    "Python\n\nLearning Management\n\nSystem and Machine\n\nLearning",
+])
+def test_incremental_matches_full_analysis_when_phrases_overlap(overlapping, jd):
+    analyzer = IncrementalATSAnalyzer("Python")
+    assert _summary(analyzer.analyze(jd)) == _summary(score_resume_against_jds("Python", [jd])[0])
+
+
+def test_incremental_matches_full_analysis_over_overlapping_edits(overlapping):
+    analyzer = IncrementalATSAnalyzer("Python")
+    rng = random.Random(11)
+    words = ["Machine", "Learning", "Management", "System", "Python", "and"]
+    for _ in range(200):
+        jd = "".join(rng.choice(words) + rng.choice([" ", "\n\n"]) for _ in range(12))
+        assert _summary(analyzer.analyze(jd)) == _summary(score_resume_against_jds("Python", [jd])[0])
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from ollama_client import CircuitBreaker, LLMOverloaded, PriorityScheduler
+
+
+def _scheduler(**kwargs):
+    options = dict(
+        max_concurrency=1,
+        classes=["interactive", "batch"],
+        class_limits={},
+        queue_limits={"interactive": 10, "batch": 10},
+        deadlines={"interactive": 5, "batch": 5}
+    )
+    options.update(kwargs)
+    return PriorityScheduler(**options)
+
+
+def _queued(scheduler, priority, n):
+    deadline = time.monotonic() + 2
+    while scheduler.stats()["classes"][priority]["queued"] < n:
+        assert time.monotonic() < deadline, f"no {priority} waiter queued"
+        time.sleep(0.005)
+
+
+def test_interactive_waiters_go_before_earlier_batch_waiters():
+    scheduler = _scheduler()
+    order = []
+
+    def worker(priority):
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    with scheduler.slot("batch"):
+        threads = []
+        waiting = Counter()
+        for priority in ["batch", "batch", "interactive"]:
+            threads.append(threading.Thread(target=worker, args=(priority,)))
+            threads[-1].start()
+            waiting[priority] += 1
+            _queued(scheduler, priority, waiting[priority])
+    for t in threads:
+        t.join(5)
+    assert order == ["interactive", "batch", "batch"]
+
+
+def test_class_limit_leaves_room_for_interactive():
+    scheduler = _scheduler(max_concurrency=2, class_limits={"batch": 1})
+    with scheduler.slot("batch"):
+        with pytest.raises(LLMOverloaded):
+            with scheduler.slot("batch", deadline=0.05):
+                pass
+        with scheduler.slot("interactive", deadline=0.05):
+            assert scheduler.stats()["classes"]["interactive"]["running"] == 1
+
+
+def test_full_queue_is_rejected():
+    scheduler = _scheduler(queue_limits={"interactive": 0, "batch": 0})
+    with pytest.raises(LLMOverloaded):
+        with scheduler.slot("batch"):
+            pass
+    assert scheduler.stats()["classes"]["batch"]["rejected"] == 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the streak
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.is_open()
+    assert not breaker.allow()
+    assert breaker.metrics["rejected"] == 1
+
+
+def test_half_open_breaker_lets_one_trial_through(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert not breaker.is_open()
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # the trial is still running
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
@@ -0,0 +1,46 @@
+import asyncio
+
+from prefetch import SessionPrefetcher
+
+
+def test_reschedules_only_tasks_without_a_result():
+    async def run():
+        prefetcher = SessionPrefetcher()
+        outcomes = {"ok": ["rubric"], "none": [None, "rubric"], "error": [RuntimeError("down"), "rubric"]}
+        calls = []
+
+        def factory(key):
+            async def work():
+                calls.append(key)
+                outcome = outcomes[key].pop(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return outcome
+            return work
+
+        for key in outcomes:
+            assert prefetcher.schedule(1, key, factory(key))
+        await asyncio.sleep(0)
+        assert [prefetcher.schedule(1, key, factory(key)) for key in outcomes] == [False, True, True]
+        await asyncio.sleep(0)
+        assert [await prefetcher.result(1, key) for key in outcomes] == ["rubric"] * 3
+        assert sorted(calls) == ["error", "error", "none", "none", "ok"]
+
+    asyncio.run(run())
+
+
+def test_running_task_is_not_started_twice():
+    async def run():
+        prefetcher = SessionPrefetcher()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "rubric"
+
+        assert prefetcher.schedule(1, "rubric:1", work)
+        assert not prefetcher.schedule(1, "rubric:1", work)
+        gate.set()
+        assert await prefetcher.result(1, "rubric:1", timeout=1) == "rubric"
+
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+import pytest
+
+from config import PROMPT_CHARS_PER_TOKEN
+from nlp_utils import SKILL_INDEX
+from prompt_utils import estimate_tokens, fit_text
+
+FILLER = "I enjoy long walks and reading novels in my spare time."
+JD = "\n".join([
+    "Senior Backend Engineer",
+    "Contact: jobs@example.com or visit https://example.com/careers",
+    *[FILLER] * 20,
+    "You will build services with Python and Docker.",
+    *[FILLER] * 20,
+    "Experience with Kubernetes is a plus.",
+    "We are an equal opportunity employer.",
+])
+
+
+def test_short_text_is_kept_as_is():
+    assert fit_text("  Python developer  ", 100) == "Python developer"
+
+
+@pytest.mark.parametrize("max_tokens", [20, 40, 80])
+def test_long_text_stays_within_budget(max_tokens):
+    fitted = fit_text(JD, max_tokens)
+    assert len(fitted) <= max_tokens * PROMPT_CHARS_PER_TOKEN
+    assert estimate_tokens(fitted) <= max_tokens
+
+
+def test_skill_sentences_are_kept_in_original_order_without_boilerplate():
+    fitted = fit_text(JD, 40).split("\n")
+    assert fitted.index("You will build services with Python and Docker.") \
+        < fitted.index("Experience with Kubernetes is a plus.")
+    assert not any("@" in s or "equal opportunity" in s for s in fitted)
+    assert fitted.count(FILLER) <= 1  # duplicates are dropped
+
+
+def test_focus_skills_win_a_tight_budget():
+    focus = SKILL_INDEX.extract_ids("Kubernetes")
+    assert "Python" in fit_text(JD, 14) and "Kubernetes" not in fit_text(JD, 14)
+    fitted = fit_text(JD, 14, focus_ids=focus)
+    assert "Kubernetes" in fitted and "Python" not in fitted
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, BankQuestion
+from question_bank import add_questions, missing_skills, pick_questions
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bank.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+def test_duplicates_are_skipped_by_normalised_text(db):
+    assert add_questions(db, "Python", "technical", ["What is a list?", "what is a  list", "Explain the GIL."]) == 2
+    db.commit()
+    assert add_questions(db, "Python", "Technical", ["WHAT IS A LIST?", "What is a tuple?"]) == 1
+    db.commit()
+    assert db.query(BankQuestion).count() == 3
+
+
+def test_pick_alternates_skills_and_rotates_through_the_bank(db):
+    add_questions(db, "Python", "technical", ["P1?", "P2?", "P3?"])
+    add_questions(db, "SQL", "technical", ["S1?"])
+    add_questions(db, "Python", "behavioral", ["B1?"])
+    db.commit()
+    first = [q.question_text for q in pick_questions(db, ["SQL", "Python"], "technical", 3)]
+    db.commit()
+    assert first == ["S1?", "P1?", "P2?"]
+    second = [q.question_text for q in pick_questions(db, ["SQL", "Python"], "technical", 2)]
+    assert second == ["S1?", "P3?"]  # unserved Python question before P1 again
+
+
+def test_mixed_interviews_draw_on_every_type(db):
+    add_questions(db, "Python", "technical", ["T1?"])
+    add_questions(db, "Python", "behavioral", ["B1?"])
+    db.commit()
+    picked = pick_questions(db, ["Python"], "Mixed", 5)
+    assert sorted(q.question_text for q in picked) == ["B1?", "T1?"]
+
+
+def test_missing_skills_keeps_jd_order(db):
+    add_questions(db, "SQL", "technical", ["S1?"])
+    db.commit()
+    assert missing_skills(db, ["Python", "SQL", "Docker"], "Technical") == ["Python", "Docker"]
@@ -0,0 +1,35 @@
+import pytest
+
+from skill_index import SkillIndex
+
+INDEX = SkillIndex.build([
+    {"name": "Java"},
+    {"name": "JavaScript", "aliases": ["JS"]},
+    {"name": "Kubernetes", "aliases": ["k8s"]},
+    {"name": "Machine Learning", "aliases": ["ML"]},
+    {"name": "Machine"},
+    {"name": "C++"},
+])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Senior JavaScript developer", ["JavaScript"]),
+    ("Java and JavaScript", ["Java", "JavaScript"]),
+    ("Javanese cooking", []),
+    ("deploys to k8s", ["Kubernetes"]),
+    ("JS, ML", ["JavaScript", "Machine Learning"]),
+    ("C++ and C", ["C++"]),
+])
+def test_matches_whole_words_and_aliases(text, expected):
+    assert INDEX.extract(text) == expected
+
+
+def test_prefers_the_longest_phrase():
+    matches = INDEX.find("machine learning machine")
+    assert [INDEX.names[m.skill_id] for m in matches] == ["Machine Learning", "Machine"]
+    assert matches[0].start == 0 and matches[0].end == len("machine learning")
+
+
+def test_canonical_resolves_aliases():
+    assert INDEX.canonical("K8S") == "Kubernetes"
+    assert INDEX.canonical("Rust") is None
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from structured_output import Field, JSONExtractor, extract_json, parse_object, parse_string_list
+
+EVALUATION = {"score": Field(int, minimum=0, maximum=100), "feedback": Field(str, required=False, default="")}
+
+
+@pytest.mark.parametrize("text", [
+    '{"score": 80, "feedback": "good"}',
+    '```json\n{"score": 80, "feedback": "good"}\n```',
+    'Sure! Here is the evaluation: {"score": 80, "feedback": "good"} Let me know.',
+    '{"score": 80, "feedback": "good",}',
+    'Note {not json} then {"score": 80, "feedback": "good"}',
+])
+def test_extracts_json_from_chatty_output(text):
+    assert extract_json(text) == {"score": 80, "feedback": "good"}
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    assert extract_json('x {"feedback": "use } and \\" carefully", "score": 1} y') == {
+        "feedback": 'use } and " carefully', "score": 1
+    }
+
+
+def test_extractor_accepts_chunks():
+    extractor = JSONExtractor()
+    chunks = ['Here: {"sco', 're": 7', '5, "feedback": "o', 'k"}', " trailing"]
+    done = [extractor.feed(chunk) for chunk in chunks]
+    assert done == [False, False, False, True, True]
+    assert extractor.value == {"score": 75, "feedback": "ok"}
+
+
+def test_no_json_gives_none():
+    assert extract_json("I cannot grade this answer.") is None
+    assert parse_object("I cannot grade this answer.", EVALUATION) is None
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (85, 85),
+    ("85", 85),
+    ("8/10", 80),
+    ("Score: 72 points", 72),
+    (150, 100),
+    (-5, 0),
+])
+def test_scores_are_coerced_and_clamped(raw, expected):
+    assert parse_object(json.dumps({"Score": raw}), EVALUATION)["score"] == expected
+
+
+def test_required_and_optional_fields():
+    assert parse_object('{"feedback": "fine"}', EVALUATION) is None
+    assert parse_object('{"SCORE": "60"}', EVALUATION) == {"score": 60, "feedback": ""}
+    assert parse_object('{"score": true}', EVALUATION) is None
+
+
+def test_string_lists():
+    assert parse_string_list('["What is Python?", "", "Why Docker?"]') == ["What is Python?", "Why Docker?"]
+    assert parse_string_list('{"questions": [{"question": "A?"}, {"question": "B?"}]}', max_items=1) == ["A?"]
+    assert parse_string_list("no list here") is None